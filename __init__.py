@@ -0,0 +1,52 @@
+"""
+Парсер отзывов Яндекс.Карт.
+
+Имена пакета подгружаются лениво (PEP 562): `import yandex_reviews_parser`
+не тянет selenium, undetected_chromedriver и requests — они загружаются
+при первом обращении к классу, которому действительно нужны, а браузер —
+только при создании драйвера.
+"""
+
+import importlib
+
+# имя -> модуль, из которого оно берётся
+_EXPORTS = {
+    "YandexParser": "utils",
+    "AsyncYandexParser": "async_parser",
+    "Parser": "parsers",
+    "ParserHelper": "helpers",
+    "Review": "storage",
+    "Info": "storage",
+    "ReviewBatch": "storage",
+    "JsonlWriter": "writers",
+    "CsvWriter": "writers",
+    "ReviewsApi": "api",
+    "DriverPool": "pool",
+    "StateStore": "state",
+    "CheckpointStore": "checkpoint",
+    "JobQueue": "jobs",
+    "QueueWorker": "jobs",
+    "RateController": "rate",
+    "ResultCache": "cache",
+    "CompanyIdResolver": "resolver",
+    "TimingProfile": "timings",
+    "BrowserProfile": "profiles",
+    "Metrics": "metrics",
+    "PrometheusSink": "metrics",
+    "logging_sink": "metrics",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
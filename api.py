@@ -0,0 +1,257 @@
+from collections import Counter
+from dataclasses import asdict
+from typing import Iterator, Optional
+from urllib.parse import parse_qsl, quote, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from yandex_reviews_parser.helpers import ParserHelper
+from yandex_reviews_parser.storage import Review
+
+
+class ReviewsApi:
+    """
+    Листает JSON-эндпоинт fetchReviews напрямую, без скролла DOM.
+
+    Браузер нужен только для того, чтобы один раз поймать запрос fetchReviews
+    (Parser._last_fetch) вместе с cookies и заголовками, дальше все страницы
+    забираем обычным HTTP через пул соединений requests.Session.
+    """
+
+    PAGE_SIZE = 50
+    # sort из Parser.__set_reviews_sort -> значение параметра ranking
+    RANKING_MAP = {
+        "default": "by_relevance_org",
+        "newest": "by_time",
+        "negative": "by_rating_asc",
+        "positive": "by_rating_desc",
+    }
+    # Заголовки, которые requests выставит сам
+    SKIP_HEADERS = {"cookie", "content-length", "host", "accept-encoding"}
+    # Параметр с подписью запроса: хеш от остальных параметров
+    SIGN_PARAM = "s"
+    # Как параметры склеиваются в строку перед подписью: порядок пойманного
+    # запроса или по алфавиту, кодирование как encodeURIComponent или quote_plus.
+    # Нужный вариант узнаём, пересчитав подпись пойманного запроса.
+    SIGN_VARIANTS = (
+        (False, quote),
+        (True, quote),
+        (False, None),
+        (True, None),
+    )
+
+    def __init__(
+        self,
+        fetch: dict,
+        cookies: Optional[list] = None,
+        timeout: int = 10,
+        pool_size: int = 10,
+        statuses: Optional[Counter] = None,
+    ):
+        """
+        @param fetch: Parser._last_fetch — url, headers запроса fetchReviews
+        @param cookies: driver.get_cookies()
+        @param timeout: таймаут одного HTTP-запроса
+        @param pool_size: размер пула соединений
+        @param statuses: Counter статусов ответов (Parser.fetch_statuses),
+                         чтобы 429/403 учитывались в исходе прохода
+        """
+        self.url: str = fetch["url"]
+        self.timeout = timeout
+        self.statuses = statuses if statuses is not None else Counter()
+        self._sign_variant = self.__detect_sign_variant(self.url)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        for name, value in (fetch.get("headers") or {}).items():
+            if name.startswith(":") or name.lower() in self.SKIP_HEADERS:
+                continue
+            self.session.headers[name] = value
+
+        for cookie in cookies or []:
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+
+    @classmethod
+    def from_parser(cls, parser, **kwargs) -> "ReviewsApi":
+        """
+        Собрать клиент из Parser, у которого уже пойман fetchReviews.
+        """
+        cookies = parser.driver.get_cookies()
+        kwargs.setdefault("statuses", parser.fetch_statuses)
+        return cls(parser._last_fetch, cookies=cookies, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+    @staticmethod
+    def sign(params: str) -> str:
+        """
+        Подпись s для строки параметров fetchReviews: djb2 с xor,
+        32-битная без знака, как считает JS Яндекс.Карт.
+        """
+        n = 5381
+        for ch in params:
+            n = ((33 * n) ^ ord(ch)) & 0xFFFFFFFF
+        return str(n)
+
+    @classmethod
+    def _sign_string(cls, items: list, variant: tuple) -> str:
+        ordered, quote_via = variant
+        items = sorted(items) if ordered else items
+        if quote_via is None:
+            return urlencode(items)
+        return urlencode(items, quote_via=quote_via, safe="~()*!.'")
+
+    @classmethod
+    def __detect_sign_variant(cls, url: str) -> Optional[tuple]:
+        """
+        Какой вариант SIGN_VARIANTS воспроизводит подпись пойманного запроса.
+        None — подписи нет или пересчитать её не удалось.
+        """
+        items = parse_qsl(urlsplit(url).query, keep_blank_values=True)
+        signature = dict(items).get(cls.SIGN_PARAM)
+        if signature is None:
+            return None
+        rest = [(k, v) for k, v in items if k != cls.SIGN_PARAM]
+        for variant in cls.SIGN_VARIANTS:
+            if cls.sign(cls._sign_string(rest, variant)) == signature:
+                return variant
+        return None
+
+    def _page_url(self, page: int, sort: str | None = None) -> str:
+        """
+        URL пойманного fetchReviews с подменёнными page/pageSize/ranking
+        и пересчитанной подписью s. Если подпись есть, но пересчитать её
+        не получилось, годится только сам пойманный запрос — для остальных
+        страниц ValueError (Parser откатится на DOM).
+        """
+        parts = urlsplit(self.url)
+        items = parse_qsl(parts.query, keep_blank_values=True)
+        query = dict(items)
+        signed = self.SIGN_PARAM in query
+        query.pop(self.SIGN_PARAM, None)
+        query["page"] = str(page)
+        query["pageSize"] = str(self.PAGE_SIZE)
+        ranking = self.RANKING_MAP.get(sort) if sort else None
+        if ranking:
+            query["ranking"] = ranking
+        rest = list(query.items())
+
+        if not signed:
+            return urlunsplit(parts._replace(query=urlencode(rest)))
+        if self._sign_variant is not None:
+            signature = self.sign(self._sign_string(rest, self._sign_variant))
+            rest.append((self.SIGN_PARAM, signature))
+            return urlunsplit(parts._replace(query=urlencode(rest)))
+        if rest == [(k, v) for k, v in items if k != self.SIGN_PARAM]:
+            return self.url
+        raise ValueError("не удалось пересчитать подпись s запроса fetchReviews")
+
+    def __set_param(self, name: str, value: str) -> None:
+        """Заменить параметр в пойманном URL (подпись пересчитает _page_url)."""
+        parts = urlsplit(self.url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query[name] = value
+        self.url = urlunsplit(parts._replace(query=urlencode(query)))
+
+    def _get_json(self, page: int, sort: str | None = None) -> dict:
+        """
+        Забрать одну страницу. Если Яндекс вернул новый csrfToken вместо данных,
+        обновляем его в URL и повторяем запрос один раз. Если и после этого
+        данных нет — ValueError: пустой ответ нельзя принять за конец списка.
+        Ответ не JSON-объектом — тоже ValueError: его Parser ловит и
+        переключается на DOM.
+        """
+        for _ in range(2):
+            resp = self.session.get(self._page_url(page, sort), timeout=self.timeout)
+            self.statuses[resp.status_code] += 1
+            resp.raise_for_status()
+            payload = resp.json()
+            if not isinstance(payload, dict) or not isinstance(payload.get("data", {}), dict):
+                raise ValueError(
+                    f"fetchReviews вернул не объект на странице {page}: {type(payload).__name__}"
+                )
+            token = payload.get("csrfToken")
+            if token and "data" not in payload:
+                self.__set_param("csrfToken", token)
+                continue
+            return payload
+        raise ValueError(f"fetchReviews не отдал данные страницы {page} после обновления csrfToken")
+
+    def iter_pages(self, sort: str | None = None, start_page: int = 1) -> Iterator[list]:
+        """
+        Отдаёт сырые списки отзывов постранично, пока страницы не кончатся.
+        """
+        page = start_page
+        while True:
+            data = self._get_json(page, sort).get("data") or {}
+            items = data.get("reviews") or []
+            if not items:
+                return
+            yield items
+
+            total_pages = (data.get("params") or {}).get("totalPages")
+            if total_pages is not None and page >= int(total_pages):
+                return
+            page += 1
+
+    @staticmethod
+    def review_from_json(item: dict) -> dict:
+        """
+        Преобразовать отзыв из JSON fetchReviews в тот же формат, что и DOM-парсер.
+        """
+        author = item.get("author") or {}
+        icon_href = author.get("avatarUrl")
+        if icon_href:
+            icon_href = icon_href.replace("{size}", "islands-68")
+
+        # дата публикации, как datePublished в DOM: updatedTime меняется при
+        # правке отзыва, и review_key разошёлся бы между движками
+        date_string = item.get("createdTime") or item.get("updatedTime")
+        date = ParserHelper.form_date(date_string) if date_string else None
+
+        comment = item.get("businessComment") or {}
+
+        review = Review(
+            name=author.get("name"),
+            icon_href=icon_href,
+            date=date,
+            text=item.get("text"),
+            stars=item.get("rating") or 0,
+            answer=comment.get("text"),
+        )
+        return asdict(review)
+
+    def get_reviews(
+        self,
+        sort: str | None = None,
+        limit: int = -1,
+        since: float | str | None = None,
+    ) -> list:
+        """
+        Собрать отзывы через API.
+
+        sort  — тип сортировки (None / 'default' / 'newest' / 'negative' / 'positive')
+        limit — максимальное количество отзывов (-1 = все)
+        since — при sort='newest' остановиться на отзыве не новее отметки
+                (timestamp или review_key)
+        """
+        reviews: list = []
+        for items in self.iter_pages(sort=sort):
+            for item in items:
+                review = self.review_from_json(item)
+                if sort == "newest" and ParserHelper.reached_watermark(review, since):
+                    return reviews
+                reviews.append(review)
+                if 0 < limit <= len(reviews):
+                    return reviews
+        return reviews
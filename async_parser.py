@@ -0,0 +1,748 @@
+"""
+Асинхронный парсер поверх CDP: Chrome запускается с --remote-debugging-port,
+управление идёт напрямую по websocket (websockets), без Selenium и потоков.
+
+Один браузер на AsyncYandexParser, каждая компания — отдельная вкладка
+(flatten-сессия CDP на том же соединении). Одновременно открыто не больше
+concurrency вкладок. Извлечение на странице — те же сниппеты из scripts.py,
+что и у синхронного Parser, через Runtime.evaluate.
+"""
+
+import asyncio
+import itertools
+import json
+import re
+import shutil
+import tempfile
+from dataclasses import asdict
+from typing import AsyncIterator, Callable, Optional
+
+import websockets
+
+from yandex_reviews_parser.helpers import ParserHelper
+from yandex_reviews_parser.metrics import Metrics
+from yandex_reviews_parser.profiles import BrowserProfile
+from yandex_reviews_parser.resolver import CompanyIdResolver
+from yandex_reviews_parser.scripts import (
+    ANSWERS_RENDERED_JS,
+    COMPANY_INFO_JS,
+    COUNT_REVIEWS_JS,
+    EXPAND_ANSWERS_JS,
+    EXTRACT_REVIEWS_JS,
+    IS_ORG_PAGE_JS,
+    PAGE_READY_JS,
+    PRUNE_REVIEWS_JS,
+    REVIEWS_GREW_JS,
+    REVIEWS_RERENDERED_JS,
+    REVIEWS_TOTAL_JS,
+    SCROLL_LAST_REVIEW_JS,
+    SORT_LABELS,
+    SORT_OPTION_JS,
+    SORT_TOGGLE_JS,
+)
+from yandex_reviews_parser.storage import Info
+from yandex_reviews_parser.timings import AdaptivePoll, TimingProfile
+
+# navigator.webdriver скрываем так же, как это делает undetected_chromedriver
+STEALTH_JS = "Object.defineProperty(navigator, 'webdriver', {get: () => undefined});"
+
+
+class CdpError(Exception):
+    """Ошибка команды CDP или потеря соединения с браузером."""
+
+
+class CdpConnection:
+    """
+    Websocket-соединение с браузером. Ответы сопоставляются с командами по id,
+    события раздаются подписчикам по sessionId.
+    """
+
+    # сколько ждать ответа на команду, если send() не передали свой timeout
+    DEFAULT_TIMEOUT = 30.0
+
+    def __init__(self, ws):
+        self._ws = ws
+        self._ids = itertools.count(1)
+        self._pending: dict = {}
+        # sessionId -> callback(method, params)
+        self._listeners: dict = {}
+        self._reader = asyncio.create_task(self.__read())
+
+    @classmethod
+    async def connect(cls, url: str) -> "CdpConnection":
+        ws = await websockets.connect(url, max_size=None, ping_interval=None)
+        return cls(ws)
+
+    @property
+    def closed(self) -> bool:
+        return self._reader.done()
+
+    async def __read(self) -> None:
+        try:
+            async for raw in self._ws:
+                msg = json.loads(raw)
+                if "id" in msg:
+                    future = self._pending.pop(msg["id"], None)
+                    if future is None or future.done():
+                        continue
+                    if "error" in msg:
+                        future.set_exception(CdpError(msg["error"].get("message")))
+                    else:
+                        future.set_result(msg.get("result", {}))
+                    continue
+                listener = self._listeners.get(msg.get("sessionId"))
+                if listener:
+                    listener(msg.get("method"), msg.get("params", {}))
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(CdpError("соединение с браузером закрыто"))
+            self._pending.clear()
+
+    async def send(
+        self,
+        method: str,
+        params: Optional[dict] = None,
+        session_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> dict:
+        """
+        Отправить команду и дождаться ответа не дольше timeout секунд
+        (по умолчанию DEFAULT_TIMEOUT), иначе CdpError.
+        """
+        if self.closed:
+            raise CdpError("соединение с браузером закрыто")
+        msg_id = next(self._ids)
+        message = {"id": msg_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[msg_id] = future
+        try:
+            await self._ws.send(json.dumps(message))
+            timeout = self.DEFAULT_TIMEOUT if timeout is None else timeout
+            try:
+                return await asyncio.wait_for(future, timeout)
+            except asyncio.TimeoutError:
+                raise CdpError(f"{method}: нет ответа за {timeout} с") from None
+        finally:
+            self._pending.pop(msg_id, None)
+
+    def listen(self, session_id: str, callback: Optional[Callable]) -> None:
+        if callback is None:
+            self._listeners.pop(session_id, None)
+        else:
+            self._listeners[session_id] = callback
+
+    async def close(self) -> None:
+        await self._ws.close()
+        try:
+            await self._reader
+        except Exception:
+            pass
+
+
+class AsyncBrowser:
+    """
+    Процесс Chrome с отладочным портом. close() (и отмена запуска) всегда
+    убивает процесс и удаляет временный профиль.
+    """
+
+    CANDIDATES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+    DEVTOOLS_RE = re.compile(rb"DevTools listening on (ws://\S+)")
+
+    def __init__(self, executable_path: Optional[str] = None, profile: Optional[BrowserProfile] = None):
+        self.executable_path = executable_path or next(
+            (path for path in map(shutil.which, self.CANDIDATES) if path), None
+        )
+        if not self.executable_path:
+            raise FileNotFoundError("Chrome не найден, укажите browser_executable_path")
+        self.profile = profile or BrowserProfile()
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.connection: Optional[CdpConnection] = None
+        self.user_agent: Optional[str] = None
+        self._user_data_dir: Optional[str] = None
+        self._stderr_task: Optional[asyncio.Task] = None
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.process is not None
+            and self.process.returncode is None
+            and self.connection is not None
+            and not self.connection.closed
+        )
+
+    async def start(self, timeout: float = 30) -> None:
+        self._user_data_dir = tempfile.mkdtemp(prefix="yandex_parser_")
+        args = [
+            "--headless=new",
+            "--remote-debugging-port=0",
+            f"--user-data-dir={self._user_data_dir}",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--disable-gpu",
+            f"--window-size={self.profile.window_size}",
+            *self.profile.extra_args,
+            "about:blank",
+        ]
+        try:
+            self.process = await asyncio.create_subprocess_exec(
+                self.executable_path,
+                *args,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            ws_url = await asyncio.wait_for(self.__devtools_url(), timeout)
+            # stderr дальше просто вычитываем, иначе Chrome встанет на полном пайпе
+            self._stderr_task = asyncio.create_task(self.__drain_stderr())
+            self.connection = await CdpConnection.connect(ws_url)
+            version = await self.connection.send("Browser.getVersion")
+            self.user_agent = version.get("userAgent", "").replace("HeadlessChrome", "Chrome")
+        except BaseException:
+            await self.close()
+            raise
+
+    async def __devtools_url(self) -> str:
+        while True:
+            line = await self.process.stderr.readline()
+            if not line:
+                raise CdpError("Chrome завершился, не открыв отладочный порт")
+            match = self.DEVTOOLS_RE.search(line)
+            if match:
+                return match.group(1).decode()
+
+    async def __drain_stderr(self) -> None:
+        while await self.process.stderr.readline():
+            pass
+
+    async def new_page(self, timings: TimingProfile, metrics: Metrics) -> "AsyncPage":
+        """Новая вкладка со своей flatten-сессией."""
+        target = await self.connection.send("Target.createTarget", {"url": "about:blank"})
+        target_id = target["targetId"]
+        attached = await self.connection.send(
+            "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+        )
+        page = AsyncPage(self, target_id, attached["sessionId"], timings, metrics)
+        try:
+            await page.setup()
+        except BaseException:
+            await page.close()
+            raise
+        return page
+
+    async def close(self) -> None:
+        if self.connection is not None:
+            try:
+                await asyncio.wait_for(self.connection.close(), 2)
+            except Exception:
+                pass
+        if self.process is not None and self.process.returncode is None:
+            self.process.kill()
+            await self.process.wait()
+        if self._stderr_task is not None:
+            self._stderr_task.cancel()
+        if self._user_data_dir:
+            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+            self._user_data_dir = None
+
+
+class AsyncPage:
+    """
+    Вкладка с компанией: асинхронный аналог Parser на Runtime.evaluate.
+    Все ожидания ограничены таймаутами из TimingProfile.
+    """
+
+    REVIEWS_CLASS = "business-reviews-card-view__review"
+    EXTRACT_CHUNK = 200
+
+    def __init__(self, browser: AsyncBrowser, target_id: str, session_id: str,
+                 timings: TimingProfile, metrics: Metrics):
+        self.browser = browser
+        self.target_id = target_id
+        self.session_id = session_id
+        self.timings = timings
+        self.metrics = metrics
+        self._scroll_poll = AdaptivePoll(timings)
+        # общее число отзывов по разметке; 0 — не нашли
+        self._reviews_total: Optional[int] = None
+        # очищать уже извлечённые карточки (PRUNE_REVIEWS_JS)
+        self.prune_dom = False
+        # раскрывать и собирать ответы владельца
+        self.with_answers = True
+        # requestId -> url запросов fetchReviews и businessId первого успешного
+        self._fetch_urls: dict = {}
+        self._business_id: Optional[str] = None
+        self._fetch_seen = asyncio.Event()
+
+    async def send(self, method: str, params: Optional[dict] = None) -> dict:
+        self.metrics.incr(f"cdp.{method}")
+        return await self.browser.connection.send(
+            method, params, self.session_id, timeout=self.timings.command_timeout
+        )
+
+    async def setup(self) -> None:
+        self.browser.connection.listen(self.session_id, self.__on_event)
+        await self.send("Network.enable")
+        await self.send("Page.addScriptToEvaluateOnNewDocument", {"source": STEALTH_JS})
+        if self.browser.user_agent:
+            await self.send("Network.setUserAgentOverride", {"userAgent": self.browser.user_agent})
+        patterns = self.browser.profile.effective_blocked_urls()
+        if patterns:
+            await self.send("Network.setBlockedURLs", {"urls": patterns})
+
+    def __on_event(self, method: str, params: dict) -> None:
+        if method == "Network.requestWillBeSent":
+            url = params.get("request", {}).get("url", "")
+            if "fetchReviews" in url:
+                self._fetch_urls[params.get("requestId")] = url
+        elif method == "Network.responseReceived":
+            response = params.get("response", {})
+            url = self._fetch_urls.get(params.get("requestId")) or response.get("url", "")
+            if "fetchReviews" not in url or response.get("status") != 200:
+                return
+            match = re.search(r"businessId=(\d+)", url)
+            if match and self._business_id is None:
+                self._business_id = match.group(1)
+                self._fetch_seen.set()
+
+    async def close(self) -> bool:
+        """Закрыть вкладку. False — браузер не ответил."""
+        connection = self.browser.connection
+        if connection is None or connection.closed:
+            return False
+        connection.listen(self.session_id, None)
+        try:
+            await asyncio.wait_for(
+                connection.send("Target.closeTarget", {"targetId": self.target_id}), 5
+            )
+        except (CdpError, asyncio.TimeoutError):
+            return False
+        return True
+
+    async def evaluate(self, script: str, *args):
+        """
+        Выполнить сниппет в стиле execute_script (arguments[...] и return)
+        и вернуть результат по значению.
+        """
+        expression = f"(function () {{{script}}}).apply(null, {json.dumps(args)})"
+        result = await self.send(
+            "Runtime.evaluate",
+            {"expression": expression, "returnByValue": True, "awaitPromise": True},
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            description = details.get("exception", {}).get("description") or details.get("text")
+            raise CdpError(f"ошибка JS: {description}")
+        return result.get("result", {}).get("value")
+
+    async def __poll(self, script: str, args: tuple, poll: float):
+        while True:
+            try:
+                value = await self.evaluate(script, *args)
+            except CdpError:
+                # контекст страницы пересоздаётся при навигации — пробуем ещё
+                value = None
+            if value:
+                return value
+            await asyncio.sleep(poll)
+
+    async def wait_js(self, script: str, *args, timeout: float, poll: Optional[float] = None):
+        """
+        Ждём, пока сниппет вернёт истинное значение, и отдаём его.
+        По таймауту возвращаем None, как Parser.__wait_for.
+        """
+        try:
+            return await asyncio.wait_for(
+                self.__poll(script, args, poll or self.timings.poll), timeout
+            )
+        except asyncio.TimeoutError:
+            return None
+
+    async def goto(self, url: str) -> bool:
+        with self.metrics.span("page_open"):
+            await asyncio.wait_for(
+                self.send("Page.navigate", {"url": url}), self.timings.page_timeout
+            )
+        with self.metrics.span("page_ready"):
+            ready = await self.wait_js(
+                PAGE_READY_JS, self.REVIEWS_CLASS, timeout=self.timings.page_timeout
+            )
+        return bool(ready)
+
+    async def get_business_id_from_network(self, timeout: float) -> Optional[str]:
+        with self.metrics.span("network_wait"):
+            try:
+                await asyncio.wait_for(self._fetch_seen.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._business_id
+
+    async def is_valid_page(self) -> bool:
+        return bool(await self.evaluate(IS_ORG_PAGE_JS))
+
+    async def get_company_info(self) -> dict:
+        with self.metrics.span("company_info"):
+            raw = await self.evaluate(COMPANY_INFO_JS) or {}
+        try:
+            if raw.get("count_rating") is None:
+                raise ValueError("нет блока рейтинга")
+            rating = float(raw["rating"].replace(",", ".")) if raw.get("rating") else 0
+            count_rating = ParserHelper.list_to_num(raw["count_rating"])
+            stars = raw.get("stars") or 0
+        except (ValueError, IndexError):
+            rating = count_rating = stars = 0
+        item = Info(
+            name=raw.get("name"),
+            rating=rating,
+            count_rating=count_rating,
+            stars=stars,
+        )
+        return asdict(item)
+
+    async def set_reviews_sort(self, sort: Optional[str]) -> None:
+        if not sort:
+            return
+        label = SORT_LABELS.get(sort)
+        if not label:
+            print(f"[sort={sort}] неизвестный тип сортировки")
+            return
+        if not await self.wait_js(SORT_TOGGLE_JS, timeout=self.timings.sort_timeout):
+            print(f"[sort={sort}] не нашёл кнопку сортировки")
+            return
+        if not await self.wait_js(
+            SORT_OPTION_JS, label, self.REVIEWS_CLASS, timeout=self.timings.sort_timeout
+        ):
+            print(f"[sort={sort}] не нашёл пункт '{label}'")
+            return
+        await self.wait_js(
+            REVIEWS_RERENDERED_JS, self.REVIEWS_CLASS, timeout=self.timings.rerender_timeout
+        )
+
+    async def __expand_answers(self, start: int, stop: int) -> None:
+        pending = await self.evaluate(EXPAND_ANSWERS_JS, self.REVIEWS_CLASS, start, stop)
+        if pending:
+            await self.wait_js(
+                ANSWERS_RENDERED_JS, self.REVIEWS_CLASS, start, stop,
+                timeout=self.timings.rerender_timeout,
+            )
+
+    async def __extract(self, start: int, stop: int) -> list:
+        reviews: list = []
+        pos = start
+        while stop < 0 or pos < stop:
+            count = self.EXTRACT_CHUNK if stop < 0 else min(self.EXTRACT_CHUNK, stop - pos)
+            if self.with_answers:
+                await self.__expand_answers(pos, pos + count)
+            chunk = await self.evaluate(
+                EXTRACT_REVIEWS_JS, self.REVIEWS_CLASS, pos, count, self.with_answers
+            )
+            batch = [ParserHelper.review_from_js(raw) for raw in chunk or []]
+            reviews.extend(batch)
+            pos += len(batch)
+            if len(batch) < count:
+                break
+        return reviews
+
+    async def __scroll_step(self, loaded: int) -> bool:
+        count = await self.evaluate(SCROLL_LAST_REVIEW_JS, self.REVIEWS_CLASS, loaded)
+        if not count:
+            return False
+        if count > loaded:
+            return True
+        if self._reviews_total is None:
+            self._reviews_total = await self.evaluate(REVIEWS_TOTAL_JS) or 0
+        if self._reviews_total and count >= self._reviews_total:
+            return False
+        started = asyncio.get_running_loop().time()
+        grown = await self.wait_js(
+            REVIEWS_GREW_JS,
+            self.REVIEWS_CLASS,
+            loaded,
+            timeout=self.timings.scroll_timeout,
+            poll=self._scroll_poll.interval,
+        )
+        if grown:
+            self._scroll_poll.observe(asyncio.get_running_loop().time() - started)
+        return bool(grown)
+
+    async def iter_reviews(
+        self,
+        sort: Optional[str] = None,
+        limit: int = -1,
+        since: float | str | None = None,
+    ) -> AsyncIterator[dict]:
+        """То же, что Parser.iter_reviews: пачками по мере подгрузки, без повторов."""
+        if since is not None and sort != "newest":
+            print(f"[since] работает только с sort='newest', sort={sort} — игнорируем")
+            since = None
+
+        with self.metrics.span("sort"):
+            await self.set_reviews_sort(sort)
+        with self.metrics.span("reviews_wait"):
+            await self.wait_js(
+                COUNT_REVIEWS_JS, self.REVIEWS_CLASS, timeout=self.timings.reviews_timeout
+            )
+
+        seen: set = set()
+        yielded = 0
+        pos = 0
+        while True:
+            stop = -1 if limit <= 0 else pos + (limit - yielded)
+            with self.metrics.span("extract"):
+                batch = await self.__extract(pos, stop)
+            self.metrics.incr("reviews_extracted", len(batch))
+            pos += len(batch)
+            if self.prune_dom and batch:
+                pruned = await self.evaluate(
+                    PRUNE_REVIEWS_JS, self.REVIEWS_CLASS, pos - len(batch), pos
+                )
+                self.metrics.incr("reviews_pruned", pruned or 0)
+
+            for review in batch:
+                if ParserHelper.reached_watermark(review, since):
+                    return
+                key = ParserHelper.review_key(review)
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield review
+                yielded += 1
+                if 0 < limit <= yielded:
+                    return
+
+            with self.metrics.span("scroll"):
+                more = await self.__scroll_step(pos)
+            self.metrics.incr("scroll_iterations")
+            if not more:
+                return
+
+
+class AsyncYandexParser:
+    """
+    Асинхронный YandexParser для asyncio-сервисов.
+
+        async with AsyncYandexParser(concurrency=4) as parser:
+            data = await parser.parse(1234567890)
+            async for review in parser.iter_reviews(1234567890, limit=100):
+                ...
+
+    Отмена задачи закрывает её вкладку; если браузер при этом не отвечает,
+    он убивается и при следующем вызове запускается заново.
+    """
+
+    def __init__(
+        self,
+        browser_executable_path: str | None = None,
+        concurrency: int = 2,
+        timings: TimingProfile | None = None,
+        profile: BrowserProfile | None = None,
+        launch_timeout: float = 30,
+        metrics_sink: Callable[[dict, dict], None] | None = None,
+        prune_dom: bool = False,
+    ):
+        """
+        browser_executable_path — путь к Chrome (по умолчанию ищем в PATH)
+        concurrency             — сколько вкладок работает одновременно
+        timings                 — таймауты этапов (TimingProfile, .fast(), .patient())
+        profile                 — BrowserProfile: аргументы Chrome и блокировка URL
+                                  (prefs по CDP не применяются)
+        launch_timeout          — сколько ждать запуска Chrome
+        metrics_sink            — callable(labels, snapshot) после каждого прохода
+        prune_dom               — очищать уже извлечённые карточки отзывов в DOM
+        """
+        self.browser_executable_path = browser_executable_path
+        self.timings = timings or TimingProfile()
+        self.profile = profile or BrowserProfile()
+        self.launch_timeout = launch_timeout
+        self.metrics_sink = metrics_sink
+        self.prune_dom = prune_dom
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._browser: Optional[AsyncBrowser] = None
+        self._browser_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self) -> None:
+        """Закрыть браузер."""
+        if self._browser is not None:
+            browser, self._browser = self._browser, None
+            await browser.close()
+
+    async def __ensure_browser(self) -> AsyncBrowser:
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.alive:
+                if self._browser is not None:
+                    await self._browser.close()
+                browser = AsyncBrowser(self.browser_executable_path, self.profile)
+                await browser.start(self.launch_timeout)
+                self._browser = browser
+            return self._browser
+
+    async def __open_page(self, metrics: Metrics, with_answers: bool = True) -> AsyncPage:
+        with metrics.span("driver_acquire"):
+            browser = await self.__ensure_browser()
+        page = await browser.new_page(self.timings, metrics)
+        page.prune_dom = self.prune_dom
+        page.with_answers = with_answers
+        return page
+
+    async def __close_page(self, page: AsyncPage) -> None:
+        """
+        Закрыть вкладку даже при отмене задачи. Не вышло — убиваем браузер,
+        чтобы не оставить висящий процесс.
+        """
+        try:
+            closed = await asyncio.shield(page.close())
+        except BaseException:
+            await self.__kill_browser(page.browser)
+            raise
+        if not closed:
+            await self.__kill_browser(page.browser)
+
+    async def __kill_browser(self, browser: AsyncBrowser) -> None:
+        if self._browser is browser:
+            self._browser = None
+        await browser.close()
+
+    def __report(self, metrics: Metrics, labels: dict) -> dict:
+        snapshot = metrics.snapshot()
+        if self.metrics_sink:
+            try:
+                self.metrics_sink(labels, snapshot)
+            except Exception as e:
+                print(f"[metrics] sink упал: {e}")
+        return snapshot
+
+    @staticmethod
+    async def __collect_reviews(
+        page: AsyncPage,
+        sort: str | None,
+        limit: int,
+        since: float | str | None,
+        sorts: list | None,
+        dedupe: bool,
+    ):
+        """Список отзывов для sort или {sort: список} для sorts на одной вкладке."""
+        if not sorts:
+            return [review async for review in page.iter_reviews(sort, limit, since)]
+        seen: set = set()
+        by_sort: dict = {}
+        for view in sorts:
+            reviews = [
+                review
+                async for review in page.iter_reviews(
+                    view, limit, since if view == "newest" else None
+                )
+            ]
+            if dedupe:
+                reviews = [r for r in reviews if ParserHelper.review_key(r) not in seen]
+                seen.update(ParserHelper.review_key(r) for r in reviews)
+            by_sort[view] = reviews
+        return by_sort
+
+    async def parse(
+        self,
+        id_yandex: int,
+        type_parse: str = "default",
+        sort: str | None = "newest",
+        limit: int = -1,
+        since: float | str | None = None,
+        with_metrics: bool = False,
+        with_answers: bool = True,
+        sorts: list | None = None,
+        dedupe: bool = False,
+    ) -> dict:
+        """
+        Те же type_parse / sort / limit / since / with_answers / sorts / dedupe,
+        что у YandexParser.parse.
+        Ошибки (браузер, таймауты, разбор отзывов) возвращаются как
+        {"error": "..."}; отмена пробрасывается.
+        """
+        metrics = Metrics()
+        result: dict = {}
+        async with self._semaphore:
+            page = None
+            try:
+                page = await self.__open_page(metrics, with_answers)
+                await page.goto(f"https://yandex.ru/maps/org/{id_yandex}/reviews/")
+                if not await page.is_valid_page():
+                    result = {"error": "Страница не найдена"}
+                elif type_parse == "company":
+                    result = {"company_info": await page.get_company_info()}
+                else:
+                    if type_parse == "default":
+                        result["company_info"] = await page.get_company_info()
+                    result["company_reviews"] = await self.__collect_reviews(
+                        page, sort, limit, since, sorts, dedupe
+                    )
+            except Exception as e:
+                # CancelledError — BaseException и сюда не попадает
+                result = {"error": f"{type(e).__name__}: {e}"}
+            finally:
+                if page is not None:
+                    await self.__close_page(page)
+                snapshot = self.__report(
+                    metrics,
+                    {
+                        "id_yandex": id_yandex,
+                        "type_parse": type_parse,
+                        "sort": ",".join(sorts) if sorts else sort,
+                    },
+                )
+        if with_metrics:
+            result["metrics"] = snapshot
+        return result
+
+    async def iter_reviews(
+        self,
+        id_yandex: int,
+        sort: str | None = "newest",
+        limit: int = -1,
+        since: float | str | None = None,
+        with_answers: bool = True,
+    ) -> AsyncIterator[dict]:
+        """
+        Асинхронный генератор отзывов. Вкладка держит слот семафора, пока
+        генератор не дочитан или не закрыт (aclose / выход из async for).
+        """
+        metrics = Metrics()
+        async with self._semaphore:
+            page = await self.__open_page(metrics, with_answers)
+            try:
+                await page.goto(f"https://yandex.ru/maps/org/{id_yandex}/reviews/")
+                if not await page.is_valid_page():
+                    raise ValueError("Страница не найдена")
+                async for review in page.iter_reviews(sort, limit, since):
+                    yield review
+            finally:
+                await self.__close_page(page)
+                self.__report(metrics, {"id_yandex": id_yandex, "type_parse": "reviews", "sort": sort})
+
+    async def get_company_id_from_url(self, url: str, timeout: float = 10) -> int | None:
+        """
+        businessId из самого URL (/maps/org/<slug>/<id>/), а если его там
+        нет — открыть URL и вытащить businessId из запроса fetchReviews.
+        """
+        found = CompanyIdResolver.from_url(url)
+        if found is not None:
+            return found
+        metrics = Metrics()
+        async with self._semaphore:
+            page = await self.__open_page(metrics)
+            try:
+                with metrics.span("page_open"):
+                    await asyncio.wait_for(
+                        page.send("Page.navigate", {"url": url}), self.timings.page_timeout
+                    )
+                biz_id = await page.get_business_id_from_network(timeout)
+                return int(biz_id) if biz_id is not None else None
+            finally:
+                await self.__close_page(page)
+                self.__report(metrics, {"url": url, "type_parse": "company_id"})
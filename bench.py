@@ -0,0 +1,574 @@
+"""
+Офлайн-бенчмарк горячих путей Parser без обращения к живому Яндексу.
+
+Два режима:
+  * in-process FakeDriver (по умолчанию) — эмулирует ровно те вызовы WebDriver,
+    которые делает Parser, поверх синтетической страницы на N отзывов;
+  * --chrome — настоящая страница-фикстура с тем же DOM, которая отдаётся
+    локальным HTTP-сервером и открывается в Chrome.
+
+Запуск:
+    python -m yandex_reviews_parser.bench --sizes 10 1000 10000
+    python -m yandex_reviews_parser.bench --save-baseline bench_baseline.json
+    python -m yandex_reviews_parser.bench --baseline bench_baseline.json
+    python -m yandex_reviews_parser.bench --chrome --profile default lean
+    python -m yandex_reviews_parser.bench --import-time --import-budget-ms 50
+"""
+import argparse
+import functools
+import html
+import http.server
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Optional
+
+from selenium.common.exceptions import NoSuchElementException
+
+from yandex_reviews_parser.metrics import InstrumentedDriver, Metrics
+from yandex_reviews_parser.parsers import Parser
+from yandex_reviews_parser.pool import DriverPool
+from yandex_reviews_parser.scripts import (
+    COUNT_REVIEWS_JS,
+    EXPAND_ANSWERS_JS,
+    EXTRACT_REVIEWS_JS,
+    FIRST_REVIEW_JS,
+    PAGE_READY_JS,
+    PAGE_STATE_JS,
+    PRUNE_REVIEWS_JS,
+    REVIEWS_TOTAL_JS,
+    SCROLL_LAST_REVIEW_JS,
+)
+from yandex_reviews_parser.timings import TimingProfile
+
+# Сколько отзывов страница подгружает за один скролл
+PAGE_STEP = 50
+# Таймауты для бенчмарка: конец списка на фейке определяется мгновенно
+BENCH_TIMINGS = TimingProfile(scroll_timeout=0.05, reviews_timeout=0.05, poll=0.001)
+
+
+def synthetic_review(i: int) -> dict:
+    """Детерминированный отзыв номер i."""
+    return {
+        "name": f"Автор {i % 997}",
+        "icon": f"https://avatars.mds.yandex.net/get-yapic/{i}/islands-68",
+        "date": "2024-%02d-%02dT10:%02d:%02d.000Z"
+        % (1 + i % 12, 1 + i % 28, i % 60, (i // 60) % 60),
+        "text": f"Отзыв {i}: " + "очень хорошее место " * (1 + i % 5),
+        "stars": 1 + i % 5,
+        "answer": f"Спасибо за отзыв {i}!" if i % 3 == 0 else None,
+    }
+
+
+class FakeElement:
+    """Элемент FakeDriver: текст, атрибуты и вложенные элементы по селектору."""
+
+    def __init__(self, text: str = "", attrs: Optional[dict] = None, children=None):
+        self.text = text
+        self.attrs = attrs or {}
+        # селектор -> список FakeElement
+        self.children = children or {}
+
+    def get_attribute(self, name: str):
+        return self.attrs.get(name)
+
+    def is_displayed(self) -> bool:
+        return True
+
+    def find_elements(self, by, value) -> list:
+        return list(self.children.get(value, []))
+
+    def find_element(self, by, value):
+        found = self.children.get(value)
+        if not found:
+            raise NoSuchElementException(value)
+        return found[0]
+
+
+def review_element(review: dict) -> FakeElement:
+    stars = [
+        FakeElement(attrs={"class": "business-rating-badge-view__stars _full"})
+        for _ in range(review["stars"])
+    ] + [
+        FakeElement(attrs={"class": "business-rating-badge-view__stars _empty"})
+        for _ in range(5 - review["stars"])
+    ]
+    children = {
+        ".//span[@itemprop='name']": [FakeElement(review["name"])],
+        ".//div[@class='user-icon-view__icon']": [
+            FakeElement(attrs={"style": f'background-image: url("{review["icon"]}");'})
+        ],
+        ".//meta[@itemprop='datePublished']": [
+            FakeElement(attrs={"content": review["date"]})
+        ],
+        "business-review-view__body": [FakeElement(review["text"])],
+        ".business-review-view__rating span": stars,
+    }
+    if review["answer"]:
+        children["business-review-view__comment-expand"] = [FakeElement()]
+        children["business-review-comment-content__bubble"] = [
+            FakeElement(review["answer"])
+        ]
+    return FakeElement(children=children)
+
+
+def company_element(total: int) -> FakeElement:
+    rating_text = [FakeElement("4"), FakeElement(","), FakeElement("5")]
+    stars = [
+        FakeElement(attrs={"class": "business-rating-badge-view__stars _full"})
+        for _ in range(4)
+    ]
+    return FakeElement(
+        children={
+            ".//div[@class='business-summary-rating-badge-view__rating']"
+            "/span[contains(@class, 'business-summary-rating-badge-view__rating-text')]":
+                rating_text,
+            ".//div[@class='business-summary-rating-badge-view__rating-count']"
+            "/span[@class='business-rating-amount-view _summary']": [
+                FakeElement(f"{total} оценок")
+            ],
+            ".//div[@class='business-rating-badge-view__stars']/span": stars,
+        }
+    )
+
+
+def synthetic_perf_log(noise: int, business_id: str = "1040226791") -> list:
+    """
+    Performance-лог: noise посторонних событий и один fetchReviews в конце.
+    """
+    def entry(method: str, **params) -> dict:
+        message = {"message": {"method": method, "params": params}}
+        return {"message": json.dumps(message, separators=(",", ":")), "level": "INFO"}
+
+    url = (
+        "https://yandex.ru/maps/api/business/fetchReviews"
+        f"?businessId={business_id}&page=1&csrfToken=x"
+    )
+    log = []
+    for i in range(noise):
+        log.append(
+            entry(
+                "Network.dataReceived" if i % 2 else "Network.responseReceived",
+                requestId=f"noise.{i}",
+                response={"url": f"https://core-renderer-tiles.maps.yandex.net/{i}.png",
+                          "status": 200},
+                dataLength=1024,
+            )
+        )
+    log.append(entry("Network.requestWillBeSent", requestId="fr.1",
+                     request={"url": url, "headers": {"Accept": "application/json"}}))
+    log.append(entry("Network.responseReceived", requestId="fr.1",
+                     response={"url": url, "status": 200}))
+    log.append(entry("Network.loadingFinished", requestId="fr.1"))
+    return log
+
+
+class FakeDriver:
+    """
+    In-process WebDriver: страница на total отзывов, которые подгружаются
+    по PAGE_STEP на каждый скролл к последнему отзыву.
+    """
+
+    def __init__(self, total: int, perf_noise: int = 0, report_total: bool = True):
+        self.total = total
+        # отдавать ли общее число отзывов (REVIEWS_TOTAL_JS)
+        self.report_total = report_total
+        self.loaded = min(PAGE_STEP, total)
+        self.reviews = [synthetic_review(i) for i in range(total)]
+        self._elements: dict = {}
+        self.perf_log = synthetic_perf_log(perf_noise) if perf_noise else []
+        self.company = company_element(total)
+
+    def __element(self, i: int) -> FakeElement:
+        elem = self._elements.get(i)
+        if elem is None:
+            elem = self._elements[i] = review_element(self.reviews[i])
+            elem.index = i
+        return elem
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        return {}
+
+    def get_log(self, log_type: str) -> list:
+        log, self.perf_log = self.perf_log, []
+        return log
+
+    def get_cookies(self) -> list:
+        return []
+
+    def find_elements(self, by, value) -> list:
+        if value == Parser.REVIEWS_CLASS:
+            return [self.__element(i) for i in range(self.loaded)]
+        return []
+
+    def find_element(self, by, value):
+        if value == Parser.ORG_NAME_XPATH:
+            return FakeElement("Тестовая компания")
+        if value == ".//div[@class='business-summary-rating-badge-view__rating-and-stars']":
+            return self.company
+        raise NoSuchElementException(value)
+
+    def __extract(self, start: int, count: int, with_answers: bool = True) -> list:
+        out = []
+        for review in self.reviews[start:min(self.loaded, start + count)]:
+            out.append({
+                "name": review["name"],
+                "icon_style": f'background-image: url("{review["icon"]}");',
+                "date": review["date"],
+                "text": review["text"],
+                "stars": review["stars"],
+                "answer": review["answer"] if with_answers else None,
+            })
+        return out
+
+    def execute_script(self, script: str, *args):
+        if script == EXTRACT_REVIEWS_JS:
+            return self.__extract(args[1], args[2], args[3] if len(args) > 3 else True)
+        if script == EXPAND_ANSWERS_JS:
+            # ответы в фикстуре отрисовываются сразу после клика
+            return 0
+        if script == COUNT_REVIEWS_JS:
+            return self.loaded
+        if script == PAGE_READY_JS:
+            return True
+        if script == PAGE_STATE_JS:
+            return {"ready_state": "complete", "captcha": False, "org": True}
+        if script == FIRST_REVIEW_JS:
+            return self.__element(0) if self.loaded else None
+        if script == SCROLL_LAST_REVIEW_JS:
+            count = self.loaded
+            if count and count <= args[1]:
+                self.loaded = min(self.total, self.loaded + PAGE_STEP)
+            return count
+        if script == PRUNE_REVIEWS_JS:
+            return max(0, min(self.loaded, args[2]) - args[1])
+        if script == REVIEWS_TOTAL_JS:
+            return self.total if self.report_total else None
+        if script == "return 1":
+            return 1
+        return None
+
+
+def run_stage(name: str, func, reviews: int, metrics: Metrics) -> dict:
+    """Прогнать один этап и снять время, вызовы и пик памяти Python."""
+    before = metrics.webdriver_calls
+    scrolls_before = metrics.counters["scroll_iterations"]
+    tracemalloc.start()
+    started = time.perf_counter()
+    func()
+    wall = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    calls = metrics.webdriver_calls - before
+    return {
+        "stage": name,
+        "wall_s": round(wall, 4),
+        "reviews": reviews,
+        "reviews_per_s": round(reviews / wall, 1) if reviews and wall else None,
+        "calls": calls,
+        "calls_per_review": round(calls / reviews, 3) if reviews else None,
+        "py_peak_mb": round(peak / (1024 * 1024), 2),
+        "scrolls": metrics.counters["scroll_iterations"] - scrolls_before,
+    }
+
+
+def bench_fake(size: int, perf_noise: int = 5000) -> list:
+    """Все этапы Parser на FakeDriver со страницей на size отзывов."""
+    results = []
+
+    metrics = Metrics()
+    driver = InstrumentedDriver(FakeDriver(size, perf_noise=perf_noise), metrics)
+    parser = Parser(driver, timings=BENCH_TIMINGS, metrics=metrics)
+    results.append(run_stage("page_ready", parser.wait_page_ready, 0, metrics))
+    results.append(run_stage("company_info", parser.parse_company_info, 0, metrics))
+    results.append(
+        run_stage("network_fetch", parser._collect_fetch_from_logs, 0, metrics)
+    )
+    results.append(run_stage("reviews_js", parser.parse_reviews, size, metrics))
+
+    metrics = Metrics()
+    driver = InstrumentedDriver(FakeDriver(size), metrics)
+    parser = Parser(driver, timings=BENCH_TIMINGS, metrics=metrics, prune_dom=True)
+    results.append(run_stage("reviews_pruned", parser.parse_reviews, size, metrics))
+
+    metrics = Metrics()
+    driver = InstrumentedDriver(FakeDriver(size), metrics)
+    parser = Parser(driver, timings=BENCH_TIMINGS, metrics=metrics)
+    parser._js_extract = False
+    results.append(run_stage("reviews_elements", parser.parse_reviews, size, metrics))
+
+    for row in results:
+        row["size"] = size
+    return results
+
+
+def fixture_html(size: int) -> str:
+    """
+    HTML-фикстура с тем же DOM, что и страница отзывов Яндекса. Отзывы
+    подгружаются по PAGE_STEP, когда последний отзыв попадает в область видимости.
+    """
+    cards = []
+    for i in range(size):
+        r = synthetic_review(i)
+        stars = "".join(
+            f'<span class="business-rating-badge-view__stars {"_full" if s < r["stars"] else "_empty"}"></span>'
+            for s in range(5)
+        )
+        answer = (
+            '<div class="business-review-view__comment-expand" '
+            "onclick=\"this.insertAdjacentHTML('afterend', "
+            f"'<div class=&quot;business-review-comment-content__bubble&quot;>{html.escape(r['answer'])}</div>')\">"
+            "Посмотреть ответ</div>"
+            if r["answer"] else ""
+        )
+        cards.append(
+            '<div class="business-reviews-card-view__review">'
+            f'<span itemprop="name">{html.escape(r["name"])}</span>'
+            f'<div class="user-icon-view__icon" style=\'background-image: url("{r["icon"]}");\'></div>'
+            f'<meta itemprop="datePublished" content="{r["date"]}">'
+            f'<div class="business-review-view__rating">{stars}</div>'
+            f'<div class="business-review-view__body">{html.escape(r["text"])}</div>'
+            f"{answer}</div>"
+        )
+    return (
+        "<!doctype html><html><head><meta charset='utf-8'></head><body>"
+        "<h1 class='orgpage-header-view__header'>Тестовая компания</h1>"
+        f"<meta itemprop='reviewCount' content='{size}'>"
+        "<div id='list'></div><template id='cards'>"
+        + "".join(cards)
+        + "</template><script>"
+        f"var step = {PAGE_STEP}, pool = document.getElementById('cards').content;"
+        "var list = document.getElementById('list');"
+        "function more() { for (var i = 0; i < step && pool.firstChild; i++) {"
+        " list.appendChild(pool.firstChild); } observe(); }"
+        "var io = new IntersectionObserver(function (es) {"
+        " if (es[0].isIntersecting) { io.disconnect(); setTimeout(more, 50); } });"
+        "function observe() { var last = list.lastElementChild; if (last) io.observe(last); }"
+        "more();</script></body></html>"
+    )
+
+
+def serve_fixtures(sizes: list, directory: str) -> http.server.ThreadingHTTPServer:
+    """Записать фикстуры в directory и раздать их локальным HTTP-сервером."""
+    os.makedirs(directory, exist_ok=True)
+    for size in sizes:
+        with open(os.path.join(directory, f"reviews_{size}.html"), "w", encoding="utf-8") as f:
+            f.write(fixture_html(size))
+    handler = functools.partial(
+        http.server.SimpleHTTPRequestHandler, directory=directory
+    )
+    handler.log_message = lambda *args: None
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def bench_chrome(size: int, server, driver, prune_dom: bool = False) -> list:
+    """Этапы Parser на настоящей странице-фикстуре в Chrome."""
+    metrics = Metrics()
+    counting = InstrumentedDriver(driver, metrics)
+    url = f"http://127.0.0.1:{server.server_address[1]}/reviews_{size}.html"
+    started = time.perf_counter()
+    driver.get(url)
+    results = [{"stage": "page_load", "wall_s": round(time.perf_counter() - started, 4),
+                "reviews": 0, "reviews_per_s": None, "calls": 1,
+                "calls_per_review": None, "py_peak_mb": None, "scrolls": 0}]
+    parser = Parser(counting, metrics=metrics, prune_dom=prune_dom)
+    results.append(run_stage("page_ready", parser.wait_page_ready, 0, metrics))
+    results.append(run_stage("reviews_js", parser.parse_reviews, size, metrics))
+    rss = DriverPool.browser_rss_mb(driver)
+    for row in results:
+        row["size"] = size
+        row["browser_rss_mb"] = round(rss, 1) if rss is not None else None
+    return results
+
+
+def compare(results: list, baseline: list, tolerance: float) -> list:
+    """
+    Сравнить с базовой линией: reviews/s не ниже, вызовов на отзыв не больше
+    (с допуском tolerance). Возвращает список строк с регрессиями.
+    """
+    base = {(row["size"], row["stage"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        ref = base.get((row["size"], row["stage"]))
+        if not ref:
+            continue
+        if ref.get("reviews_per_s") and row.get("reviews_per_s"):
+            if row["reviews_per_s"] < ref["reviews_per_s"] * (1 - tolerance):
+                regressions.append(
+                    f"{row['stage']}[{row['size']}]: reviews/s "
+                    f"{row['reviews_per_s']} < {ref['reviews_per_s']}"
+                )
+        if ref.get("calls_per_review") is not None and row.get("calls_per_review") is not None:
+            if row["calls_per_review"] > ref["calls_per_review"] * (1 + tolerance):
+                regressions.append(
+                    f"{row['stage']}[{row['size']}]: calls/review "
+                    f"{row['calls_per_review']} > {ref['calls_per_review']}"
+                )
+    return regressions
+
+
+# Браузерные и сетевые зависимости, которые не должны грузиться при импорте
+HEAVY_MODULES = ("selenium", "undetected_chromedriver", "requests")
+
+# модуль -> какие из HEAVY_MODULES ему импортировать нельзя
+IMPORT_CHECKS = {
+    "yandex_reviews_parser": HEAVY_MODULES,
+    "yandex_reviews_parser.utils": HEAVY_MODULES,
+    "yandex_reviews_parser.helpers": HEAVY_MODULES,
+    "yandex_reviews_parser.storage": HEAVY_MODULES,
+    "yandex_reviews_parser.cache": HEAVY_MODULES,
+    "yandex_reviews_parser.state": HEAVY_MODULES,
+    "yandex_reviews_parser.timings": HEAVY_MODULES,
+    "yandex_reviews_parser.profiles": HEAVY_MODULES,
+    "yandex_reviews_parser.jobs": HEAVY_MODULES,
+    "yandex_reviews_parser.rate": HEAVY_MODULES,
+    "yandex_reviews_parser.writers": HEAVY_MODULES,
+    "yandex_reviews_parser.resolver": HEAVY_MODULES,
+    "yandex_reviews_parser.checkpoint": HEAVY_MODULES,
+    "yandex_reviews_parser.api": ("selenium", "undetected_chromedriver"),
+    "yandex_reviews_parser.async_parser": HEAVY_MODULES,
+}
+
+IMPORT_PROBE = (
+    "import sys, time, json\n"
+    "started = time.perf_counter()\n"
+    "import {module}\n"
+    "elapsed = time.perf_counter() - started\n"
+    "print(json.dumps({{'ms': elapsed * 1000, 'loaded': [m for m in {heavy!r} if m in sys.modules]}}))\n"
+)
+
+
+def bench_import(runs: int = 5, budget_ms: float = 50.0) -> tuple:
+    """
+    Время холодного импорта модулей пакета, каждый раз в новом интерпретаторе.
+    Бюджет budget_ms проверяется для самого `import yandex_reviews_parser`
+    (медиана по runs), для остальных — только отсутствие тяжёлых зависимостей.
+    @return: (строки результатов, список нарушений)
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    results, violations = [], []
+    for module, forbidden in IMPORT_CHECKS.items():
+        timings, loaded = [], []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", IMPORT_PROBE.format(module=module, heavy=HEAVY_MODULES)],
+                capture_output=True, text=True, env=env, check=True,
+            )
+            probe = json.loads(out.stdout)
+            timings.append(probe["ms"])
+            loaded = probe["loaded"]
+        row = {
+            "module": module,
+            "import_ms": round(statistics.median(timings), 2),
+            "loaded": ",".join(loaded) or "-",
+        }
+        results.append(row)
+        bad = [m for m in loaded if m in forbidden]
+        if bad:
+            violations.append(f"{module}: при импорте загружены {', '.join(bad)}")
+        if module == "yandex_reviews_parser" and row["import_ms"] > budget_ms:
+            violations.append(f"{module}: {row['import_ms']} ms > бюджета {budget_ms} ms")
+    return results, violations
+
+
+def print_table(results: list) -> None:
+    columns = [
+        "size", "stage", "wall_s", "reviews_per_s", "calls", "calls_per_review",
+        "scrolls", "py_peak_mb",
+    ]
+    if any("profile" in row for row in results):
+        columns = ["profile"] + columns + ["browser_rss_mb"]
+    print("  ".join(f"{c:>16}" for c in columns))
+    for row in results:
+        print("  ".join(f"{str(row.get(c)):>16}" for c in columns))
+
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    ap.add_argument("--perf-noise", type=int, default=5000,
+                    help="посторонних событий в синтетическом performance-логе")
+    ap.add_argument("--chrome", action="store_true",
+                    help="гонять фикстуры в настоящем Chrome вместо FakeDriver")
+    ap.add_argument("--profile", nargs="+", choices=["default", "lean"], default=["default"],
+                    help="профили браузера для --chrome (BrowserProfile / BrowserProfile.lean)")
+    ap.add_argument("--prune", action="store_true",
+                    help="для --chrome: очищать извлечённые карточки (prune_dom)")
+    ap.add_argument("--fixtures-dir", default="bench_fixtures")
+    ap.add_argument("--baseline", help="JSON базовой линии для сравнения")
+    ap.add_argument("--save-baseline", help="сохранить результаты как базовую линию")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    ap.add_argument("--json", action="store_true", help="вывести результаты в JSON")
+    ap.add_argument("--import-time", action="store_true",
+                    help="замерить время импорта пакета вместо прогона парсера")
+    ap.add_argument("--import-budget-ms", type=float, default=50.0,
+                    help="бюджет на `import yandex_reviews_parser` для --import-time")
+    ap.add_argument("--import-runs", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    if args.import_time:
+        results, violations = bench_import(args.import_runs, args.import_budget_ms)
+        if args.json:
+            print(json.dumps({"results": results, "violations": violations}, indent=4))
+        else:
+            print("  ".join(f"{c:>32}" for c in ("module", "import_ms", "loaded")))
+            for row in results:
+                print("  ".join(f"{str(row[c]):>32}" for c in ("module", "import_ms", "loaded")))
+        for line in violations:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if violations else 0
+
+    results = []
+    if args.chrome:
+        from yandex_reviews_parser.profiles import BrowserProfile
+        from yandex_reviews_parser.utils import YandexParser
+
+        server = serve_fixtures(args.sizes, args.fixtures_dir)
+        try:
+            for name in args.profile:
+                profile = BrowserProfile.lean() if name == "lean" else BrowserProfile()
+                driver = YandexParser(profile=profile)._YandexParser__create_driver()
+                try:
+                    for size in args.sizes:
+                        for row in bench_chrome(size, server, driver, prune_dom=args.prune):
+                            row["profile"] = name
+                            results.append(row)
+                finally:
+                    driver.quit()
+        finally:
+            server.shutdown()
+    else:
+        for size in args.sizes:
+            results.extend(bench_fake(size, perf_noise=args.perf_noise))
+
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    if args.json:
+        print(json.dumps({"results": results, "peak_rss_mb": peak_rss_mb}, indent=4))
+    else:
+        print_table(results)
+        print(f"peak RSS процесса: {peak_rss_mb:.1f} MB")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
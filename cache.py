@@ -0,0 +1,199 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class ResultCache:
+    """
+    Кеш результатов парсинга в SQLite.
+
+    У каждой записи есть тип (kind): 'default' / 'reviews' / 'company' —
+    как type_parse, и 'company_id' для get_company_id_from_url. Время жизни
+    задаётся по типу. При переполнении выкидываются давно не читанные записи.
+
+    stale_while_revalidate=True: просроченная запись отдаётся сразу, а
+    обновление запускается в фоновом потоке.
+
+    Чтение на диск не пишет: время последнего чтения копится в памяти и
+    сбрасывается в accessed перед вытеснением в set(), при close() и
+    каждые ACCESS_FLUSH_EVERY чтений.
+    """
+
+    DEFAULT_TTL = {
+        "default": 60 * 60,
+        "reviews": 60 * 60,
+        "company": 24 * 60 * 60,
+        "company_id": 30 * 24 * 60 * 60,
+    }
+    # после стольких несброшенных чтений accessed пишется на диск
+    ACCESS_FLUSH_EVERY = 1000
+
+    def __init__(
+        self,
+        path: str = "yandex_reviews_cache.sqlite",
+        ttl: Optional[dict] = None,
+        max_entries: int = 10000,
+        stale_while_revalidate: bool = False,
+    ):
+        """
+        @param path: файл базы SQLite (':memory:' — только в памяти процесса)
+        @param ttl: {kind: секунды}, дополняет DEFAULT_TTL
+        @param max_entries: сколько записей хранить, лишние вытесняются по LRU
+        @param stale_while_revalidate: отдавать просроченное и обновлять в фоне
+        """
+        self.ttl = {**self.DEFAULT_TTL, **(ttl or {})}
+        self.max_entries = max_entries
+        self.stale_while_revalidate = stale_while_revalidate
+
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        # key -> время последнего чтения, ещё не записанное в accessed
+        self._accessed: dict = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            " key TEXT PRIMARY KEY,"
+            " kind TEXT NOT NULL,"
+            " value TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """Ключ записи из параметров вызова."""
+        return json.dumps(parts, ensure_ascii=False, default=str)
+
+    def get(self, key: str) -> Optional[tuple]:
+        """
+        Достать запись без учёта счётчиков.
+        @return: (value, fresh) или None, если записи нет
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT kind, value, created FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= self.ACCESS_FLUSH_EVERY:
+                self.__flush_accessed()
+                self._conn.commit()
+        kind, value, created = row
+        fresh = now - created < self.ttl.get(kind, self.DEFAULT_TTL["default"])
+        return json.loads(value), fresh
+
+    def __flush_accessed(self) -> None:
+        """Записать накопленные времена чтения (под self._lock, без commit)."""
+        if not self._accessed:
+            return
+        self._conn.executemany(
+            "UPDATE results SET accessed = MAX(accessed, ?) WHERE key = ?",
+            [(accessed, key) for key, accessed in self._accessed.items()],
+        )
+        self._accessed.clear()
+
+    def set(self, key: str, kind: str, value: Any) -> None:
+        """Записать значение и вытеснить лишнее по LRU."""
+        now = time.time()
+        with self._lock:
+            self.__flush_accessed()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results (key, kind, value, created, accessed)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, kind, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM results WHERE key IN ("
+                " SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._accessed.clear()
+            self._conn.execute("DELETE FROM results")
+            self._conn.commit()
+
+    @staticmethod
+    def is_cacheable(value: Any) -> bool:
+        """
+        Пустые результаты, ответы с ошибкой и проходы с исходом не 'ok'
+        (капча, 429 — отзывы могли собраться не все) не кешируем.
+        """
+        if value is None or value == {}:
+            return False
+        return not (isinstance(value, dict) and ("error" in value or "outcome" in value))
+
+    def __refresh(self, key: str, kind: str, compute: Callable[[], Any]) -> None:
+        try:
+            value = compute()
+            if self.is_cacheable(value):
+                self.set(key, kind, value)
+        except Exception as e:
+            print(f"[cache] фоновое обновление {key} не удалось: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def get_or_compute(self, key: str, kind: str, compute: Callable[[], Any]) -> Any:
+        """
+        Отдать значение из кеша или посчитать через compute() и сохранить.
+        """
+        cached = self.get(key)
+        if cached is not None:
+            value, fresh = cached
+            if fresh:
+                self.hits += 1
+                return value
+            if self.stale_while_revalidate:
+                self.stale_hits += 1
+                with self._lock:
+                    start = key not in self._refreshing
+                    self._refreshing.add(key)
+                if start:
+                    threading.Thread(
+                        target=self.__refresh, args=(key, kind, compute), daemon=True
+                    ).start()
+                return value
+
+        self.misses += 1
+        value = compute()
+        if self.is_cacheable(value):
+            self.set(key, kind, value)
+        return value
+
+    def stats(self) -> dict:
+        """Счётчики попаданий и текущий размер кеша."""
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "entries": size,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self.__flush_accessed()
+            self._conn.commit()
+            self._conn.close()
@@ -0,0 +1,175 @@
+import glob
+import json
+import os
+import re
+import time
+from typing import Callable, Optional
+
+from yandex_reviews_parser.helpers import ParserHelper
+
+
+class Checkpoint:
+    """
+    Чекпоинт одного прохода (компания + сортировка): уже собранные отзывы
+    и позиция в списке отзывов на странице.
+
+    Файлы в каталоге CheckpointStore:
+      <id>_<sort>.jsonl — отзывы, по строке на отзыв, дописываются пачками
+      <id>_<sort>.json  — {"business_id", "sort", "collected", "bytes",
+                           "position", "last_key", "updated"}
+
+    Мета пишется после отзывов и атомарно (os.replace), поэтому верно
+    только то, что она описывает: хвост .jsonl после "bytes" — недописанная
+    пачка упавшего процесса, при загрузке он отрезается.
+
+    Без resume сохранённый чекпоинт не трогается, пока проход не уйдёт
+    дальше его позиции: короткий проход (limit, since) не затирает
+    чекпоинт длинного.
+    """
+
+    def __init__(self, store: "CheckpointStore", business_id, sort: Optional[str], resume: bool):
+        self.store = store
+        self.business_id = business_id
+        self.sort = sort
+        name = store.name(business_id, sort)
+        self.reviews_path = os.path.join(store.directory, f"{name}.jsonl")
+        self.meta_path = os.path.join(store.directory, f"{name}.json")
+
+        # отзывы прошлого прохода и позиция, с которой продолжать
+        self.reviews: list = []
+        self.position = 0
+        self._bytes = 0
+        self._pending: list = []
+        self._flushed_at = time.monotonic()
+        # позиция сохранённого чекпоинта, который этот проход ещё не догнал
+        self._replaces: Optional[int] = None
+        if resume:
+            self.__load()
+        else:
+            meta = store.get(business_id, sort)
+            if meta is not None:
+                self._replaces = meta.get("position", 0)
+
+    def __load(self) -> None:
+        if not os.path.exists(self.meta_path):
+            return
+        try:
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(self.reviews_path, "rb") as f:
+                data = f.read(meta["bytes"])
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[checkpoint] {self.meta_path} не читается, начинаем заново: {e}")
+            self.remove()
+            return
+        self.reviews = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+        self.position = meta.get("position", 0)
+        self._bytes = len(data)
+        # отрезаем недописанную пачку, чтобы новые строки шли сразу за верными
+        with open(self.reviews_path, "r+b") as f:
+            f.truncate(self._bytes)
+
+    def add(self, reviews: list, position: int) -> None:
+        """
+        Новые отзывы и позиция на странице после них. На диск пишется
+        раз в store.every отзывов или store.interval секунд.
+        """
+        self._pending.extend(reviews)
+        self.position = position
+        if (
+            len(self._pending) >= self.store.every
+            or time.monotonic() - self._flushed_at >= self.store.interval
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        self._flushed_at = time.monotonic()
+        if not self._pending:
+            return
+        if self._replaces is not None:
+            if self.position <= self._replaces:
+                return
+            # ушли дальше сохранённого — пишем свой чекпоинт с нуля
+            self.remove()
+            self._replaces = None
+        data = "".join(
+            json.dumps(review, ensure_ascii=False) + "\n" for review in self._pending
+        ).encode("utf-8")
+        os.makedirs(self.store.directory, exist_ok=True)
+        with open(self.reviews_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._bytes += len(data)
+        self.reviews.extend(self._pending)
+        meta = {
+            "business_id": self.business_id,
+            "sort": self.sort,
+            "collected": len(self.reviews),
+            "bytes": self._bytes,
+            "position": self.position,
+            "last_key": ParserHelper.review_key(self._pending[-1]),
+            "updated": time.time(),
+        }
+        self._pending = []
+        tmp = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp, self.meta_path)
+
+    def remove(self) -> None:
+        for path in (self.meta_path, self.reviews_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+class CheckpointStore:
+    """
+    Каталог чекпоинтов долгих проходов. Пока компания парсится, собранные
+    отзывы периодически сбрасываются на диск; parse(..., resume=True)
+    продолжает с них, а не с первого отзыва. Чекпоинт сортировки удаляется,
+    когда проход дочитал её до конца списка (Parser.completed_sorts).
+    """
+
+    def __init__(self, directory: str, every: int = 500, interval: float = 30.0):
+        """
+        @param directory: каталог для файлов чекпоинтов (создаётся при первой записи)
+        @param every: сбрасывать на диск каждые every новых отзывов
+        @param interval: или не реже, чем раз в interval секунд
+        """
+        self.directory = directory
+        self.every = every
+        self.interval = interval
+
+    @staticmethod
+    def name(business_id, sort: Optional[str]) -> str:
+        sort_name = re.sub(r"[^\w-]", "_", sort or "default")
+        return f"{business_id}_{sort_name}"
+
+    def opener(self, business_id, resume: bool) -> Callable[[Optional[str]], Checkpoint]:
+        """Фабрика чекпоинтов одной компании по сортировке — для Parser(checkpoint=...)."""
+        return lambda sort: Checkpoint(self, business_id, sort, resume)
+
+    def get(self, business_id, sort: Optional[str]) -> Optional[dict]:
+        """Мета чекпоинта или None, если его нет."""
+        path = os.path.join(self.directory, f"{self.name(business_id, sort)}.json")
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def clear(self, business_id, sorts: Optional[list] = None) -> None:
+        """Удалить чекпоинты компании по сортировкам sorts (None — по всем)."""
+        if sorts is None:
+            pattern = os.path.join(glob.escape(self.directory), f"{business_id}_*.json*")
+            paths = glob.glob(pattern)
+        else:
+            paths = [
+                os.path.join(self.directory, f"{self.name(business_id, sort)}{ext}")
+                for sort in sorts
+                for ext in (".json", ".jsonl")
+            ]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
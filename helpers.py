@@ -1,8 +1,11 @@
 import json
 import re
+from dataclasses import asdict
 from datetime import datetime
 from typing import Union
 
+from yandex_reviews_parser.storage import Review
+
 
 class ParserHelper:
     @staticmethod
@@ -67,3 +70,54 @@ class ParserHelper:
                 continue
 
         return star_count
+
+    @staticmethod
+    def review_key(review: dict) -> str:
+        """
+        Стабильный ключ отзыва для дедупликации
+        :param review: Отзыв в формате asdict(Review)
+        :return: Строка вида "автор|timestamp"
+        """
+        return f"{review.get('name')}|{review.get('date')}"
+
+    @staticmethod
+    def reached_watermark(review: dict, since: Union[float, str, None]) -> bool:
+        """
+        Дошли ли до уже собранных отзывов (для сортировки по новизне)
+        :param review: Отзыв в формате asdict(Review)
+        :param since: Timestamp или review_key последнего собранного отзыва
+        :return: True, если отзыв опубликован не позже отметки
+        """
+        if since is None:
+            return False
+        if isinstance(since, str):
+            if ParserHelper.review_key(review) == since:
+                return True
+            try:
+                since = float(since.rsplit('|', 1)[-1])
+            except ValueError:
+                return False
+        date = review.get('date')
+        return date is not None and date <= since
+
+    @staticmethod
+    def review_from_js(raw: dict) -> dict:
+        """
+        Собрать отзыв из dict, который вернул EXTRACT_REVIEWS_JS
+        :param raw: {"name", "icon_style", "date", "text", "stars", "answer"}
+        :return: Отзыв в формате asdict(Review)
+        """
+        icon_style = raw.get('icon_style')
+        icon_href = icon_style.split('"')[1] if icon_style and '"' in icon_style else None
+        date_content = raw.get('date')
+        date = ParserHelper.form_date(date_content) if date_content else None
+
+        item = Review(
+            name=raw.get('name'),
+            icon_href=icon_href,
+            date=date,
+            text=raw.get('text'),
+            stars=raw.get('stars') or 0,
+            answer=raw.get('answer'),
+        )
+        return asdict(item)
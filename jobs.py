@@ -0,0 +1,503 @@
+"""
+Очередь задач парсинга в SQLite для больших списков компаний.
+
+Каждая компания — строка в таблице jobs со статусом pending / running /
+done / failed, числом попыток и временем, раньше которого её нельзя брать
+(backoff). Воркер берёт задачу в аренду (lease) на lease_timeout секунд и
+продлевает её, пока работает; если процесс упал, аренда истекает и задачу
+подбирает другой воркер. Несколько процессов могут разбирать одну очередь:
+захват идёт в транзакции BEGIN IMMEDIATE.
+
+Запуск из cron:
+    python -m yandex_reviews_parser.jobs add ids.txt --db jobs.sqlite --type-parse reviews
+    python -m yandex_reviews_parser.jobs work --db jobs.sqlite --out results.jsonl --threads 4
+    python -m yandex_reviews_parser.jobs stats --db jobs.sqlite
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
+
+from yandex_reviews_parser.helpers import ParserHelper
+from yandex_reviews_parser.rate import CAPTCHA, THROTTLED, RateController
+
+
+@dataclass
+class Job:
+    id: int
+    business_id: str
+    # именованные аргументы для YandexParser.parse
+    params: dict
+    attempts: int
+    worker: str
+
+
+class JobQueue:
+    """
+    Долговременная очередь задач в одном файле SQLite.
+
+    Для нескольких хостов файл должен лежать на ФС с рабочими блокировками
+    (wal=False: WAL-режим по сетевым ФС не работает).
+    """
+
+    STATES = ("pending", "running", "done", "failed")
+
+    def __init__(
+        self,
+        path: str = "yandex_jobs.sqlite",
+        lease_timeout: float = 600,
+        max_attempts: int = 3,
+        backoff: float = 30,
+        backoff_max: float = 3600,
+        wal: bool = True,
+    ):
+        """
+        @param path: файл базы SQLite
+        @param lease_timeout: на сколько секунд воркер берёт задачу; не продлил — задачу заберут
+        @param max_attempts: после стольких неудач задача уходит в failed
+        @param backoff: пауза перед повтором после первой неудачи, дальше удваивается
+        @param backoff_max: верхняя граница паузы
+        @param wal: журнал WAL (быстрее для процессов на одном хосте)
+        """
+        self.path = path
+        self.lease_timeout = lease_timeout
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.backoff_max = backoff_max
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            path, timeout=30, isolation_level=None, check_same_thread=False
+        )
+        if wal:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " business_id TEXT NOT NULL,"
+            " params TEXT NOT NULL,"
+            " state TEXT NOT NULL,"
+            " attempts INTEGER NOT NULL DEFAULT 0,"
+            " available_at REAL NOT NULL,"
+            " lease_until REAL,"
+            " worker TEXT,"
+            " error TEXT,"
+            " created REAL NOT NULL,"
+            " updated REAL NOT NULL,"
+            " UNIQUE (business_id, params))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (state, available_at)"
+        )
+
+    @staticmethod
+    def __params_key(params: Optional[dict]) -> str:
+        return json.dumps(params or {}, ensure_ascii=False, sort_keys=True)
+
+    def add(self, ids: Iterable, params: Optional[dict] = None, requeue: bool = False) -> int:
+        """
+        Поставить компании в очередь.
+        @param ids: business_id компаний
+        @param params: аргументы parse() для всех этих задач (type_parse, sort, limit, ...)
+        @param requeue: уже существующие задачи с теми же params снова сделать pending
+        @return: сколько задач добавлено или перезапущено
+        """
+        now = time.time()
+        key = self.__params_key(params)
+        rows = [(str(i), key, now, now, now) for i in ids]
+        conflict = (
+            " ON CONFLICT (business_id, params) DO UPDATE SET state = 'pending',"
+            " attempts = 0, available_at = excluded.available_at, lease_until = NULL,"
+            " worker = NULL, error = NULL, updated = excluded.updated"
+            if requeue
+            else " ON CONFLICT (business_id, params) DO NOTHING"
+        )
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO jobs (business_id, params, state, available_at, created, updated)"
+                    " VALUES (?, ?, 'pending', ?, ?, ?)" + conflict,
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self._conn.total_changes - before
+
+    def lease(self, worker: str, limit: int = 1) -> list:
+        """
+        Взять до limit готовых задач: pending, у которых истёк backoff, и
+        running с истёкшей арендой (воркер упал). Попытка считается при захвате,
+        поэтому задача, которая каждый раз роняет воркер, тоже дойдёт до failed.
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE jobs SET state = 'failed', error = 'lease expired', updated = ?"
+                    " WHERE state = 'running' AND lease_until < ? AND attempts >= ?",
+                    (now, now, self.max_attempts),
+                )
+                rows = self._conn.execute(
+                    "SELECT id, business_id, params, attempts FROM jobs"
+                    " WHERE (state = 'pending' AND available_at <= ?)"
+                    " OR (state = 'running' AND lease_until < ?)"
+                    " ORDER BY available_at, id LIMIT ?",
+                    (now, now, limit),
+                ).fetchall()
+                self._conn.executemany(
+                    "UPDATE jobs SET state = 'running', attempts = attempts + 1,"
+                    " lease_until = ?, worker = ?, updated = ? WHERE id = ?",
+                    [(now + self.lease_timeout, worker, now, row[0]) for row in rows],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return [
+            Job(
+                id=job_id,
+                business_id=business_id,
+                params=json.loads(params),
+                attempts=attempts + 1,
+                worker=worker,
+            )
+            for job_id, business_id, params, attempts in rows
+        ]
+
+    def __finish(self, job: Job, sql: str, args: tuple) -> bool:
+        """Обновить задачу, только если она всё ещё у этого воркера."""
+        with self._lock:
+            cursor = self._conn.execute(
+                sql + " WHERE id = ? AND worker = ? AND state = 'running'",
+                args + (job.id, job.worker),
+            )
+            return cursor.rowcount == 1
+
+    def heartbeat(self, job: Job) -> bool:
+        """Продлить аренду. False — задачу уже забрал другой воркер."""
+        now = time.time()
+        return self.__finish(
+            job, "UPDATE jobs SET lease_until = ?, updated = ?", (now + self.lease_timeout, now)
+        )
+
+    def complete(self, job: Job) -> bool:
+        now = time.time()
+        return self.__finish(
+            job,
+            "UPDATE jobs SET state = 'done', lease_until = NULL, error = NULL, updated = ?",
+            (now,),
+        )
+
+    def fail(self, job: Job, error: str) -> bool:
+        """
+        Неудачная попытка: задача вернётся в pending через backoff или,
+        если попытки кончились, уйдёт в failed.
+        """
+        now = time.time()
+        if job.attempts >= self.max_attempts:
+            return self.__finish(
+                job,
+                "UPDATE jobs SET state = 'failed', lease_until = NULL, error = ?, updated = ?",
+                (error, now),
+            )
+        delay = min(self.backoff_max, self.backoff * 2 ** (job.attempts - 1))
+        delay *= random.uniform(0.8, 1.2)
+        return self.__finish(
+            job,
+            "UPDATE jobs SET state = 'pending', lease_until = NULL, available_at = ?,"
+            " error = ?, updated = ?",
+            (now + delay, error, now),
+        )
+
+    def retry_failed(self) -> int:
+        """Вернуть все failed в pending с обнулёнными попытками."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET state = 'pending', attempts = 0, available_at = ?,"
+                " updated = ? WHERE state = 'failed'",
+                (now, now),
+            )
+            return cursor.rowcount
+
+    def stats(self) -> dict:
+        """Число задач по статусам."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) FROM jobs GROUP BY state"
+            ).fetchall()
+        counts = dict.fromkeys(self.STATES, 0)
+        counts.update(rows)
+        return counts
+
+    def failed(self, limit: int = 100) -> list:
+        """Последние failed задачи: [(business_id, attempts, error)]."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT business_id, attempts, error FROM jobs WHERE state = 'failed'"
+                " ORDER BY updated DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class JsonlSink:
+    """Sink: одна строка JSON {"id", "params", "result"} на компанию в файл."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def __call__(self, job: Job, result: dict) -> None:
+        line = json.dumps(
+            {"id": job.business_id, "params": job.params, "result": result},
+            ensure_ascii=False,
+        )
+        # O_APPEND: строки нескольких процессов не перемешиваются
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+class DirectorySink:
+    """Sink: файл <directory>/<business_id>.json на компанию."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def __call__(self, job: Job, result: dict) -> None:
+        ParserHelper.write_json_txt(
+            result, os.path.join(self.directory, f"{job.business_id}.json")
+        )
+
+
+class ReviewsSink:
+    """
+    Sink: отзывы каждой компании дописываются в общий JSONL/CSV (можно .gz)
+    через writers.open_writer, с business_id в каждой строке. Информация
+    о компании не пишется. Результат с несколькими сортировками
+    ({sort: [...]}) пишется целиком, отзывы могут повторяться.
+    Файл пишет один процесс: у каждого воркера свой --reviews-out.
+    """
+
+    def __init__(self, path: str):
+        from yandex_reviews_parser.writers import open_writer
+
+        self.writer = open_writer(path, append=True)
+
+    def __call__(self, job: Job, result: dict) -> None:
+        reviews = result.get("company_reviews") or []
+        if isinstance(reviews, dict):
+            reviews = [review for by_sort in reviews.values() for review in by_sort]
+        self.writer.write_reviews(reviews, business_id=job.business_id)
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class QueueWorker:
+    """
+    Разбирает JobQueue через YandexParser.parse и отдаёт результаты в sink.
+
+    Пустой результат, {"error": ...} или исключение (в том числе в sink)
+    считаются неудачной попыткой. Пока задача в работе, её аренда
+    продлевается из фонового потока.
+    """
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        parser,
+        sink: Callable[[Job, dict], None],
+        worker_id: Optional[str] = None,
+    ):
+        """
+        @param queue: очередь задач
+        @param parser: YandexParser (для threads > 1 — с pool_size >= threads)
+        @param sink: callable(job, result), например JsonlSink / DirectorySink
+        @param worker_id: имя воркера в очереди (по умолчанию host:pid:случайное)
+        """
+        self.queue = queue
+        self.parser = parser
+        self.sink = sink
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self._inflight: dict = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    @staticmethod
+    def is_success(result) -> bool:
+        """Ошибка, капча или 429 посреди сбора — задача уйдёт на повтор."""
+        if not result:
+            return False
+        if not isinstance(result, dict):
+            return True
+        return "error" not in result and result.get("outcome") not in (CAPTCHA, THROTTLED)
+
+    def process(self, job: Job) -> bool:
+        """Выполнить одну задачу. True — done."""
+        with self._lock:
+            self._inflight[job.id] = job
+        try:
+            try:
+                result = self.parser.parse(int(job.business_id), **job.params)
+                if not self.is_success(result):
+                    error = (result or {}).get("error") or (result or {}).get("outcome") or "пустой результат"
+                    self.queue.fail(job, str(error))
+                    return False
+                self.sink(job, result)
+            except Exception as e:
+                self.queue.fail(job, f"{type(e).__name__}: {e}")
+                return False
+            return self.queue.complete(job)
+        finally:
+            with self._lock:
+                self._inflight.pop(job.id, None)
+
+    def __heartbeat(self) -> None:
+        interval = max(1.0, self.queue.lease_timeout / 3)
+        while not self._stop.wait(interval):
+            with self._lock:
+                jobs = list(self._inflight.values())
+            for job in jobs:
+                self.queue.heartbeat(job)
+
+    def __loop(self, max_jobs: Optional[int], idle_exit: bool, poll: float, counter: list) -> None:
+        while not self._stop.is_set():
+            with self._lock:
+                if max_jobs is not None and counter[0] >= max_jobs:
+                    return
+                counter[0] += 1
+            jobs = self.queue.lease(self.worker_id)
+            if not jobs:
+                with self._lock:
+                    counter[0] -= 1
+                if idle_exit:
+                    return
+                self._stop.wait(poll)
+                continue
+            self.process(jobs[0])
+
+    def run(
+        self,
+        threads: int = 1,
+        max_jobs: Optional[int] = None,
+        idle_exit: bool = True,
+        poll: float = 5,
+    ) -> int:
+        """
+        Разбирать очередь.
+        @param threads: сколько задач одновременно в этом процессе
+        @param max_jobs: остановиться после стольких задач (None — без ограничения)
+        @param idle_exit: выйти, когда готовых задач нет (иначе ждать новых)
+        @param poll: пауза между проверками пустой очереди
+        @return: сколько задач взято в работу
+        """
+        counter = [0]
+        self._stop.clear()
+        heartbeat = threading.Thread(target=self.__heartbeat, daemon=True)
+        heartbeat.start()
+        workers = [
+            threading.Thread(target=self.__loop, args=(max_jobs, idle_exit, poll, counter))
+            for _ in range(threads)
+        ]
+        try:
+            for t in workers:
+                t.start()
+            for t in workers:
+                t.join()
+        finally:
+            self._stop.set()
+        return counter[0]
+
+    def stop(self) -> None:
+        """Не брать новые задачи; текущие доработают."""
+        self._stop.set()
+
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("command", choices=["add", "work", "stats", "retry"])
+    ap.add_argument("ids_file", nargs="?", help="для add: файл с business_id, по одному в строке")
+    ap.add_argument("--db", default="yandex_jobs.sqlite")
+    ap.add_argument("--type-parse", default="default", choices=["default", "company", "reviews"])
+    ap.add_argument("--sort", default="newest")
+    ap.add_argument("--limit", type=int, default=-1)
+    ap.add_argument("--requeue", action="store_true", help="для add: перезапустить уже выполненные")
+    ap.add_argument("--out", help="для work: JSONL-файл результатов")
+    ap.add_argument("--out-dir", help="для work: каталог, файл на компанию")
+    ap.add_argument(
+        "--reviews-out", help="для work: только отзывы, общий .jsonl/.csv (можно .gz)"
+    )
+    ap.add_argument("--threads", type=int, default=1)
+    ap.add_argument("--max-jobs", type=int)
+    ap.add_argument("--wait", action="store_true", help="для work: ждать новых задач, не выходить")
+    ap.add_argument("--lease-timeout", type=float, default=600)
+    ap.add_argument("--max-attempts", type=int, default=3)
+    ap.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="для work: RateController — от 1 до --threads браузеров по реакции Яндекса",
+    )
+    args = ap.parse_args(argv)
+
+    queue = JobQueue(args.db, lease_timeout=args.lease_timeout, max_attempts=args.max_attempts)
+    try:
+        if args.command == "add":
+            if not args.ids_file:
+                ap.error("add: нужен файл с business_id")
+            with open(args.ids_file, encoding="utf-8") as f:
+                ids = [line.strip() for line in f if line.strip()]
+            params = {"type_parse": args.type_parse, "sort": args.sort, "limit": args.limit}
+            print(f"добавлено: {queue.add(ids, params, requeue=args.requeue)}")
+        elif args.command == "work":
+            if not (args.out or args.out_dir or args.reviews_out):
+                ap.error("work: нужен --out, --out-dir или --reviews-out")
+            from yandex_reviews_parser.utils import YandexParser
+
+            if args.reviews_out:
+                sink = ReviewsSink(args.reviews_out)
+            elif args.out:
+                sink = JsonlSink(args.out)
+            else:
+                sink = DirectorySink(args.out_dir)
+            rate = RateController(max_concurrency=args.threads) if args.adaptive else None
+            with YandexParser(pool_size=args.threads, rate=rate) as parser:
+                worker = QueueWorker(queue, parser, sink)
+                taken = worker.run(
+                    threads=args.threads, max_jobs=args.max_jobs, idle_exit=not args.wait
+                )
+            if isinstance(sink, ReviewsSink):
+                sink.close()
+            print(f"обработано: {taken}")
+            if rate:
+                print(json.dumps(rate.stats(), ensure_ascii=False))
+        elif args.command == "retry":
+            print(f"перезапущено: {queue.retry_failed()}")
+        print(json.dumps(queue.stats(), ensure_ascii=False))
+        for business_id, attempts, error in queue.failed(limit=10):
+            print(f"failed {business_id} (попыток {attempts}): {error}", file=sys.stderr)
+    finally:
+        queue.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+import functools
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+class Metrics:
+    """
+    Метрики одного прохода парсера: время этапов (span), счётчики и gauge.
+
+    Всё хранится в обычных dict и считается через time.perf_counter,
+    поэтому инструментирование можно не выключать в проде.
+    """
+
+    def __init__(self):
+        # имя этапа -> [количество, суммарное время в секундах]
+        self.spans: dict = {}
+        self.counters: Counter = Counter()
+        self.gauges: dict = {}
+
+    @contextmanager
+    def span(self, name: str):
+        """with metrics.span("scroll"): ... — время этапа суммируется по имени."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            entry = self.spans.get(name)
+            if entry is None:
+                self.spans[name] = [1, elapsed]
+            else:
+                entry[0] += 1
+                entry[1] += elapsed
+
+    def incr(self, name: str, value: int = 1) -> None:
+        self.counters[name] += value
+
+    def gauge(self, name: str, value) -> None:
+        self.gauges[name] = value
+
+    @property
+    def webdriver_calls(self) -> int:
+        """Сколько всего было вызовов WebDriver/CDP."""
+        return sum(v for k, v in self.counters.items() if k.startswith("webdriver."))
+
+    def snapshot(self) -> dict:
+        """Метрики в виде простого dict (для JSON, логов и результата parse)."""
+        return {
+            "spans": {
+                name: {"count": count, "seconds": round(total, 6)}
+                for name, (count, total) in self.spans.items()
+            },
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+            "webdriver_calls": self.webdriver_calls,
+        }
+
+
+class InstrumentedDriver:
+    """
+    Прокси над Selenium-драйвером: каждый вызов метода считается в
+    metrics.counters["webdriver.<метод>"]. Найденные элементы тоже
+    оборачиваются, так что вызовы внутри отзыва попадают в тот же счётчик.
+    """
+
+    def __init__(self, driver, metrics: Metrics):
+        self.wrapped = driver
+        self.metrics = metrics
+
+    def __wrap(self, value):
+        if isinstance(value, list):
+            return [self.__wrap(v) for v in value]
+        if hasattr(value, "find_element") and not isinstance(value, InstrumentedDriver):
+            return InstrumentedDriver(value, self.metrics)
+        return value
+
+    @staticmethod
+    def __unwrap(value):
+        return value.wrapped if isinstance(value, InstrumentedDriver) else value
+
+    def __getattr__(self, name):
+        attr = getattr(self.wrapped, name)
+        if not callable(attr):
+            if name == "text":
+                self.metrics.counters["webdriver.text"] += 1
+            return attr
+
+        @functools.wraps(attr)
+        def counted(*args, **kwargs):
+            self.metrics.counters[f"webdriver.{name}"] += 1
+            args = tuple(self.__unwrap(a) for a in args)
+            return self.__wrap(attr(*args, **kwargs))
+
+        return counted
+
+
+def unwrap_driver(driver):
+    """Исходный драйвер из-под InstrumentedDriver (для пула и quit())."""
+    while isinstance(driver, InstrumentedDriver):
+        driver = driver.wrapped
+    return driver
+
+
+def logging_sink(logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> Callable:
+    """Sink, пишущий метрики одной строкой JSON в лог."""
+    logger = logger or logging.getLogger("yandex_reviews_parser.metrics")
+
+    def sink(labels: dict, snapshot: dict) -> None:
+        logger.log(level, json.dumps({**labels, **snapshot}, ensure_ascii=False))
+
+    return sink
+
+
+class PrometheusSink:
+    """
+    Sink, накапливающий метрики всех проходов и отдающий их в текстовом
+    формате Prometheus (render() или HTTP-эндпоинт serve()).
+    """
+
+    PREFIX = "yandex_parser"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.span_seconds: Counter = Counter()
+        self.span_count: Counter = Counter()
+        self.counters: Counter = Counter()
+        self.gauges: dict = {}
+        self.runs = 0
+
+    def __call__(self, labels: dict, snapshot: dict) -> None:
+        with self._lock:
+            self.runs += 1
+            for name, span in snapshot["spans"].items():
+                self.span_seconds[name] += span["seconds"]
+                self.span_count[name] += span["count"]
+            self.counters.update(snapshot["counters"])
+            self.gauges.update(snapshot["gauges"])
+
+    @staticmethod
+    def __metric_name(name: str) -> str:
+        return "".join(c if c.isalnum() else "_" for c in name)
+
+    def render(self) -> str:
+        p = self.PREFIX
+        lines = [f"# TYPE {p}_runs_total counter", f"{p}_runs_total {self.runs}"]
+        with self._lock:
+            lines.append(f"# TYPE {p}_span_seconds_total counter")
+            for name, value in sorted(self.span_seconds.items()):
+                lines.append(f'{p}_span_seconds_total{{span="{name}"}} {value:.6f}')
+            lines.append(f"# TYPE {p}_span_count_total counter")
+            for name, value in sorted(self.span_count.items()):
+                lines.append(f'{p}_span_count_total{{span="{name}"}} {value}')
+            for name, value in sorted(self.counters.items()):
+                metric = f"{p}_{self.__metric_name(name)}_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+            for name, value in sorted(self.gauges.items()):
+                if value is None:
+                    continue
+                metric = f"{p}_{self.__metric_name(name)}"
+                lines.append(f"# TYPE {metric} gauge")
+                lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9108, host: str = "127.0.0.1"):
+        """Поднять /metrics в фоновом потоке (ThreadingHTTPServer)."""
+        import http.server
+
+        sink = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = sink.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
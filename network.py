@@ -0,0 +1,134 @@
+import base64
+import json
+import re
+from collections import OrderedDict
+from typing import Optional
+
+
+class NetworkEvents:
+    """
+    Инкрементальный разбор сетевых событий CDP из performance-логов Chrome.
+
+    driver.get_log("performance") отдаёт только новые записи с прошлого
+    вызова, поэтому каждое событие обрабатывается ровно один раз. Сырые
+    строки сначала фильтруются подстрокой (url_filter или requestId уже
+    отслеживаемого запроса) и только совпавшие декодируются через json.loads —
+    шумные Page/Network события страницы не разбираются вовсе.
+    """
+
+    REQUEST_ID_RE = re.compile(r'"requestId":\s*"([^"]+)"')
+    # Сколько последних отслеживаемых запросов держим в памяти
+    MAX_TRACKED = 100
+
+    def __init__(self, driver, url_filter: str = "fetchReviews"):
+        """
+        @param driver: Selenium-драйвер с включёнными performance-логами
+        @param url_filter: подстрока URL интересующих запросов
+        """
+        self.driver = driver
+        self.url_filter = url_filter
+        # requestId -> {"url", "headers", "status", "finished", "sent"}
+        self.requests: OrderedDict = OrderedDict()
+        # Сколько запросов (requestWillBeSent) уже видели; "sent" запроса —
+        # его номер в этом счётчике, None — начало запроса в логи не попало
+        self.sent = 0
+
+    def __track(self, request_id: str) -> dict:
+        entry = self.requests.get(request_id)
+        if entry is None:
+            entry = {
+                "url": None, "headers": {}, "status": None, "finished": False, "sent": None,
+            }
+            self.requests[request_id] = entry
+            while len(self.requests) > self.MAX_TRACKED:
+                self.requests.popitem(last=False)
+        return entry
+
+    def __is_relevant(self, message: str) -> bool:
+        """Дешёвый отбор сырой строки до json.loads."""
+        if self.url_filter in message:
+            return True
+        if "Network.loadingFinished" in message and self.requests:
+            match = self.REQUEST_ID_RE.search(message)
+            return bool(match) and match.group(1) in self.requests
+        return False
+
+    def poll(self) -> list:
+        """
+        Забрать новые события и вернуть список ответов (dict из self.requests
+        плюс request_id), пришедших с прошлого вызова.
+        """
+        try:
+            raw = self.driver.get_log("performance")
+        except Exception:
+            return []
+
+        responses = []
+        for entry in raw:
+            message = entry.get("message", "")
+            if not self.__is_relevant(message):
+                continue
+            try:
+                msg = json.loads(message)["message"]
+            except (ValueError, KeyError):
+                continue
+
+            method = msg.get("method")
+            params = msg.get("params", {})
+            request_id = params.get("requestId")
+            if not request_id:
+                continue
+
+            if method == "Network.requestWillBeSent":
+                request = params.get("request", {})
+                if self.url_filter not in request.get("url", ""):
+                    continue
+                tracked = self.__track(request_id)
+                tracked["url"] = request.get("url")
+                tracked["headers"] = request.get("headers", {})
+                self.sent += 1
+                tracked["sent"] = self.sent
+            elif method == "Network.responseReceived":
+                response = params.get("response", {})
+                if self.url_filter not in response.get("url", ""):
+                    continue
+                tracked = self.__track(request_id)
+                tracked["url"] = response.get("url")
+                tracked["status"] = response.get("status")
+                responses.append(dict(tracked, request_id=request_id))
+            elif method == "Network.loadingFinished":
+                if request_id in self.requests:
+                    self.requests[request_id]["finished"] = True
+
+        return responses
+
+    def is_finished(self, request_id: str) -> bool:
+        """Пришёл ли Network.loadingFinished — тело ответа загружено целиком."""
+        entry = self.requests.get(request_id)
+        return bool(entry and entry["finished"])
+
+    def get_response_body(self, request_id: str) -> Optional[str]:
+        """
+        Тело ответа через Network.getResponseBody. Chrome держит тела
+        ограниченное время, поэтому забирать стоит сразу после loadingFinished.
+        """
+        try:
+            result = self.driver.execute_cdp_cmd(
+                "Network.getResponseBody", {"requestId": request_id}
+            )
+        except Exception:
+            return None
+        body = result.get("body")
+        if body is not None and result.get("base64Encoded"):
+            body = base64.b64decode(body).decode("utf-8", errors="replace")
+        return body
+
+    def get_response_json(self, request_id: str) -> Optional[dict]:
+        """Тело ответа, разобранное как JSON, либо None."""
+        body = self.get_response_body(request_id)
+        if body is None:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
@@ -1,33 +1,105 @@
-import json
 import re
 import time
+from collections import Counter
 from dataclasses import asdict
-from typing import Optional
+from typing import TYPE_CHECKING, Callable, Iterator, Optional
 
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, JavascriptException
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException,
+    JavascriptException,
+    WebDriverException,
+)
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from yandex_reviews_parser.helpers import ParserHelper
+from yandex_reviews_parser.metrics import Metrics
+from yandex_reviews_parser.rate import classify_outcome
+from yandex_reviews_parser.network import NetworkEvents
+from yandex_reviews_parser.scripts import (
+    ANSWERS_RENDERED_JS,
+    COUNT_REVIEWS_JS,
+    EXPAND_ANSWERS_JS,
+    EXTRACT_REVIEWS_JS,
+    FIRST_REVIEW_JS,
+    PAGE_READY_JS,
+    PAGE_STATE_JS,
+    PRUNE_REVIEWS_JS,
+    REVIEWS_TOTAL_JS,
+    SCROLL_LAST_REVIEW_JS,
+    SORT_LABELS,
+)
 from yandex_reviews_parser.storage import Review, Info
+from yandex_reviews_parser.timings import AdaptivePoll, TimingProfile
+
+if TYPE_CHECKING:
+    from yandex_reviews_parser.checkpoint import Checkpoint
 
 
 class Parser:
     ORG_NAME_XPATH = ".//h1[@class='orgpage-header-view__header']"
     REVIEWS_CLASS = "business-reviews-card-view__review"
+    # Сколько отзывов сериализуем за один execute_script
+    EXTRACT_CHUNK = 200
+    # При продолжении с чекпоинта начинаем чуть раньше сохранённой позиции:
+    # с sort='newest' новые отзывы сдвигают список вниз, повторы отсеет review_key
+    RESUME_OVERLAP = 50
 
-    def __init__(self, driver, wait_timeout: int = 10):
+    def __init__(
+        self,
+        driver,
+        wait_timeout: int = 10,
+        timings: Optional[TimingProfile] = None,
+        metrics: Optional[Metrics] = None,
+        prune_dom: bool = False,
+        with_answers: bool = True,
+        checkpoint: Optional[Callable[[Optional[str]], "Checkpoint"]] = None,
+    ):
         self.driver = driver
         self.wait = WebDriverWait(driver, wait_timeout)
+        self.timings = timings or TimingProfile()
+        # время этапов, число скроллов и извлечённых отзывов
+        self.metrics = metrics or Metrics()
+        self._scroll_poll = AdaptivePoll(self.timings)
+        # Если JS-извлечение упало один раз, дальше работаем поэлементно
+        self._js_extract = True
+        # Очищать уже извлечённые карточки отзывов, чтобы DOM не рос
+        self.prune_dom = prune_dom
+        # Раскрывать и собирать ответы владельца (False — answer всегда None)
+        self.with_answers = with_answers
+        # sort -> Checkpoint (CheckpointStore.opener): сохранять собранное
+        # по ходу DOM-скролла и продолжать с сохранённого
+        self.checkpoint = checkpoint
+        # Сортировки, дочитанные в этом проходе до конца списка: их чекпоинты
+        # больше не нужны (limit и since обрывают сбор раньше и сюда не попадают)
+        self.completed_sorts: list = []
 
         # Кеш последнего fetchReviews
         # {
         #   "business_id": "4987...",
         #   "url": ".../fetchReviews?...",
         #   "request_id": "...",
+        #   "headers": {...},  # заголовки запроса, если попали в логи
         # }
         self._last_fetch: Optional[dict] = None
+        # Номер последнего запроса fetchReviews до скролла (NetworkEvents.sent)
+        # и когда ответил первый запрос, отправленный после него (time.monotonic)
+        self._scroll_mark: Optional[int] = None
+        self._fetch_answered_at: Optional[float] = None
+        # Статусы всех ответов fetchReviews за проход: 429/403 — нас режут
+        self.fetch_statuses: Counter = Counter()
+        # Чем закончился wait_page_ready (None — не вызывался)
+        self._page_ready: Optional[bool] = None
+        # Исход прохода, см. classify_outcome
+        self.outcome: Optional[str] = None
+        # Общее число отзывов по разметке страницы, читается один раз
+        self._reviews_total: Optional[int] = None
+        self._reviews_total_read = False
+        # Инкрементальный разбор performance-логов, только fetchReviews
+        self.network = NetworkEvents(driver, url_filter="fetchReviews")
 
         # Включаем Network в CDP 
         try:
@@ -35,24 +107,40 @@ class Parser:
         except Exception:
             pass
 
-    def _perf_messages(self) -> list:
-        """Снимаем и парсим performance-логи из Chrome DevTools."""
-        logs = []
+    def __wait_for(self, condition, timeout: float, poll: Optional[float] = None):
+        """
+        Ждём, пока condition(driver) вернёт истинное значение, и отдаём его.
+        По таймауту возвращаем None — решение, что делать дальше, за вызывающим.
+        """
+        wait = WebDriverWait(
+            self.driver,
+            timeout,
+            poll_frequency=poll or self.timings.poll,
+            ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+        )
         try:
-            raw = self.driver.get_log("performance")
-        except Exception:
-            return []
-        for e in raw:
-            try:
-                msg = json.loads(e["message"])["message"]
-                logs.append(msg)
-            except Exception:
-                continue
-        return logs
+            return wait.until(condition)
+        except TimeoutException:
+            return None
+
+    def __review_count(self) -> int:
+        return self.driver.execute_script(COUNT_REVIEWS_JS, self.REVIEWS_CLASS)
+
+    def wait_page_ready(self) -> bool:
+        """
+        Ждём загрузки страницы компании: заголовок или первые отзывы.
+        """
+        with self.metrics.span("page_ready"):
+            ready = self.__wait_for(
+                lambda d: d.execute_script(PAGE_READY_JS, self.REVIEWS_CLASS),
+                self.timings.page_timeout,
+            )
+        self._page_ready = bool(ready)
+        return self._page_ready
 
     def _collect_fetch_from_logs(
         self,
-        timeout: int = 10,
+        timeout: Optional[float] = None,
         business_id: Optional[str] = None,
     ) -> bool:
         """
@@ -61,47 +149,74 @@ class Parser:
 
         Если business_id передан, фильтруем по нему.
         Если не передан, берём первый попавшийся fetchReviews (и сам вытащим id).
+        timeout — сколько ждать ответа (по умолчанию timings.network_timeout).
         """
-        end_time = time.time() + timeout
-
-        while time.time() < end_time:
-            msgs = self._perf_messages()
-
-            for m in msgs:
-                if m.get("method") != "Network.responseReceived":
-                    continue
+        if timeout is None:
+            timeout = self.timings.network_timeout
+        with self.metrics.span("network_wait"):
+            found = self.__wait_for(
+                lambda d: self.__scan_fetch_logs(business_id), timeout
+            )
+        return bool(found)
 
-                params = m.get("params", {})
-                response_meta = params.get("response", {})
-                url = response_meta.get("url", "")
-                status = response_meta.get("status")
-                req_id = params.get("requestId")
+    def __scan_fetch_logs(self, business_id: Optional[str] = None) -> bool:
+        """
+        Один проход по новым сетевым событиям. True, если fetchReviews уже пойман.
+        """
+        for resp in self.network.poll():
+            self.fetch_statuses[resp["status"]] += 1
+            # конец списка отмечает только запрос, отправленный после скролла:
+            # поздние ответы прошлых пачек и клика сортировки не в счёт
+            sent = resp["sent"]
+            if (
+                self._scroll_mark is not None
+                and sent is not None
+                and sent > self._scroll_mark
+                and self._fetch_answered_at is None
+            ):
+                self._fetch_answered_at = time.monotonic()
+            if resp["status"] != 200:
+                continue
 
-                if "fetchReviews" not in url:
-                    continue
-                if status != 200:
-                    continue
+            bid_match = re.search(r"businessId=(\d+)", resp["url"])
+            found_bid = bid_match.group(1) if bid_match else None
 
-                bid_match = re.search(r"businessId=(\d+)", url)
-                found_bid = bid_match.group(1) if bid_match else None
+            if business_id and found_bid and found_bid != business_id:
+                continue
+            if business_id and not found_bid:
+                continue
 
-                if business_id and found_bid and found_bid != business_id:
-                    continue
-                if business_id and not found_bid:
-                    continue
+            self._last_fetch = {
+                "business_id": found_bid,
+                "url": resp["url"],
+                "request_id": resp["request_id"],
+                "headers": resp["headers"],
+            }
 
-                self._last_fetch = {
-                    "business_id": found_bid,
-                    "url": url,
-                    "request_id": req_id,
-                }
+        return self._last_fetch is not None
 
-            if self._last_fetch:
-                return True
+    def get_fetch_json(self, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        JSON ответа последнего пойманного fetchReviews (Network.getResponseBody).
+        Тело забирается только после Network.loadingFinished: до него Chrome
+        отдаёт пустое или обрезанное тело. timeout — сколько ждать
+        loadingFinished (по умолчанию timings.network_timeout), не дождались — None.
+        """
+        if not self._last_fetch:
+            return None
+        request_id = self._last_fetch["request_id"]
+        if timeout is None:
+            timeout = self.timings.network_timeout
 
-            time.sleep(0.3)
+        def finished(d) -> bool:
+            self.__scan_fetch_logs()
+            return self.network.is_finished(request_id)
 
-        return False
+        if not self.network.is_finished(request_id):
+            with self.metrics.span("network_wait"):
+                if not self.__wait_for(finished, timeout):
+                    return None
+        return self.network.get_response_json(request_id)
 
     def get_business_id_from_network(self, timeout: int = 10) -> Optional[str]:
         """
@@ -116,33 +231,69 @@ class Parser:
 
         return None
 
-    def __scroll_to_bottom(self, limit: int = -1) -> None:
+    def __reviews_total(self) -> Optional[int]:
         """
-        Скроллим список отзывов до конца или пока не соберём limit штук.
-        limit = -1  -> скроллим до конца (старое поведение).
+        Сколько всего отзывов у компании по разметке страницы (None — не нашли).
         """
-        prev_count = 0
-
-        while True:
-            elements = self.driver.find_elements(By.CLASS_NAME, self.REVIEWS_CLASS)
-            count = len(elements)
-
-            if limit > 0 and count >= limit:
-                break
-
-            if count == prev_count:
-                break
+        if not self._reviews_total_read:
+            self._reviews_total_read = True
+            try:
+                total = self.driver.execute_script(REVIEWS_TOTAL_JS)
+            except WebDriverException:
+                total = None
+            self._reviews_total = total if isinstance(total, int) and total > 0 else None
+        return self._reviews_total
 
-            prev_count = count
+    def __scroll_state(self, loaded: int) -> Optional[str]:
+        """
+        Условие ожидания после скролла: 'more' — подгрузились новые отзывы,
+        'end' — fetchReviews, отправленный после скролла, уже ответил,
+        а за render_grace новых отзывов нет.
+        """
+        if self.__review_count() > loaded:
+            return "more"
+        self.__scan_fetch_logs()
+        answered = self._fetch_answered_at
+        if answered is not None and time.monotonic() - answered >= self.timings.render_grace:
+            return "end"
+        return None
 
-            if not elements:
-                break
+    def __scroll_step(self, loaded: int) -> bool:
+        """
+        Скроллим к последнему отзыву, чтобы страница подгрузила следующую пачку.
+        loaded — сколько отзывов уже обработано.
+        Возвращает True, если на странице есть отзывы дальше loaded.
+
+        Скролл и подсчёт — один execute_script без передачи элементов.
+        Конец списка определяем по общему числу отзывов на странице или по
+        ответу fetchReviews без новых отзывов; scroll_timeout — крайний случай.
+        Перед скроллом сетевые логи вычитываются: всё, что в них уже есть,
+        отправлено до скролла и концом списка не считается.
+        """
+        self.__scan_fetch_logs()
+        self._scroll_mark = self.network.sent
+        self._fetch_answered_at = None
+        count = self.driver.execute_script(
+            SCROLL_LAST_REVIEW_JS, self.REVIEWS_CLASS, loaded
+        )
+        if not count:
+            return False
+        if count > loaded:
+            return True
+        total = self.__reviews_total()
+        if total is not None and count >= total:
+            return False
 
-            last_elem = elements[-1]
-            self.driver.execute_script(
-                "arguments[0].scrollIntoView({block: 'end'});", last_elem
-            )
-            time.sleep(1)
+        # ждём, пока подгрузится следующая пачка или станет ясно, что её не будет
+        started = time.monotonic()
+        state = self.__wait_for(
+            lambda d: self.__scroll_state(loaded),
+            self.timings.scroll_timeout,
+            poll=self._scroll_poll.interval,
+        )
+        if state == "more":
+            self._scroll_poll.observe(time.monotonic() - started)
+        return state == "more"
 
     def __get_data_item(self, elem):
         """
@@ -181,16 +332,22 @@ class Parser:
         )
         stars = ParserHelper.get_count_star(stars_elems) if stars_elems else 0
 
-        try:
-            answer_btn = elem.find_element(
-                By.CLASS_NAME, "business-review-view__comment-expand"
-            )
-            self.driver.execute_script("arguments[0].click()", answer_btn)
-            answer = elem.find_element(
-                By.CLASS_NAME, "business-review-comment-content__bubble"
-            ).text
-        except NoSuchElementException:
-            answer = None
+        answer = None
+        # find_elements вместо find_element: у отзыва без ответа нет
+        # лишнего круга с NoSuchElementException
+        answer_btns = (
+            elem.find_elements(By.CLASS_NAME, "business-review-view__comment-expand")
+            if self.with_answers
+            else []
+        )
+        if answer_btns:
+            self.driver.execute_script("arguments[0].click()", answer_btns[0])
+            try:
+                answer = elem.find_element(
+                    By.CLASS_NAME, "business-review-comment-content__bubble"
+                ).text
+            except NoSuchElementException:
+                answer = None
 
         item = Review(
             name=name,
@@ -202,6 +359,104 @@ class Parser:
         )
         return asdict(item)
 
+    def __expand_answers(self, start: int, stop: int) -> None:
+        """
+        Раскрыть ответы владельца у отзывов [start, stop) одним скриптом и,
+        если отрисовались не сразу, один раз дождаться их всех.
+        """
+        pending = self.driver.execute_script(
+            EXPAND_ANSWERS_JS, self.REVIEWS_CLASS, start, stop
+        )
+        if pending:
+            self.__wait_for(
+                lambda d: d.execute_script(
+                    ANSWERS_RENDERED_JS, self.REVIEWS_CLASS, start, stop
+                ),
+                self.timings.rerender_timeout,
+            )
+
+    def __get_data_items(self, start: int = 0, stop: int = -1) -> list:
+        """
+        Спарсить отзывы [start, stop) пачками по EXTRACT_CHUNK за один
+        execute_script на пачку (плюс один на раскрытие ответов).
+        stop = -1 -> до последнего загруженного.
+
+        Если JS-путь недоступен, откатываемся на поэлементный __get_data_item.
+        """
+        reviews: list = []
+        pos = start
+
+        while self._js_extract and (stop < 0 or pos < stop):
+            count = self.EXTRACT_CHUNK
+            if stop >= 0:
+                count = min(count, stop - pos)
+            try:
+                if self.with_answers:
+                    self.__expand_answers(pos, pos + count)
+                chunk = self.driver.execute_script(
+                    EXTRACT_REVIEWS_JS, self.REVIEWS_CLASS, pos, count, self.with_answers
+                )
+                if not isinstance(chunk, list):
+                    raise JavascriptException("unexpected result of EXTRACT_REVIEWS_JS")
+                batch = [ParserHelper.review_from_js(raw) for raw in chunk]
+            except (JavascriptException, ValueError, TypeError) as e:
+                # только ошибка самого скрипта или кривой результат; таймаут
+                # или упавший Chrome поэлементный режим не спасёт
+                print(f"[extract] JS-извлечение недоступно, поэлементный режим: {e}")
+                self._js_extract = False
+                break
+
+            reviews.extend(batch)
+            pos += len(batch)
+            if len(batch) < count:
+                return reviews
+
+        if self._js_extract:
+            return reviews
+
+        elements = self.driver.find_elements(By.CLASS_NAME, self.REVIEWS_CLASS)
+        elements = elements[pos:stop] if stop >= 0 else elements[pos:]
+        for elem in elements:
+            reviews.append(self.__get_data_item(elem))
+        return reviews
+
+    def __prune(self, start: int, stop: int) -> None:
+        """
+        Заменить уже извлечённые отзывы [start, stop) пустыми заглушками
+        (PRUNE_REVIEWS_JS) — память вкладки не растёт с числом отзывов.
+        """
+        try:
+            pruned = self.driver.execute_script(
+                PRUNE_REVIEWS_JS, self.REVIEWS_CLASS, start, stop
+            )
+        except WebDriverException as e:
+            print(f"[prune] не удалось очистить отзывы, продолжаем без очистки: {e}")
+            self.prune_dom = False
+            return
+        self.metrics.incr("reviews_pruned", pruned or 0)
+
+    def __fast_forward(self, target: int) -> int:
+        """
+        Доскроллить до target отзывов без извлечения — продолжение с чекпоинта.
+        С prune_dom пропущенные карточки сразу очищаются.
+        Возвращает позицию, с которой извлекать (меньше target, если список кончился).
+        """
+        loaded = self.__review_count()
+        with self.metrics.span("resume_scroll"):
+            while loaded < target:
+                with self.metrics.span("scroll"):
+                    more = self.__scroll_step(loaded)
+                self.metrics.incr("scroll_iterations")
+                count = self.__review_count()
+                if self.prune_dom:
+                    self.__prune(loaded, min(count, target))
+                if not more or count <= loaded:
+                    break
+                loaded = count
+        position = min(loaded, target)
+        self.metrics.incr("reviews_skipped", position)
+        return position
+
     def __get_data_campaign(self) -> dict:
         """
         Получаем данные по компании.
@@ -262,31 +517,40 @@ class Parser:
         if not sort:
             return
 
-        label_map = {
-            "default": "По умолчанию",
-            "newest": "По новизне",
-            "negative": "Сначала отрицательные",
-            "positive": "Сначала положительные",
-        }
-        label = label_map.get(sort)
+        label = SORT_LABELS.get(sort)
         if not label:
             print(f"[sort={sort}] неизвестный тип сортировки")
             return
 
-        try:
+        def find_toggle(driver):
             # <div class="rating-ranking-view" role="button" ...>
-            toggle = None
-            for _ in range(20):  # до ~10 секунд
-                candidates = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "div.rating-ranking-view[role='button']",
-                )
-                visible = [c for c in candidates if c.is_displayed()]
-                if visible:
-                    toggle = visible[0]
-                    break
-                time.sleep(0.5)
+            candidates = driver.find_elements(
+                By.CSS_SELECTOR,
+                "div.rating-ranking-view[role='button']",
+            )
+            visible = [c for c in candidates if c.is_displayed()]
+            return visible[0] if visible else False
+
+        last_visible_count = 0
+
+        def find_target(driver):
+            nonlocal last_visible_count
+            lines = driver.find_elements(
+                By.CSS_SELECTOR,
+                "div.rating-ranking-view__popup-line",
+            )
+            visible = [ln for ln in lines if ln.is_displayed()]
+            last_visible_count = len(visible)
+
+            for ln in visible:
+                aria = (ln.get_attribute("aria-label") or "").strip()
+                text = (ln.text or "").strip()
+                if aria == label or text == label:
+                    return ln
+            return False
 
+        try:
+            toggle = self.__wait_for(find_toggle, self.timings.sort_timeout)
             if not toggle:
                 print(f"[sort={sort}] не нашёл кнопку сортировки")
                 return
@@ -294,29 +558,9 @@ class Parser:
                 "arguments[0].scrollIntoView({block: 'center'});", toggle
             )
             self.driver.execute_script("arguments[0].click();", toggle)
-            time.sleep(0.7)  # даём попапу появиться
-
-            target = None
-            last_visible_count = 0
-
-            for _ in range(20):  # до ~10 секунд
-                lines = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "div.rating-ranking-view__popup-line",
-                )
-                visible = [ln for ln in lines if ln.is_displayed()]
-                last_visible_count = len(visible)
-
-                for ln in visible:
-                    aria = (ln.get_attribute("aria-label") or "").strip()
-                    text = (ln.text or "").strip()
-                    if aria == label or text == label:
-                        target = ln
-                        break
 
-                if target:
-                    break
-                time.sleep(0.5)
+            # ждём, пока попап появится и в нём будет нужный пункт
+            target = self.__wait_for(find_target, self.timings.sort_timeout)
 
             if not target:
                 print(
@@ -328,44 +572,197 @@ class Parser:
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", target
             )
+            first_review = self.driver.execute_script(
+                FIRST_REVIEW_JS, self.REVIEWS_CLASS
+            )
             self.driver.execute_script("arguments[0].click();", target)
-            time.sleep(1.0)  # даём странице перерисовать отзывы
+            # ждём, пока старый список отзывов заменится новым
+            if first_review is not None:
+                self.__wait_for(
+                    EC.staleness_of(first_review), self.timings.rerender_timeout
+                )
 
         except Exception as e:
             print(f"[sort={sort}] ошибка при применении сортировки: {e}")
 
+    def __get_data_reviews_api(
+        self,
+        sort: str | None = None,
+        limit: int = -1,
+        since: float | str | None = None,
+    ) -> Optional[list]:
+        """
+        Собирает отзывы через JSON fetchReviews без скролла страницы.
+        Возвращает None, если запрос fetchReviews поймать не удалось.
+        requests нужен только этому движку, поэтому импортируется здесь.
+        """
+        import requests
+
+        from yandex_reviews_parser.api import ReviewsApi
+
+        if not self._last_fetch and not self._collect_fetch_from_logs():
+            return None
+
+        api = ReviewsApi.from_parser(self)
+        try:
+            return api.get_reviews(sort=sort, limit=limit, since=since)
+        except (requests.RequestException, ValueError) as e:
+            print(f"[engine=api] ошибка fetchReviews, переходим на DOM: {e}")
+            return None
+        finally:
+            api.close()
+
     def __get_data_reviews(
         self,
         sort: str | None = None,
         limit: int = -1,
+        engine: str = "dom",
+        since: float | str | None = None,
     ) -> list:
         """
         Собирает отзывы.
 
-        sort  — тип сортировки (None / 'default' / 'newest' / 'negative' / 'positive')
-        limit — максимальное количество отзывов:
-                -1  -> все
-                >0  -> не больше указанного количества
+        sort   — тип сортировки (None / 'default' / 'newest' / 'negative' / 'positive')
+        limit  — максимальное количество отзывов:
+                 -1  -> все
+                 >0  -> не больше указанного количества
+        engine — 'dom' (скролл страницы) или 'api' (прямые запросы fetchReviews,
+                 при неудаче откатываемся на 'dom')
+        since  — см. iter_reviews
         """
-        #сортировка до сбора
-        self.__set_reviews_sort(sort)
+        if engine == "api":
+            with self.metrics.span("api_reviews"):
+                reviews = self.__get_data_reviews_api(
+                    sort=sort, limit=limit, since=since
+                )
+            if reviews is not None:
+                self.metrics.incr("reviews_extracted", len(reviews))
+                return reviews
 
-        reviews: list = []
+        return list(self.__iter_reviews(sort=sort, limit=limit, since=since))
 
-        # скроллим пока не наберём limit или не дойдём до конца
-        self.__scroll_to_bottom(limit=limit)
+    def __iter_reviews(
+        self,
+        sort: str | None = None,
+        limit: int = -1,
+        since: float | str | None = None,
+    ) -> Iterator[dict]:
+        """
+        Отдаёт отзывы пачками по мере подгрузки: извлекаем всё, что уже
+        загружено, отдаём, скроллим дальше. Повторы (по review_key) пропускаются.
+        С since останавливаемся на первом уже собранном отзыве.
 
-        elements = self.driver.find_elements(By.CLASS_NAME, self.REVIEWS_CLASS)
+        С self.checkpoint сначала отдаются отзывы из чекпоинта, затем страница
+        доскролливается до сохранённой позиции без извлечения, а новые отзывы
+        сбрасываются в чекпоинт после каждой пачки.
+        """
+        if since is not None and sort != "newest":
+            print(f"[since] работает только с sort='newest', sort={sort} — игнорируем")
+            since = None
 
-        if limit > 0:
-            elements = elements[:limit]
+        #сортировка до сбора
+        with self.metrics.span("sort"):
+            self.__set_reviews_sort(sort)
+        # список отзывов может дорисовываться позже заголовка страницы
+        with self.metrics.span("reviews_wait"):
+            self.__wait_for(
+                lambda d: self.__review_count() > 0, self.timings.reviews_timeout
+            )
 
-        for elem in elements:
-            reviews.append(self.__get_data_item(elem))
+        seen: set = set()
+        yielded = 0
+        pos = 0
+
+        checkpoint = self.checkpoint(sort) if self.checkpoint else None
+        if checkpoint is not None and checkpoint.reviews:
+            for review in checkpoint.reviews:
+                seen.add(ParserHelper.review_key(review))
+                yield review
+                yielded += 1
+                if 0 < limit <= yielded:
+                    return
+            pos = self.__fast_forward(max(0, checkpoint.position - self.RESUME_OVERLAP))
+
+        try:
+            while True:
+                stop = -1 if limit <= 0 else pos + (limit - yielded)
+                with self.metrics.span("extract"):
+                    batch = self.__get_data_items(pos, stop)
+                self.metrics.incr("reviews_extracted", len(batch))
+                pos += len(batch)
+                if self.prune_dom and batch:
+                    self.__prune(pos - len(batch), pos)
+
+                fresh = []
+                done = False
+                for review in batch:
+                    if ParserHelper.reached_watermark(review, since):
+                        done = True
+                        break
+                    key = ParserHelper.review_key(review)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    fresh.append(review)
+                    if 0 < limit <= yielded + len(fresh):
+                        done = True
+                        break
+                # пачка попадает в чекпоинт до того, как limit или since оборвут сбор
+                if checkpoint is not None:
+                    checkpoint.add(fresh, pos)
+                for review in fresh:
+                    yield review
+                    yielded += 1
+                if done:
+                    return
+
+                # скроллим, пока не наберём limit или не дойдём до конца
+                with self.metrics.span("scroll"):
+                    more = self.__scroll_step(pos)
+                self.metrics.incr("scroll_iterations")
+                if not more:
+                    self.completed_sorts.append(sort)
+                    return
+        finally:
+            # упали посреди сбора (Chrome, сеть) — сохраняем то, что успели
+            if checkpoint is not None:
+                checkpoint.flush()
+
+    def iter_reviews(
+        self,
+        sort: str | None = None,
+        limit: int = -1,
+        since: float | str | None = None,
+    ) -> Iterator[dict]:
+        """
+        Генератор отзывов: первая пачка приходит сразу, пока страница
+        ещё догружает следующие.
+
+        sort  — тип сортировки (None / 'default' / 'newest' / 'negative' / 'positive')
+        limit — максимальное количество отзывов (-1 = все)
+        since — только при sort='newest': timestamp или review_key последнего
+                собранного отзыва, дальше него не скроллим
+        """
+        if not self.__is_valid_page():
+            raise ValueError("Страница не найдена")
+        yield from self.__iter_reviews(sort=sort, limit=limit, since=since)
 
-        return reviews
 
 
+    def classify_outcome(self) -> str:
+        """
+        Исход прохода: ok, not_found, captcha, throttled или timeout.
+        Смотрит на саму страницу (капча, заголовок организации) и на статусы
+        fetchReviews, пойманные за проход. Результат сохраняется в self.outcome.
+        """
+        try:
+            self.__scan_fetch_logs()
+            state = self.driver.execute_script(PAGE_STATE_JS)
+        except WebDriverException:
+            state = None
+        self.outcome = classify_outcome(state, self.fetch_statuses, self._page_ready)
+        self.metrics.incr(f"outcome_{self.outcome}")
+        return self.outcome
 
     def __is_valid_page(self) -> bool:
         try:
@@ -374,28 +771,95 @@ class Parser:
         except NoSuchElementException:
             return False
 
+    def __get_company_info(self) -> dict:
+        with self.metrics.span("company_info"):
+            return self.__get_data_campaign()
+
+    def __get_data_reviews_by_sort(
+        self,
+        sorts: list,
+        limit: int = -1,
+        engine: str = "dom",
+        since: float | str | None = None,
+        dedupe: bool = False,
+    ) -> dict:
+        """
+        Отзывы в нескольких сортировках на одной открытой странице:
+        сортировка переключается по очереди, страница грузится один раз.
+
+        dedupe — не повторять отзыв, уже попавший в предыдущую сортировку
+        since  — применяется только к 'newest'
+        Возвращает {sort: [отзывы]} в порядке sorts.
+        """
+        seen: set = set()
+        by_sort: dict = {}
+        for sort in sorts:
+            reviews = self.__get_data_reviews(
+                sort=sort,
+                limit=limit,
+                engine=engine,
+                since=since if sort == "newest" else None,
+            )
+            if dedupe:
+                reviews = [r for r in reviews if ParserHelper.review_key(r) not in seen]
+                seen.update(ParserHelper.review_key(r) for r in reviews)
+            by_sort[sort] = reviews
+        return by_sort
+
+    def __reviews_result(
+        self,
+        sort: str | None,
+        limit: int,
+        engine: str,
+        since: float | str | None,
+        sorts: Optional[list],
+        dedupe: bool,
+    ):
+        """Список отзывов для sort или {sort: список} для sorts."""
+        if sorts:
+            return self.__get_data_reviews_by_sort(
+                sorts, limit=limit, engine=engine, since=since, dedupe=dedupe
+            )
+        return self.__get_data_reviews(
+            sort=sort, limit=limit, engine=engine, since=since
+        )
+
     def parse_all_data(
         self,
         sort: str | None = None,
         limit: int = -1,
+        engine: str = "dom",
+        since: float | str | None = None,
+        sorts: Optional[list] = None,
+        dedupe: bool = False,
     ) -> dict:
         if not self.__is_valid_page():
             return {"error": "Страница не найдена"}
         return {
-            "company_info": self.__get_data_campaign(),
-            "company_reviews": self.__get_data_reviews(sort=sort, limit=limit),
+            "company_info": self.__get_company_info(),
+            "company_reviews": self.__reviews_result(
+                sort, limit, engine, since, sorts, dedupe
+            ),
         }
 
     def parse_reviews(
         self,
         sort: str | None = None,
         limit: int = -1,
+        engine: str = "dom",
+        since: float | str | None = None,
+        sorts: Optional[list] = None,
+        dedupe: bool = False,
     ) -> dict:
         if not self.__is_valid_page():
             return {"error": "Страница не найдена"}
-        return {"company_reviews": self.__get_data_reviews(sort=sort, limit=limit)}
+        return {
+            "company_reviews": self.__reviews_result(
+                sort, limit, engine, since, sorts, dedupe
+            )
+        }
     
     def parse_company_info(self) -> dict:
         if not self.__is_valid_page():
             return {"error": "Страница не найдена"}
-        return {"company_info": self.__get_data_campaign()}
+        return {"company_info": self.__get_company_info()}
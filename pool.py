@@ -0,0 +1,236 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+
+def process_tree_rss_mb(pid: Optional[int]) -> Optional[float]:
+    """
+    Суммарный RSS процесса и всех его потомков в МБ (читаем /proc, только Linux).
+    @param pid: PID корневого процесса (браузера)
+    @return: RSS в МБ или None, если посчитать не удалось
+    """
+    if not pid or not os.path.isdir("/proc"):
+        return None
+
+    children: dict = {}
+    rss: dict = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                stat = f.read().rsplit(b")", 1)[1].split()
+        except OSError:
+            continue
+        # после "(comm)": state ppid ... rss — 22-е поле после comm
+        children.setdefault(int(stat[1]), []).append(int(entry))
+        rss[int(entry)] = int(stat[21])
+
+    if pid not in rss:
+        return None
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total * page_size / (1024 * 1024)
+
+
+class DriverPool:
+    """
+    Пул долгоживущих Chrome-драйверов.
+
+    Драйвер берётся через acquire()/lease() и возвращается через release().
+    Перед выдачей проверяется, что браузер жив; после возврата состояние
+    чистится (cookies и хранилища через CDP, буфер performance-логов,
+    about:blank). Драйвер пересоздаётся после max_pages страниц или если
+    RSS браузера превысил max_rss_mb.
+    """
+
+    # Origin'ы, чьи хранилища чистятся между компаниями (плюс origin текущей страницы)
+    RESET_ORIGINS = (
+        "https://yandex.ru",
+        "https://yandex.com",
+        "https://mc.yandex.ru",
+        "https://passport.yandex.ru",
+        "https://core-renderer-tiles.maps.yandex.net",
+    )
+
+    def __init__(
+        self,
+        factory: Callable,
+        size: int = 2,
+        max_pages: int = 50,
+        max_rss_mb: Optional[float] = None,
+    ):
+        """
+        @param factory: функция без аргументов, создающая новый драйвер
+        @param size: максимальное количество одновременно живых драйверов
+        @param max_pages: после скольких аренд драйвер пересоздаётся
+        @param max_rss_mb: порог RSS браузера (МБ) для пересоздания, None = не следим
+        """
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+
+        # свободные драйверы (берём последний вернувшийся); _available будит
+        # ждущих в acquire() и при возврате драйвера, и при его закрытии
+        self._idle: list = []
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+        self._created = 0
+        self._pages: dict = {}
+        self._closed = False
+
+    def __create(self):
+        driver = self.factory()
+        self._pages[id(driver)] = 0
+        return driver
+
+    def __discard(self, driver) -> None:
+        self._pages.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+    @staticmethod
+    def is_alive(driver) -> bool:
+        """Проверка, что браузер отвечает."""
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    @staticmethod
+    def browser_rss_mb(driver) -> Optional[float]:
+        """RSS процесса браузера вместе с дочерними (рендереры, GPU) в МБ."""
+        return process_tree_rss_mb(getattr(driver, "browser_pid", None))
+
+    @classmethod
+    def reset(cls, driver) -> None:
+        """
+        Сбросить состояние между компаниями: cookies всех доменов, хранилища
+        (localStorage, IndexedDB, кеш) origin'ов Яндекса и текущей страницы,
+        буфер performance-логов и открытую страницу. Parser._last_fetch живёт
+        в Parser, который создаётся заново на каждую аренду.
+        """
+        try:
+            origin = driver.execute_script("return location.origin")
+        except Exception:
+            origin = None
+        origins = set(cls.RESET_ORIGINS)
+        if origin and origin.startswith("http"):
+            origins.add(origin)
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for item in sorted(origins):
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": item, "storageTypes": "all"}
+                )
+        except Exception:
+            # без CDP — хотя бы то, что видно текущему документу
+            driver.delete_all_cookies()
+            driver.execute_script("try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}")
+        try:
+            driver.get_log("performance")
+        except Exception:
+            pass
+        driver.get("about:blank")
+
+    def acquire(self, timeout: Optional[float] = None):
+        """
+        Взять драйвер из пула. Если свободных нет и лимит не исчерпан —
+        создаём новый, иначе ждём возврата не дольше timeout секунд.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while True:
+            with self._available:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("DriverPool закрыт")
+                    if self._idle:
+                        driver = self._idle.pop()
+                        break
+                    # после закрытия чужого драйвера место под новый освободилось
+                    if self._created < self.size:
+                        self._created += 1
+                        driver = None
+                        break
+                    wait = None if deadline is None else deadline - time.monotonic()
+                    if wait is not None and wait <= 0:
+                        raise TimeoutError("Нет свободного драйвера в пуле")
+                    self._available.wait(wait)
+
+            if driver is None:
+                try:
+                    return self.__create()
+                except Exception:
+                    with self._available:
+                        self._created -= 1
+                        self._available.notify()
+                    raise
+
+            if self.is_alive(driver):
+                return driver
+            self.__discard(driver)
+
+    def release(self, driver, broken: bool = False) -> None:
+        """
+        Вернуть драйвер в пул. broken=True — драйвер сразу закрывается.
+        """
+        pages = self._pages.get(id(driver), 0) + 1
+        self._pages[id(driver)] = pages
+
+        if self._closed or broken or pages >= self.max_pages:
+            self.__discard(driver)
+            return
+
+        if self.max_rss_mb is not None:
+            rss = self.browser_rss_mb(driver)
+            if rss is not None and rss > self.max_rss_mb:
+                self.__discard(driver)
+                return
+
+        try:
+            self.reset(driver)
+        except Exception:
+            self.__discard(driver)
+            return
+        with self._available:
+            self._idle.append(driver)
+            self._available.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None):
+        """
+        with pool.lease() as driver: ...
+        При исключении внутри блока драйвер проверяется на живость перед возвратом.
+        """
+        driver = self.acquire(timeout=timeout)
+        try:
+            yield driver
+        except BaseException:
+            self.release(driver, broken=not self.is_alive(driver))
+            raise
+        else:
+            self.release(driver)
+
+    def close(self) -> None:
+        """Закрыть все свободные драйверы; занятые закроются при возврате."""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._available.notify_all()
+        for driver in idle:
+            self.__discard(driver)
@@ -0,0 +1,105 @@
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+
+
+@dataclass
+class BrowserProfile:
+    """
+    Настройки запуска Chrome для YandexParser.
+
+    BrowserProfile() — полный браузер, как раньше.
+    BrowserProfile.lean() — без картинок, шрифтов, тайлов карты и аналитики,
+    с флагами экономии памяти и меньшим окном.
+    """
+    window_size: str = "1920,1080"
+    # дополнительные аргументы командной строки Chrome
+    extra_args: list = field(default_factory=list)
+    # Chrome prefs (ChromeOptions.add_experimental_option("prefs", ...))
+    prefs: dict = field(default_factory=dict)
+    # шаблоны для Network.setBlockedURLs (поддерживается '*')
+    blocked_urls: list = field(default_factory=list)
+    # URL или шаблоны, которые нельзя блокировать ни при каких blocked_urls
+    allowed_urls: list = field(default_factory=list)
+
+    # Всегда пропускаем: сама страница отзывов и JSON отзывов
+    PROTECTED_URLS = (
+        "https://yandex.ru/maps/api/business/fetchReviews?ajax=1",
+        "https://yandex.ru/maps/org/1/reviews/",
+    )
+
+    LEAN_ARGS = (
+        "--blink-settings=imagesEnabled=false",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-background-timer-throttling",
+        "--disable-default-apps",
+        "--disable-sync",
+        "--disable-features=Translate,MediaRouter,OptimizationHints",
+        "--mute-audio",
+        "--no-first-run",
+        "--disk-cache-size=1",
+        "--js-flags=--max-old-space-size=512",
+    )
+
+    LEAN_BLOCKED_URLS = (
+        # картинки, шрифты, медиа
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm",
+        # тайлы и статика карты
+        "*core-renderer-tiles.maps.yandex.net*",
+        "*core-carparks-renderer-lots.maps.yandex.net*",
+        "*static-maps.yandex.ru*",
+        # аватары (ссылку берём из style, саму картинку грузить не нужно)
+        "*avatars.mds.yandex.net*",
+        # аналитика и реклама
+        "*mc.yandex.ru*",
+        "*an.yandex.ru*",
+        "*yandex.ru/clck/*",
+        "*yandex.ru/ads/*",
+        "*strm.yandex.ru*",
+    )
+
+    @classmethod
+    def lean(
+        cls,
+        blocked_urls: list | None = None,
+        allowed_urls: list | None = None,
+        window_size: str = "1024,768",
+    ) -> "BrowserProfile":
+        """
+        Облегчённый профиль.
+        @param blocked_urls: свой список блокировки вместо LEAN_BLOCKED_URLS
+        @param allowed_urls: что исключить из блокировки
+        @param window_size: размер окна
+        """
+        return cls(
+            window_size=window_size,
+            extra_args=list(cls.LEAN_ARGS),
+            prefs={
+                "profile.managed_default_content_settings.images": 2,
+                "profile.default_content_setting_values.notifications": 2,
+                "profile.default_content_setting_values.geolocation": 2,
+            },
+            blocked_urls=list(cls.LEAN_BLOCKED_URLS if blocked_urls is None else blocked_urls),
+            allowed_urls=list(allowed_urls or []),
+        )
+
+    def effective_blocked_urls(self) -> list:
+        """
+        blocked_urls без шаблонов, которые задели бы allowed_urls или
+        страницу отзывов / fetchReviews.
+        """
+        keep = list(self.PROTECTED_URLS) + list(self.allowed_urls)
+        return [
+            pattern
+            for pattern in self.blocked_urls
+            if not any(fnmatch(url, pattern) for url in keep)
+        ]
+
+    def apply(self, driver) -> None:
+        """Включить блокировку URL в уже запущенном браузере через CDP."""
+        patterns = self.effective_blocked_urls()
+        if not patterns:
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
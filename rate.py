@@ -0,0 +1,181 @@
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from typing import Optional
+
+# Исходы одного прохода по компании
+OK = "ok"
+NOT_FOUND = "not_found"
+CAPTCHA = "captcha"
+THROTTLED = "throttled"
+TIMEOUT = "timeout"
+
+OUTCOME_ERRORS = {
+    NOT_FOUND: "Страница не найдена",
+    CAPTCHA: "Яндекс показал капчу",
+    THROTTLED: "Яндекс ограничил запросы (fetchReviews 429/403)",
+    TIMEOUT: "Страница не загрузилась",
+}
+
+
+def classify_outcome(page_state: Optional[dict], fetch_statuses: Counter, ready: Optional[bool]) -> str:
+    """
+    Исход прохода по состоянию страницы и статусам fetchReviews.
+
+    page_state     — результат PAGE_STATE_JS: {"ready_state", "captcha", "org"}
+    fetch_statuses — Counter статусов ответов fetchReviews за проход
+    ready          — дождались ли wait_page_ready (None — не ждали)
+    """
+    state = page_state or {}
+    if state.get("captcha"):
+        return CAPTCHA
+    if fetch_statuses[429] or fetch_statuses[403]:
+        return THROTTLED
+    if state.get("org"):
+        return OK
+    if ready is False and state.get("ready_state") != "complete":
+        return TIMEOUT
+    if any(status >= 500 for status in fetch_statuses):
+        return THROTTLED
+    return NOT_FOUND
+
+
+class RateSlot:
+    """Разрешение на один проход; outcome выставляет тот, кто парсил."""
+
+    def __init__(self):
+        # если упали до классификации, считаем, что страница не загрузилась
+        self.outcome = TIMEOUT
+
+
+class RateController:
+    """
+    Глобальный ограничитель нагрузки на Яндекс по схеме AIMD.
+
+    Два рычага: сколько компаний парсится одновременно (concurrency) и
+    минимальная пауза между стартами (interval). Серия успешных проходов
+    длиной в текущий concurrency прибавляет один параллельный слот и
+    уменьшает паузу на interval_step. Капча или 429/403 режут concurrency
+    вдвое и удваивают паузу, капча ещё и останавливает старты на cooldown
+    секунд. Таймаут — мягкий сигнал перегрузки (concurrency * 0.75),
+    not_found и прочие ошибки на скорость не влияют.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 4,
+        min_concurrency: int = 1,
+        start_concurrency: Optional[int] = None,
+        interval: float = 1.0,
+        min_interval: float = 0.0,
+        max_interval: float = 60.0,
+        interval_step: float = 0.25,
+        cooldown: float = 30.0,
+        window: float = 600.0,
+    ):
+        """
+        @param max_concurrency: потолок параллельных проходов
+        @param min_concurrency: ниже этого не опускаемся
+        @param start_concurrency: с чего начинать (по умолчанию min_concurrency)
+        @param interval: начальная пауза между стартами, секунды
+        @param min_interval: нижняя граница паузы
+        @param max_interval: верхняя граница паузы
+        @param interval_step: на сколько уменьшается пауза при росте
+        @param cooldown: пауза всех стартов после капчи
+        @param window: окно, по которому считается companies_per_hour
+        """
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.concurrency = float(start_concurrency or min_concurrency)
+        self.interval = interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval_step = interval_step
+        self.cooldown = cooldown
+        self.window = window
+
+        self.outcomes: Counter = Counter()
+        self.in_flight = 0
+        self._ok_streak = 0
+        self._next_start = 0.0
+        self._paused_until = 0.0
+        self._finished: deque = deque()
+        self._cond = threading.Condition()
+
+    def acquire(self) -> RateSlot:
+        """Дождаться свободного слота и паузы между стартами."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                wait = max(self._next_start, self._paused_until) - now
+                if self.in_flight < int(self.concurrency) and wait <= 0:
+                    break
+                self._cond.wait(timeout=wait if wait > 0 else None)
+            self.in_flight += 1
+            self._next_start = now + self.interval
+        return RateSlot()
+
+    def release(self, slot: RateSlot) -> None:
+        """Вернуть слот и учесть исход прохода."""
+        with self._cond:
+            self.in_flight -= 1
+            self.__observe(slot.outcome)
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """with controller.slot() as slot: ...; slot.outcome = ..."""
+        slot = self.acquire()
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+    def __observe(self, outcome: str) -> None:
+        now = time.monotonic()
+        self.outcomes[outcome] += 1
+        if outcome in (OK, NOT_FOUND):
+            self._finished.append(now)
+        while self._finished and self._finished[0] < now - self.window:
+            self._finished.popleft()
+
+        if outcome == OK:
+            self._ok_streak += 1
+            if self._ok_streak >= int(self.concurrency):
+                self._ok_streak = 0
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                self.interval = max(self.min_interval, self.interval - self.interval_step)
+        elif outcome in (CAPTCHA, THROTTLED):
+            self._ok_streak = 0
+            self.concurrency = max(self.min_concurrency, self.concurrency / 2)
+            self.interval = min(
+                self.max_interval, max(self.interval * 2, self.interval_step)
+            )
+            if outcome == CAPTCHA:
+                self._paused_until = now + self.cooldown
+        elif outcome == TIMEOUT:
+            self._ok_streak = 0
+            self.concurrency = max(self.min_concurrency, self.concurrency * 0.75)
+
+    @property
+    def companies_per_hour(self) -> float:
+        """Сколько компаний в час завершается за последнее окно."""
+        with self._cond:
+            if len(self._finished) < 2:
+                return 0.0
+            span = max(self._finished[-1] - self._finished[0], 1e-6)
+            return round((len(self._finished) - 1) * 3600 / span, 1)
+
+    def stats(self) -> dict:
+        """Текущая скорость и исходы — для логов и метрик."""
+        per_hour = self.companies_per_hour
+        with self._cond:
+            return {
+                "concurrency": int(self.concurrency),
+                "interval": round(self.interval, 3),
+                "in_flight": self.in_flight,
+                "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 1),
+                "companies_per_hour": per_hour,
+                "outcomes": dict(self.outcomes),
+            }
@@ -0,0 +1,177 @@
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+
+from yandex_reviews_parser.cache import ResultCache
+
+
+class CompanyIdResolver:
+    """
+    URL Яндекс.Карт -> businessId (ya_id), от дешёвого способа к дорогому:
+
+      1. из самого URL: /maps/org/<slug>/<id>/, /maps/org/<id>/, ?oid=<id>
+      2. HTTP GET без браузера: редиректы коротких ссылок (/maps/-/...)
+         и поиск id в HTML
+      3. browser(urls, timeout) -> {url: id} — браузер и fetchReviews в
+         сетевых логах; передаёт YandexParser, один браузер на всю пачку
+
+    Найденное через HTTP и браузер запоминается в памяти и в ResultCache
+    (kind 'company_id'), если он задан. Разбор из URL не кешируется —
+    регулярка быстрее похода в SQLite.
+    """
+
+    # id организации в пути: /org/<slug>/<id>/ или /org/<id>/
+    URL_PATTERNS = (
+        re.compile(r"/org/(?:[^/?#]+/)?(\d{3,})(?:[/?#]|$)"),
+        re.compile(r"[?&](?:oid|businessId|orgId)=(\d{3,})"),
+    )
+    # id в HTML страницы организации
+    HTML_PATTERNS = (
+        re.compile(r'"businessId"\s*:\s*"?(\d{3,})'),
+        re.compile(r'"oid"\s*:\s*"?(\d{3,})'),
+        re.compile(r"/maps/org/[^/\"'?#]+/(\d{3,})/"),
+    )
+    HEADERS = {
+        "User-Agent": (
+            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+            "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+        ),
+        "Accept-Language": "ru-RU,ru;q=0.9",
+    }
+
+    def __init__(
+        self,
+        browser: Optional[Callable[[list, float], dict]] = None,
+        cache: Optional[ResultCache] = None,
+        http: bool = True,
+        http_timeout: float = 5,
+        http_workers: int = 8,
+    ):
+        """
+        @param browser: запасной путь через браузер, browser(urls, timeout) -> {url: id}
+        @param cache: ResultCache для найденных id
+        @param http: пробовать ли HTTP до браузера
+        @param http_timeout: таймаут одного HTTP-запроса
+        @param http_workers: сколько HTTP-запросов в resolve_many идёт параллельно
+        """
+        self.browser = browser
+        self.cache = cache
+        self.http = http
+        self.http_timeout = http_timeout
+        self.http_workers = http_workers
+        self._memo: dict = {}
+        self._session = None
+        self._lock = threading.Lock()
+        # Яндекс ответил капчей на HTTP: до конца resolve_many сразу в браузер
+        self._http_blocked = False
+
+    @classmethod
+    def from_url(cls, url: str) -> Optional[int]:
+        """id из самого URL без сети (None — в URL его нет)."""
+        for pattern in cls.URL_PATTERNS:
+            match = pattern.search(url)
+            if match:
+                return int(match.group(1))
+        return None
+
+    def __session(self):
+        with self._lock:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                self._session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.http_workers, pool_maxsize=self.http_workers
+                )
+                self._session.mount("https://", adapter)
+                self._session.headers.update(self.HEADERS)
+            return self._session
+
+    def from_http(self, url: str) -> Optional[int]:
+        """
+        id по HTTP: адрес после редиректов, затем HTML.
+        None — не нашли, сеть упала или Яндекс показал капчу.
+        """
+        if self._http_blocked:
+            return None
+        try:
+            resp = self.__session().get(url, timeout=self.http_timeout)
+        except Exception as e:
+            print(f"[resolver] {url}: {type(e).__name__}: {e}")
+            return None
+        if "showcaptcha" in resp.url:
+            self._http_blocked = True
+            return None
+        found = self.from_url(resp.url)
+        if found is not None:
+            return found
+        for pattern in self.HTML_PATTERNS:
+            match = pattern.search(resp.text)
+            if match:
+                return int(match.group(1))
+        return None
+
+    def __key(self, url: str) -> str:
+        return ResultCache.make_key("company_id", url)
+
+    def __recall(self, url: str) -> Optional[int]:
+        if url in self._memo:
+            return self._memo[url]
+        if self.cache is not None:
+            cached = self.cache.get(self.__key(url))
+            if cached is not None and cached[1]:
+                self.cache.hits += 1
+                self._memo[url] = cached[0]
+                return cached[0]
+        return None
+
+    def __remember(self, url: str, value: Optional[int]) -> None:
+        if value is None:
+            return
+        self._memo[url] = value
+        if self.cache is not None:
+            self.cache.set(self.__key(url), "company_id", value)
+
+    def resolve(self, url: str, timeout: float = 10) -> Optional[int]:
+        """id для одного URL; timeout — ожидание fetchReviews в браузере."""
+        return self.resolve_many([url], timeout=timeout).get(url)
+
+    def resolve_many(self, urls: Iterable[str], timeout: float = 10) -> dict:
+        """
+        id для пачки URL: {url: id или None}.
+        Сначала все URL разбираются офлайн и из кеша, оставшиеся — по HTTP
+        параллельно, и только то, что не нашлось, — одним браузером.
+        """
+        result: dict = {}
+        pending: list = []
+        for url in dict.fromkeys(urls):
+            found = self.from_url(url)
+            if found is None:
+                found = self.__recall(url)
+            result[url] = found
+            if found is None:
+                pending.append(url)
+
+        if pending and self.http:
+            self._http_blocked = False
+            with ThreadPoolExecutor(max_workers=self.http_workers) as executor:
+                found_http = dict(zip(pending, executor.map(self.from_http, pending)))
+            for url, found in found_http.items():
+                self.__remember(url, found)
+                result[url] = found
+            pending = [url for url in pending if result[url] is None]
+
+        if pending and self.browser is not None:
+            found_browser = self.browser(pending, timeout) or {}
+            for url in pending:
+                found = found_browser.get(url)
+                self.__remember(url, found)
+                result[url] = found
+        return result
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
@@ -0,0 +1,242 @@
+"""
+JavaScript-сниппеты, которые выполняются внутри страницы через execute_script.
+
+Каждый сниппет отдаёт наружу только простые типы (строки, числа, списки, dict),
+чтобы за один вызов WebDriver получить сразу всё нужное.
+"""
+
+# Капча Яндекса (SmartCaptcha): чекбокс или расширенное задание.
+CAPTCHA_SELECTOR = (
+    "form#checkbox-captcha-form, .CheckboxCaptcha, .AdvancedCaptcha, .SmartCaptcha"
+)
+
+# Страница компании готова: документ разобран и есть заголовок или отзывы.
+# Капча тоже завершает ожидание — ждать page_timeout на ней бессмысленно.
+# arguments: class_name отзыва
+PAGE_READY_JS = """
+return document.readyState !== 'loading' && !!document.querySelector(
+    'h1.orgpage-header-view__header, .' + arguments[0] + ', %s'
+);
+""" % CAPTCHA_SELECTOR
+
+# Количество загруженных отзывов без передачи самих элементов.
+# arguments: class_name
+COUNT_REVIEWS_JS = "return document.getElementsByClassName(arguments[0]).length;"
+
+# Первый отзыв списка (или null) — чтобы дождаться перерисовки после сортировки.
+# arguments: class_name
+FIRST_REVIEW_JS = "return document.getElementsByClassName(arguments[0])[0] || null;"
+
+# Раскрыть ответы владельца у отзывов [start, stop) одним проходом: кликаем
+# все кнопки «Посмотреть ответ», у которых ответ ещё не показан.
+# Возвращает, у скольких раскрытых отзывов ответ ещё не отрисовался
+# (0 — ждать не нужно).
+# arguments: class_name, start, stop
+EXPAND_ANSWERS_JS = """
+var nodes = document.getElementsByClassName(arguments[0]);
+var stop = Math.min(nodes.length, arguments[2]);
+var pending = 0;
+for (var i = arguments[1]; i < stop; i++) {
+    var elem = nodes[i];
+    if (elem.querySelector('.business-review-comment-content__bubble')) continue;
+    var expand = elem.querySelector('.business-review-view__comment-expand');
+    if (!expand) continue;
+    elem.__yrpAnswer = true;
+    expand.click();
+    if (!elem.querySelector('.business-review-comment-content__bubble')) pending++;
+}
+return pending;
+"""
+
+# Все раскрытые EXPAND_ANSWERS_JS ответы в [start, stop) отрисованы.
+# arguments: class_name, start, stop
+ANSWERS_RENDERED_JS = """
+var nodes = document.getElementsByClassName(arguments[0]);
+var stop = Math.min(nodes.length, arguments[2]);
+for (var i = arguments[1]; i < stop; i++) {
+    if (nodes[i].__yrpAnswer
+            && !nodes[i].querySelector('.business-review-comment-content__bubble')) {
+        return false;
+    }
+}
+return true;
+"""
+
+# Сериализует отзывы [start, start + count) в список dict. Ответ владельца
+# берётся только уже раскрытый (EXPAND_ANSWERS_JS), сами кнопки не кликаются.
+# arguments: class_name, start, count, with_answers
+EXTRACT_REVIEWS_JS = """
+var cls = arguments[0], start = arguments[1], count = arguments[2];
+var withAnswers = arguments[3] !== false;
+var nodes = document.getElementsByClassName(cls);
+var stop = Math.min(nodes.length, start + count);
+var text = function (root, sel) {
+    var el = root.querySelector(sel);
+    return el ? (el.innerText || '').trim() : null;
+};
+var attr = function (root, sel, name) {
+    var el = root.querySelector(sel);
+    return el ? el.getAttribute(name) : null;
+};
+var out = [];
+for (var i = start; i < stop; i++) {
+    var elem = nodes[i];
+    var stars = 0;
+    var spans = elem.querySelectorAll('.business-review-view__rating span');
+    for (var j = 0; j < spans.length; j++) {
+        var c = spans[j].getAttribute('class') || '';
+        if (c.indexOf('_empty') !== -1) continue;
+        if (c.indexOf('_full') !== -1) stars++;
+    }
+    out.push({
+        name: text(elem, "span[itemprop='name']"),
+        icon_style: attr(elem, 'div.user-icon-view__icon', 'style'),
+        date: attr(elem, "meta[itemprop='datePublished']", 'content'),
+        text: text(elem, '.business-review-view__body'),
+        stars: stars,
+        answer: withAnswers ? text(elem, '.business-review-comment-content__bubble') : null
+    });
+}
+return out;
+"""
+
+# Видимый текст пунктов меню сортировки отзывов
+SORT_LABELS = {
+    "default": "По умолчанию",
+    "newest": "По новизне",
+    "negative": "Сначала отрицательные",
+    "positive": "Сначала положительные",
+}
+
+# Есть ли на странице заголовок организации.
+IS_ORG_PAGE_JS = "return !!document.querySelector('h1.orgpage-header-view__header');"
+
+# Что сейчас на странице — для классификации исхода прохода.
+# Капчу узнаём по адресу showcaptcha или по форме на странице.
+PAGE_STATE_JS = """
+return {
+    ready_state: document.readyState,
+    captcha: location.href.indexOf('showcaptcha') !== -1
+        || !!document.querySelector('%s'),
+    org: !!document.querySelector('h1.orgpage-header-view__header'),
+};
+""" % CAPTCHA_SELECTOR
+
+# Открыть попап сортировки кликом по первой видимой кнопке.
+SORT_TOGGLE_JS = """
+var nodes = document.querySelectorAll("div.rating-ranking-view[role='button']");
+for (var i = 0; i < nodes.length; i++) {
+    if (nodes[i].offsetParent === null) continue;
+    nodes[i].scrollIntoView({block: 'center'});
+    nodes[i].click();
+    return true;
+}
+return false;
+"""
+
+# Кликнуть пункт сортировки с нужной подписью. Перед кликом первый отзыв
+# помечается, чтобы REVIEWS_RERENDERED_JS дождался перерисовки списка.
+# arguments: подпись из SORT_LABELS, class_name отзыва
+SORT_OPTION_JS = """
+var label = arguments[0], cls = arguments[1];
+var lines = document.querySelectorAll('div.rating-ranking-view__popup-line');
+for (var i = 0; i < lines.length; i++) {
+    var line = lines[i];
+    if (line.offsetParent === null) continue;
+    var aria = (line.getAttribute('aria-label') || '').trim();
+    var text = (line.innerText || '').trim();
+    if (aria !== label && text !== label) continue;
+    var first = document.getElementsByClassName(cls)[0];
+    if (first) first.__yrpStale = true;
+    line.scrollIntoView({block: 'center'});
+    line.click();
+    return true;
+}
+return false;
+"""
+
+# Список отзывов перерисован: первый отзыв уже не тот, что был помечен.
+# arguments: class_name
+REVIEWS_RERENDERED_JS = """
+var first = document.getElementsByClassName(arguments[0])[0];
+return !first || !first.__yrpStale;
+"""
+
+# Сколько отзывов загружено; если не больше loaded — заодно прокрутить к
+# последнему, чтобы страница подгрузила следующую пачку. Элементы наружу
+# не передаются, так что цена шага не зависит от длины списка.
+# arguments: class_name, loaded
+SCROLL_LAST_REVIEW_JS = """
+var nodes = document.getElementsByClassName(arguments[0]);
+var count = nodes.length;
+if (count && count <= arguments[1]) nodes[count - 1].scrollIntoView({block: 'end'});
+return count;
+"""
+
+# Общее число отзывов компании по разметке страницы (или null).
+REVIEWS_TOTAL_JS = """
+var meta = document.querySelector("meta[itemprop='reviewCount']");
+var raw = meta ? meta.getAttribute('content') : null;
+if (!raw) {
+    var header = document.querySelector('.card-section-header__title');
+    raw = header ? header.innerText : null;
+}
+var digits = raw ? raw.replace(/[^0-9]/g, '') : '';
+return digits ? parseInt(digits, 10) : null;
+"""
+
+# Данные компании одним вызовом: название, рейтинг, число оценок, звёзды.
+COMPANY_INFO_JS = """
+var text = function (root, sel) {
+    var el = root.querySelector(sel);
+    return el ? (el.innerText || '').trim() : null;
+};
+var info = {
+    name: text(document, 'h1.orgpage-header-view__header'),
+    rating: null,
+    count_rating: null,
+    stars: 0
+};
+var block = document.querySelector('div.business-summary-rating-badge-view__rating-and-stars');
+if (!block) return info;
+var parts = block.querySelectorAll(
+    '.business-summary-rating-badge-view__rating > span.business-summary-rating-badge-view__rating-text'
+);
+info.rating = Array.prototype.map.call(parts, function (s) { return s.innerText; }).join('');
+info.count_rating = text(
+    block, '.business-summary-rating-badge-view__rating-count > span.business-rating-amount-view._summary'
+);
+var spans = block.querySelectorAll('.business-rating-badge-view__stars > span');
+for (var j = 0; j < spans.length; j++) {
+    var c = spans[j].getAttribute('class') || '';
+    if (c.indexOf('_empty') !== -1) continue;
+    if (c.indexOf('_full') !== -1) info.stars++;
+}
+return info;
+"""
+
+# Загружено ли больше отзывов, чем уже обработано.
+# arguments: class_name, loaded
+REVIEWS_GREW_JS = "return document.getElementsByClassName(arguments[0]).length > arguments[1];"
+
+# Очистить уже извлечённые отзывы [start, stop): узел и класс остаются
+# (индексы, подсчёт и скролл работают как прежде), а содержимое заменяется
+# пустой заглушкой той же высоты. Сначала читаем все высоты, потом пишем,
+# чтобы не пересчитывать раскладку на каждом узле.
+# arguments: class_name, start, stop
+PRUNE_REVIEWS_JS = """
+var nodes = document.getElementsByClassName(arguments[0]);
+var stop = Math.min(nodes.length, arguments[2]);
+var todo = [], heights = [];
+for (var i = arguments[1]; i < stop; i++) {
+    if (nodes[i].hasAttribute('data-yrp-pruned')) continue;
+    todo.push(nodes[i]);
+    heights.push(nodes[i].offsetHeight);
+}
+for (var j = 0; j < todo.length; j++) {
+    todo[j].style.height = heights[j] + 'px';
+    todo[j].textContent = '';
+    todo[j].setAttribute('data-yrp-pruned', '');
+}
+return todo.length;
+"""
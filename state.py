@@ -0,0 +1,124 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+from yandex_reviews_parser.helpers import ParserHelper
+
+try:
+    import fcntl
+except ImportError:  # Windows: блокировка только между потоками процесса
+    fcntl = None
+
+
+class StateStore:
+    """
+    Отметки последнего собранного отзыва по business_id в JSON-файле.
+
+    Формат файла:
+    {
+      "1040226791": {"date": 1760071873.496, "key": "Evgen Evgen|1760071873.496",
+                     "updated": 1760100000.0},
+      ...
+    }
+
+    Файл можно делить между процессами (воркеры JobQueue): запись идёт под
+    flock на <path>.lock, перед ней файл перечитывается и отметки сливаются —
+    для каждой компании остаётся самая новая.
+    """
+
+    def __init__(self, path: str):
+        """
+        @param path: путь к JSON-файлу состояния (создаётся при первой записи)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: dict = {}
+        # st_mtime_ns файла на момент последнего чтения
+        self._mtime: Optional[int] = None
+        self.__merge()
+
+    @staticmethod
+    def __is_newer(mark: Optional[dict], current: Optional[dict]) -> bool:
+        if not mark or mark.get("date") is None:
+            return False
+        return not current or current.get("date") is None or mark["date"] > current["date"]
+
+    def __merge(self, force: bool = False) -> None:
+        """
+        Подтянуть отметки, записанные другими процессами (под self._lock).
+        Без force файл перечитывается, только если изменился его mtime.
+        """
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime and not force:
+            return
+        with open(self.path, encoding="utf-8") as f:
+            disk = json.load(f)
+        self._mtime = mtime
+        for business_id, mark in disk.items():
+            if self.__is_newer(mark, self._data.get(business_id)):
+                self._data[business_id] = mark
+
+    @contextmanager
+    def __file_lock(self):
+        """Эксклюзивная блокировка между процессами на время чтения и записи."""
+        if fcntl is None:
+            yield
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get(self, business_id) -> Optional[dict]:
+        """Отметка для компании или None, если её ещё не парсили."""
+        with self._lock:
+            self.__merge()
+            mark = self._data.get(str(business_id))
+            return dict(mark) if mark else None
+
+    def get_since(self, business_id) -> Optional[float]:
+        """Timestamp последнего собранного отзыва — значение для since."""
+        mark = self.get(business_id)
+        return mark.get("date") if mark else None
+
+    def update(self, business_id, reviews: list) -> None:
+        """
+        Поднять отметку до самого нового отзыва из reviews.
+        Если отзывов нет или они не новее текущей отметки, ничего не меняется.
+        """
+        dated = [r for r in reviews if r.get("date") is not None]
+        if not dated:
+            return
+        newest = max(dated, key=lambda r: r["date"])
+
+        with self._lock, self.__file_lock():
+            self.__merge(force=True)
+            mark = self._data.get(str(business_id))
+            if mark and mark.get("date") is not None and mark["date"] >= newest["date"]:
+                return
+            self._data[str(business_id)] = {
+                "date": newest["date"],
+                "key": ParserHelper.review_key(newest),
+                "updated": time.time(),
+            }
+            self.__save()
+
+    def __save(self) -> None:
+        """Атомарная запись: во временный файл, затем os.replace (под __file_lock)."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=4)
+        os.replace(tmp, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
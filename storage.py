@@ -1,8 +1,11 @@
-from dataclasses import dataclass
-from typing import Union
+import math
+import sys
+from array import array
+from dataclasses import dataclass, fields
+from typing import Iterable, Iterator, Union
 
 
-@dataclass
+@dataclass(slots=True)
 class Review:
     name: str
     icon_href: Union[str, None]
@@ -12,9 +15,68 @@ class Review:
     answer: str
 
 
-@dataclass
+@dataclass(slots=True)
 class Info:
     name: str
     rating: float
     count_rating: int
     stars: float
+
+
+REVIEW_FIELDS = tuple(f.name for f in fields(Review))
+
+
+class ReviewBatch:
+    """
+    Пачка отзывов по колонкам: даты — в array('d'), звёзды (целое число
+    закрашенных звёзд, как в parse()) — в array('b'), имена авторов
+    и ссылки на аватары интернируются (повторяются у дефолтных аватаров и
+    однофамильцев). Отзыв в пачке занимает в разы меньше, чем dict.
+
+    Принимает и отдаёт отзывы в формате asdict(Review); date=None хранится
+    как NaN и обратно превращается в None.
+    """
+
+    __slots__ = ("names", "icon_hrefs", "dates", "texts", "stars", "answers")
+
+    def __init__(self, reviews: Iterable[dict] = ()):
+        self.names: list = []
+        self.icon_hrefs: list = []
+        self.dates = array("d")
+        self.texts: list = []
+        self.stars = array("b")
+        self.answers: list = []
+        self.extend(reviews)
+
+    def append(self, review: dict) -> None:
+        name = review.get("name")
+        icon_href = review.get("icon_href")
+        date = review.get("date")
+        self.names.append(sys.intern(name) if name else name)
+        self.icon_hrefs.append(sys.intern(icon_href) if icon_href else icon_href)
+        self.dates.append(math.nan if date is None else date)
+        self.texts.append(review.get("text"))
+        self.stars.append(int(review.get("stars") or 0))
+        self.answers.append(review.get("answer"))
+
+    def extend(self, reviews: Iterable[dict]) -> None:
+        for review in reviews:
+            self.append(review)
+
+    def clear(self) -> None:
+        for column in self.__slots__:
+            del getattr(self, column)[:]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def rows(self) -> Iterator[tuple]:
+        """Отзывы кортежами в порядке REVIEW_FIELDS."""
+        for name, icon_href, date, text, stars, answer in zip(
+            self.names, self.icon_hrefs, self.dates, self.texts, self.stars, self.answers
+        ):
+            yield name, icon_href, None if math.isnan(date) else date, text, stars, answer
+
+    def __iter__(self) -> Iterator[dict]:
+        for row in self.rows():
+            yield dict(zip(REVIEW_FIELDS, row))
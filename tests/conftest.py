@@ -0,0 +1,23 @@
+"""
+Корень репозитория — это сам пакет yandex_reviews_parser. Если пакет не
+установлен, регистрируем его под этим именем прямо из рабочей копии.
+"""
+
+import importlib.util
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+if "yandex_reviews_parser" not in sys.modules:
+    try:
+        import yandex_reviews_parser  # noqa: F401
+    except ImportError:
+        spec = importlib.util.spec_from_file_location(
+            "yandex_reviews_parser",
+            os.path.join(ROOT, "__init__.py"),
+            submodule_search_locations=[ROOT],
+        )
+        module = importlib.util.module_from_spec(spec)
+        sys.modules["yandex_reviews_parser"] = module
+        spec.loader.exec_module(module)
@@ -0,0 +1,149 @@
+"""
+ReviewsApi против локального сервера, который отдаёт записанные ответы
+fetchReviews и, как Яндекс, проверяет подпись s и csrfToken.
+"""
+
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import pytest
+import requests
+
+from yandex_reviews_parser.api import ReviewsApi
+from yandex_reviews_parser.helpers import ParserHelper
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+TOKEN = "csrf-1"
+
+
+def recorded_page(page: int) -> bytes:
+    with open(os.path.join(FIXTURES, f"fetch_reviews_page{page}.json"), "rb") as f:
+        return f.read()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # что отвечать: "ok", "token_loop" (вечно просит новый csrfToken), "throttle",
+    # "not_object" (валидный JSON, но не объект)
+    mode = "ok"
+    requests_seen: list = []
+
+    def do_GET(self):
+        items = parse_qsl(urlsplit(self.path).query, keep_blank_values=True)
+        query = dict(items)
+        self.requests_seen.append(query)
+        rest = [(k, v) for k, v in items if k != "s"]
+        if query.get("s") != ReviewsApi.sign(urlencode(rest)):
+            return self.reply(403, b'{"error": "bad signature"}')
+        if self.mode == "throttle":
+            return self.reply(429, b"{}")
+        if self.mode == "not_object":
+            return self.reply(200, b'["captcha"]')
+        if self.mode == "token_loop" or query.get("csrfToken") != TOKEN:
+            return self.reply(200, json.dumps({"csrfToken": TOKEN}).encode())
+        page = int(query.get("page", 1))
+        if page > 3:
+            return self.reply(200, b'{"data": {"reviews": []}}')
+        self.reply(200, recorded_page(page))
+
+    def reply(self, status: int, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub():
+    StubHandler.mode = "ok"
+    StubHandler.requests_seen = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield StubHandler, f"http://127.0.0.1:{server.server_address[1]}/maps/api/business/fetchReviews"
+    server.shutdown()
+
+
+def captured_fetch(base: str) -> dict:
+    """Запрос fetchReviews, как его ловит Parser: первая страница с подписью."""
+    items = [
+        ("ajax", "1"),
+        ("businessId", "1040226791"),
+        ("csrfToken", "stale"),
+        ("locale", "ru_RU"),
+        ("page", "1"),
+        ("pageSize", "50"),
+        ("ranking", "by_relevance_org"),
+        ("reqId", "1760000000000-abc"),
+    ]
+    items.append(("s", ReviewsApi.sign(urlencode(items))))
+    return {"url": f"{base}?{urlencode(items)}", "headers": {"Accept": "application/json"}}
+
+
+def test_pages_through_recorded_responses(stub):
+    handler, base = stub
+    api = ReviewsApi(captured_fetch(base))
+    reviews = api.get_reviews(sort="newest")
+    api.close()
+
+    assert len(reviews) == 117
+    assert reviews[0]["name"] == "Автор 0"
+    assert reviews[0]["icon_href"].endswith("/0/islands-68")
+    assert reviews[0]["answer"] == "Спасибо 0"
+    assert reviews[1]["answer"] is None
+    assert reviews[116]["stars"] == 1 + 116 % 5
+    # дата публикации, а не правки — как datePublished в DOM
+    assert reviews[10]["date"] == ParserHelper.form_date(
+        json.loads(recorded_page(1))["data"]["reviews"][10]["createdTime"]
+    )
+    # каждая страница подписана заново и прошла проверку
+    pages = [q["page"] for q in handler.requests_seen if q.get("csrfToken") == TOKEN]
+    assert pages == ["1", "2", "3"]
+    assert all(q["ranking"] == "by_time" for q in handler.requests_seen)
+    assert api.statuses[403] == 0
+
+
+def test_limit(stub):
+    _, base = stub
+    api = ReviewsApi(captured_fetch(base))
+    assert len(api.get_reviews(limit=60)) == 60
+
+
+def test_endless_token_refresh_raises(stub):
+    handler, base = stub
+    handler.mode = "token_loop"
+    api = ReviewsApi(captured_fetch(base))
+    with pytest.raises(ValueError):
+        api.get_reviews()
+
+
+def test_throttling_is_recorded(stub):
+    handler, base = stub
+    handler.mode = "throttle"
+    api = ReviewsApi(captured_fetch(base))
+    with pytest.raises(requests.HTTPError):
+        api.get_reviews()
+    assert api.statuses[429] == 1
+
+
+def test_unknown_signature_refuses_other_pages(stub):
+    _, base = stub
+    fetch = captured_fetch(base)
+    fetch["url"] = fetch["url"].rsplit("&s=", 1)[0] + "&s=12345"
+    api = ReviewsApi(fetch)
+    assert api._page_url(1, "default") == fetch["url"]
+    with pytest.raises(ValueError):
+        api._page_url(2, "default")
+
+
+def test_non_object_body_is_value_error(stub):
+    handler, base = stub
+    handler.mode = "not_object"
+    api = ReviewsApi(captured_fetch(base))
+    with pytest.raises(ValueError):
+        api.get_reviews()
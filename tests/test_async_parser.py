@@ -0,0 +1,100 @@
+"""
+Команды CDP ограничены по времени, а ошибки разбора в AsyncYandexParser.parse
+приходят как {"error": ...}, не исключением.
+"""
+
+import asyncio
+
+import pytest
+
+from yandex_reviews_parser.async_parser import AsyncPage, AsyncYandexParser, CdpConnection, CdpError
+from yandex_reviews_parser.metrics import Metrics
+from yandex_reviews_parser.timings import TimingProfile
+
+
+class SilentWebSocket:
+    """Браузер, который принимает команды и никогда не отвечает."""
+
+    def __init__(self):
+        self.sent: list = []
+        self._closed = asyncio.Event()
+
+    async def send(self, message: str) -> None:
+        self.sent.append(message)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await self._closed.wait()
+        raise StopAsyncIteration
+
+    async def close(self) -> None:
+        self._closed.set()
+
+
+class FakeBrowser:
+    def __init__(self, connection):
+        self.connection = connection
+
+
+def test_send_times_out():
+    async def scenario():
+        connection = CdpConnection(SilentWebSocket())
+        try:
+            with pytest.raises(CdpError):
+                await connection.send("Browser.getVersion", timeout=0.05)
+        finally:
+            await connection.close()
+
+    asyncio.run(scenario())
+
+
+def test_evaluate_is_bounded_by_command_timeout():
+    async def scenario():
+        connection = CdpConnection(SilentWebSocket())
+        page = AsyncPage(
+            FakeBrowser(connection), "target", "session",
+            TimingProfile(command_timeout=0.05), Metrics(),
+        )
+        try:
+            with pytest.raises(CdpError):
+                await asyncio.wait_for(page.evaluate("return 1"), 2)
+        finally:
+            await connection.close()
+
+    asyncio.run(scenario())
+
+
+class BrokenDatePage:
+    """Вкладка, на которой разбор даты отзыва падает с ValueError."""
+
+    async def goto(self, url: str) -> bool:
+        return True
+
+    async def is_valid_page(self) -> bool:
+        return True
+
+    async def get_company_info(self) -> dict:
+        return {"name": "Компания"}
+
+    async def iter_reviews(self, sort, limit, since):
+        raise ValueError("time data 'вчера' does not match format")
+        yield  # pragma: no cover
+
+    async def close(self) -> bool:
+        return True
+
+
+def test_parse_returns_error_instead_of_raising():
+    async def scenario():
+        parser = AsyncYandexParser(concurrency=1)
+
+        async def open_page(metrics, with_answers=True):
+            return BrokenDatePage()
+
+        parser._AsyncYandexParser__open_page = open_page
+        return await parser.parse(1040226791)
+
+    result = asyncio.run(scenario())
+    assert result["error"].startswith("ValueError")
@@ -0,0 +1,42 @@
+"""
+ResultCache: чтение не пишет в SQLite, а вытеснение всё равно идёт
+по времени последнего чтения.
+"""
+
+from yandex_reviews_parser.cache import ResultCache
+
+
+def test_get_does_not_write(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"))
+    cache.set("a", "company", {"name": "A"})
+    changes = cache._conn.total_changes
+    for _ in range(100):
+        assert cache.get("a") == ({"name": "A"}, True)
+    assert cache._conn.total_changes == changes
+    cache.close()
+
+
+def test_lru_uses_reads_kept_in_memory(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache.sqlite"), max_entries=2)
+    cache.set("old", "company", 1)
+    cache.set("new", "company", 2)
+    cache.get("old")
+    cache.set("third", "company", 3)
+    assert cache.get("old") is not None
+    assert cache.get("new") is None
+    cache.close()
+
+
+def test_reads_survive_reopen(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    cache = ResultCache(path, max_entries=2)
+    cache.set("old", "company", 1)
+    cache.set("new", "company", 2)
+    cache.get("old")
+    cache.close()
+
+    cache = ResultCache(path, max_entries=2)
+    cache.set("third", "company", 3)
+    assert cache.get("old") is not None
+    assert cache.get("new") is None
+    cache.close()
@@ -0,0 +1,64 @@
+"""
+Чекпоинт сортировки удаляется только проходом, который дочитал её до
+конца: разбор компании, limit и другая сортировка его не трогают.
+"""
+
+from yandex_reviews_parser.checkpoint import CheckpointStore
+from yandex_reviews_parser.pool import DriverPool
+from yandex_reviews_parser.utils import YandexParser
+
+from test_pool import RecordingDriver
+
+ID = 1040226791
+
+
+def make_parser(tmp_path, total: int = 120) -> YandexParser:
+    parser = YandexParser(checkpoint_dir=str(tmp_path))
+    driver = RecordingDriver(total=total)
+    parser.pool = DriverPool(lambda: driver, size=1)
+    return parser
+
+
+def save_checkpoint(store: CheckpointStore, sort, position: int = 1) -> None:
+    checkpoint = store.opener(ID, resume=False)(sort)
+    checkpoint.add([{"name": "Автор", "date": 1.0, "text": "", "stars": 5}], position)
+    checkpoint.flush()
+
+
+def test_company_and_limited_passes_keep_checkpoint(tmp_path):
+    parser = make_parser(tmp_path)
+    save_checkpoint(parser.checkpoints, None)
+
+    assert "error" not in parser.parse(ID, type_parse="company")
+    assert parser.checkpoints.get(ID, None) is not None
+
+    result = parser.parse(ID, type_parse="reviews", sort=None, limit=5, resume=True)
+    assert len(result["company_reviews"]) == 5
+    assert parser.checkpoints.get(ID, None) is not None
+
+
+def test_full_pass_clears_only_its_sort(tmp_path):
+    parser = make_parser(tmp_path)
+    save_checkpoint(parser.checkpoints, None)
+    save_checkpoint(parser.checkpoints, "negative")
+
+    result = parser.parse(ID, type_parse="reviews", sort=None, resume=True)
+    assert "error" not in result
+    assert parser.checkpoints.get(ID, None) is None
+    assert parser.checkpoints.get(ID, "negative") is not None
+
+
+def test_limited_pass_without_resume_keeps_longer_checkpoint(tmp_path):
+    parser = make_parser(tmp_path)
+    save_checkpoint(parser.checkpoints, None, position=100)
+
+    result = parser.parse(ID, type_parse="reviews", sort=None, limit=5)
+    assert len(result["company_reviews"]) == 5
+    meta = parser.checkpoints.get(ID, None)
+    assert meta is not None and meta["position"] == 100
+
+
+def test_last_batch_before_limit_is_checkpointed(tmp_path):
+    parser = make_parser(tmp_path)
+    parser.parse(ID, type_parse="reviews", sort=None, limit=5)
+    assert parser.checkpoints.get(ID, None)["collected"] == 5
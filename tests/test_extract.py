@@ -0,0 +1,76 @@
+"""
+JS-извлечение (EXTRACT_REVIEWS_JS) должно давать те же Review, что и
+поэлементный путь через find_element.
+"""
+
+import pytest
+from selenium.common.exceptions import JavascriptException, WebDriverException
+
+from yandex_reviews_parser.bench import FakeDriver, serve_fixtures
+from yandex_reviews_parser.parsers import Parser
+from yandex_reviews_parser.scripts import EXTRACT_REVIEWS_JS
+from yandex_reviews_parser.timings import TimingProfile
+
+
+def collect(driver, js_extract: bool) -> list:
+    parser = Parser(driver, timings=TimingProfile.fast())
+    parser._js_extract = js_extract
+    return parser.parse_reviews()["company_reviews"]
+
+
+def test_js_matches_elements_on_fake_driver():
+    js = collect(FakeDriver(250), js_extract=True)
+    elements = collect(FakeDriver(250), js_extract=False)
+    assert len(js) == 250
+    assert js == elements
+
+
+class FailingExtractDriver(FakeDriver):
+    """EXTRACT_REVIEWS_JS падает с заданным исключением."""
+
+    def __init__(self, total: int, error: Exception):
+        super().__init__(total)
+        self.error = error
+
+    def execute_script(self, script: str, *args):
+        if script == EXTRACT_REVIEWS_JS:
+            raise self.error
+        return super().execute_script(script, *args)
+
+
+def test_script_error_falls_back_to_elements():
+    driver = FailingExtractDriver(120, JavascriptException("boom"))
+    assert len(collect(driver, js_extract=True)) == 120
+
+
+def test_webdriver_error_is_not_swallowed():
+    driver = FailingExtractDriver(120, WebDriverException("chrome not reachable"))
+    with pytest.raises(WebDriverException):
+        collect(driver, js_extract=True)
+
+
+@pytest.fixture(scope="module")
+def chrome(tmp_path_factory):
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    try:
+        driver = webdriver.Chrome(options=options)
+    except Exception as e:
+        pytest.skip(f"Chrome недоступен: {e}")
+    server = serve_fixtures([300], str(tmp_path_factory.mktemp("fixtures")))
+    yield driver, f"http://127.0.0.1:{server.server_address[1]}/reviews_300.html"
+    server.shutdown()
+    driver.quit()
+
+
+def test_js_matches_elements_on_fixture_page(chrome):
+    driver, url = chrome
+    driver.get(url)
+    js = collect(driver, js_extract=True)
+    driver.get(url)
+    elements = collect(driver, js_extract=False)
+    assert len(js) == 300
+    assert js == elements
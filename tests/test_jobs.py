@@ -0,0 +1,31 @@
+"""
+Ошибка разбора страницы доходит до JobQueue как текст исключения,
+а не теряется в print.
+"""
+
+from yandex_reviews_parser.jobs import JobQueue, QueueWorker
+from yandex_reviews_parser.scripts import COUNT_REVIEWS_JS
+
+from test_pool import RecordingDriver, make_parser
+
+
+class BrokenCountDriver(RecordingDriver):
+    def execute_script(self, script: str, *args):
+        if script == COUNT_REVIEWS_JS:
+            raise RuntimeError("разметка списка отзывов поменялась")
+        return super().execute_script(script, *args)
+
+
+def test_parse_error_reaches_the_queue(tmp_path):
+    parser = make_parser(BrokenCountDriver())
+    result = parser.parse(1040226791, type_parse="reviews", sort=None)
+    assert result["error"].startswith("RuntimeError: разметка")
+
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), max_attempts=1)
+    queue.add([1040226791], {"type_parse": "reviews", "sort": None})
+    worker = QueueWorker(queue, parser, sink=lambda job, result: None)
+    (job,) = queue.lease(worker.worker_id)
+    assert worker.process(job) is False
+    ((_, _, error),) = queue.failed()
+    assert error.startswith("RuntimeError: разметка")
+    queue.close()
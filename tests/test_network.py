@@ -0,0 +1,50 @@
+"""
+Тело ответа fetchReviews забирается только после Network.loadingFinished.
+"""
+
+import json
+
+from yandex_reviews_parser.bench import FakeDriver, synthetic_perf_log
+from yandex_reviews_parser.parsers import Parser
+from yandex_reviews_parser.timings import TimingProfile
+
+BODY = {"data": {"reviews": [{"reviewId": "r0"}]}}
+
+
+class SlowBodyDriver(FakeDriver):
+    """loadingFinished приходит только на finish_after-м чтении логов."""
+
+    def __init__(self, finish_after: int):
+        super().__init__(10)
+        *self.perf_log, self.finished_entry = synthetic_perf_log(20)
+        self.finish_after = finish_after
+        self.log_reads = 0
+        self.body_requested_at: list = []
+
+    def get_log(self, log_type: str) -> list:
+        self.log_reads += 1
+        if self.log_reads == self.finish_after:
+            self.perf_log.append(self.finished_entry)
+        return super().get_log(log_type)
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        if cmd == "Network.getResponseBody":
+            self.body_requested_at.append(self.log_reads)
+            return {"body": json.dumps(BODY), "base64Encoded": False}
+        return {}
+
+
+def test_body_is_read_after_loading_finished():
+    driver = SlowBodyDriver(finish_after=4)
+    parser = Parser(driver, timings=TimingProfile.fast())
+    assert parser.get_business_id_from_network(timeout=1) == "1040226791"
+    assert parser.get_fetch_json(timeout=2) == BODY
+    assert driver.body_requested_at == [4]
+
+
+def test_no_body_without_loading_finished():
+    driver = SlowBodyDriver(finish_after=10 ** 6)
+    parser = Parser(driver, timings=TimingProfile.fast())
+    parser.get_business_id_from_network(timeout=1)
+    assert parser.get_fetch_json(timeout=0.2) is None
+    assert driver.body_requested_at == []
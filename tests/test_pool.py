@@ -0,0 +1,102 @@
+"""
+Драйвер из пула возвращается и при падении открытия страницы, а между
+компаниями чистятся cookies и хранилища всех origin'ов Яндекса.
+"""
+
+import threading
+
+from selenium.common.exceptions import WebDriverException
+
+from yandex_reviews_parser.bench import FakeDriver
+from yandex_reviews_parser.pool import DriverPool
+from yandex_reviews_parser.utils import YandexParser
+
+
+class RecordingDriver(FakeDriver):
+    """FakeDriver, который запоминает CDP-команды и может падать на get()."""
+
+    def __init__(self, fail_get: bool = False, total: int = 10):
+        super().__init__(total)
+        self.fail_get = fail_get
+        self.cdp: list = []
+        self.browser_pid = None
+
+    def execute_cdp_cmd(self, cmd: str, params: dict) -> dict:
+        self.cdp.append((cmd, params))
+        return {}
+
+    def get(self, url: str) -> None:
+        if self.fail_get and url.startswith("https://"):
+            raise WebDriverException("net::ERR_CONNECTION_RESET")
+
+    def execute_script(self, script: str, *args):
+        if script == "return location.origin":
+            return "https://yandex.ru"
+        return super().execute_script(script, *args)
+
+    def quit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def make_parser(driver) -> YandexParser:
+    parser = YandexParser()
+    parser.pool = DriverPool(lambda: driver, size=1)
+    return parser
+
+
+def test_failed_navigation_returns_driver_to_pool():
+    driver = RecordingDriver(fail_get=True)
+    parser = make_parser(driver)
+
+    done = threading.Event()
+    results: list = []
+
+    def twice():
+        for _ in range(2):
+            results.append(parser.parse(1, type_parse="company"))
+        done.set()
+
+    threading.Thread(target=twice, daemon=True).start()
+    assert done.wait(5), "второй parse() ждёт драйвер, который не вернули в пул"
+    assert parser.pool.acquire(timeout=1) is driver
+    # ошибка навигации — это результат, а не исключение из parse()
+    assert len(results) == 2
+    assert all(r["error"].startswith("WebDriverException:") for r in results)
+
+
+def test_failed_driver_start_is_an_error_result():
+    def factory():
+        raise WebDriverException("session not created")
+
+    parser = YandexParser()
+    parser.pool = DriverPool(factory, size=1)
+    assert parser.parse(1, type_parse="company")["error"].startswith("WebDriverException:")
+
+
+def test_reset_clears_cookies_and_storage_via_cdp():
+    driver = RecordingDriver()
+    DriverPool.reset(driver)
+    commands = [cmd for cmd, _ in driver.cdp]
+    assert "Network.clearBrowserCookies" in commands
+    origins = {p["origin"] for cmd, p in driver.cdp if cmd == "Storage.clearDataForOrigin"}
+    assert "https://yandex.ru" in origins
+    assert set(DriverPool.RESET_ORIGINS) <= origins
+
+
+def test_discarded_driver_wakes_waiting_acquire():
+    drivers = iter([RecordingDriver(), RecordingDriver()])
+    pool = DriverPool(lambda: next(drivers), size=1)
+    first = pool.acquire()
+
+    acquired: list = []
+    waiter = threading.Thread(target=lambda: acquired.append(pool.acquire()), daemon=True)
+    waiter.start()
+    waiter.join(0.2)
+    assert waiter.is_alive()
+
+    pool.release(first, broken=True)
+    waiter.join(5)
+    assert acquired and acquired[0] is not first
@@ -0,0 +1,99 @@
+"""
+Конец списка отзывов при скролле: поздние ответы fetchReviews, отправленные
+до скролла, не должны обрывать сбор, пока следующая пачка ещё рисуется.
+"""
+
+import json
+import time
+
+from yandex_reviews_parser.bench import PAGE_STEP, FakeDriver
+from yandex_reviews_parser.parsers import Parser
+from yandex_reviews_parser.scripts import SCROLL_LAST_REVIEW_JS
+from yandex_reviews_parser.timings import TimingProfile
+
+URL = "https://yandex.ru/maps/api/business/fetchReviews?businessId=1040226791&page={}"
+
+
+def log_entry(method: str, **params) -> dict:
+    message = {"message": {"method": method, "params": params}}
+    return {"message": json.dumps(message), "level": "INFO"}
+
+
+class SlowRenderDriver(FakeDriver):
+    """
+    После скролла страница отправляет fetchReviews через request_delay,
+    ответ приходит через answer_delay, пачка рисуется через render_delay.
+    Вместе с каждой пачкой уходит предзагрузка, ответ на которую приходит
+    уже после следующего скролла.
+    """
+
+    request_delay = 0.4
+    answer_delay = 0.6
+    render_delay = 0.8
+    stale_delay = 0.05
+
+    def __init__(self, total: int):
+        super().__init__(total, report_total=False)
+        self.scheduled: list = []
+        self.batches = 0
+
+    def at(self, delay: float, action) -> None:
+        self.scheduled.append((time.monotonic() + delay, action))
+
+    def tick(self) -> None:
+        now = time.monotonic()
+        due = [action for when, action in self.scheduled if when <= now]
+        self.scheduled = [(when, action) for when, action in self.scheduled if when > now]
+        for action in due:
+            action()
+
+    def log(self, method: str, **params):
+        return lambda: self.perf_log.append(log_entry(method, **params))
+
+    def render(self):
+        self.loaded = min(self.total, self.loaded + PAGE_STEP)
+        # предзагрузка: запрос уже в логах, ответ — после следующего скролла
+        self.perf_log.append(log_entry(
+            "Network.requestWillBeSent", requestId=f"pre.{self.batches}",
+            request={"url": URL.format(f"pre{self.batches}"), "headers": {}},
+        ))
+
+    def get_log(self, log_type: str) -> list:
+        self.tick()
+        return super().get_log(log_type)
+
+    def execute_script(self, script: str, *args):
+        self.tick()
+        if script != SCROLL_LAST_REVIEW_JS:
+            return super().execute_script(script, *args)
+        count = self.loaded
+        if count and count <= args[1] and not self.scheduled:
+            self.batches += 1
+            url = URL.format(self.batches)
+            request_id = f"fr.{self.batches}"
+            if self.batches > 1:
+                self.at(self.stale_delay, self.log(
+                    "Network.responseReceived", requestId=f"pre.{self.batches - 1}",
+                    response={"url": URL.format(f"pre{self.batches - 1}"), "status": 200},
+                ))
+            self.at(self.request_delay, self.log(
+                "Network.requestWillBeSent", requestId=request_id,
+                request={"url": url, "headers": {}},
+            ))
+            self.at(self.answer_delay, self.log(
+                "Network.responseReceived", requestId=request_id,
+                response={"url": url, "status": 200},
+            ))
+            if self.loaded < self.total:
+                self.at(self.render_delay, self.render)
+        return count
+
+
+def test_stale_responses_do_not_end_the_list():
+    driver = SlowRenderDriver(300)
+    timings = TimingProfile(
+        render_grace=0.5, scroll_timeout=5, poll=0.02, scroll_poll_min=0.02, scroll_poll_max=0.05
+    )
+    parser = Parser(driver, timings=timings)
+    reviews = parser.parse_reviews()["company_reviews"]
+    assert len(reviews) == 300
@@ -0,0 +1,46 @@
+"""
+Два StateStore на одном файле (два воркера очереди) не затирают отметки
+друг друга.
+"""
+
+import threading
+
+from yandex_reviews_parser.state import StateStore
+
+
+def review(date: float) -> dict:
+    return {"name": "Автор", "date": date}
+
+
+def test_two_instances_merge_marks(tmp_path):
+    path = str(tmp_path / "state.json")
+    first = StateStore(path)
+    second = StateStore(path)
+
+    first.update(1, [review(100.0)])
+    second.update(2, [review(200.0)])
+    # second не видел свежей отметки first для 2, но и старой не запишет
+    first.update(2, [review(150.0)])
+
+    merged = StateStore(path)
+    assert merged.get_since(1) == 100.0
+    assert merged.get_since(2) == 200.0
+    assert first.get_since(2) == 200.0
+
+
+def test_concurrent_writers_keep_every_mark(tmp_path):
+    path = str(tmp_path / "state.json")
+    stores = [StateStore(path), StateStore(path)]
+
+    def write(store: StateStore, offset: int) -> None:
+        for i in range(offset, 100, 2):
+            store.update(i, [review(float(i))])
+
+    threads = [threading.Thread(target=write, args=(s, n)) for n, s in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    merged = StateStore(path)
+    assert [merged.get_since(i) for i in range(100)] == [float(i) for i in range(100)]
@@ -0,0 +1,54 @@
+"""
+Отзывы, прошедшие через ReviewBatch и писателей, совпадают с тем,
+что отдаёт parse(): звёзды остаются целыми, date=None — None.
+"""
+
+import csv
+import gzip
+import json
+
+import pytest
+
+from yandex_reviews_parser.storage import ReviewBatch
+from yandex_reviews_parser.writers import ReviewWriter, open_writer
+
+REVIEWS = [
+    {
+        "name": "Автор",
+        "icon_href": None,
+        "date": 1700000000.0,
+        "text": "Отлично",
+        "stars": 5,
+        "answer": None,
+    },
+    {"name": "Без даты", "icon_href": None, "date": None, "text": "", "stars": 0, "answer": "Спасибо"},
+]
+
+
+def test_batch_round_trip():
+    assert list(ReviewBatch(REVIEWS)) == REVIEWS
+    assert all(isinstance(r["stars"], int) for r in ReviewBatch(REVIEWS))
+
+
+def test_jsonl_matches_parse_output(tmp_path):
+    path = tmp_path / "reviews.jsonl.gz"
+    with open_writer(str(path)) as writer:
+        writer.write_batch(ReviewBatch(REVIEWS), business_id=1)
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert [{k: v for k, v in line.items() if k != "business_id"} for line in lines] == REVIEWS
+    # 5 == 5.0 в Python, поэтому тип проверяем отдельно
+    assert all(type(line["stars"]) is int for line in lines)
+
+
+def test_csv_writes_integer_stars(tmp_path):
+    path = tmp_path / "reviews.csv"
+    with open_writer(str(path)) as writer:
+        writer.write_reviews(REVIEWS)
+    with open(path, encoding="utf-8", newline="") as f:
+        assert [row["stars"] for row in csv.DictReader(f)] == ["5", "0"]
+
+
+def test_writer_must_implement_write_rows(tmp_path):
+    with pytest.raises(TypeError):
+        ReviewWriter(str(tmp_path / "x.txt"))
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class TimingProfile:
+    """
+    Таймауты и частота опроса для ожиданий в Parser (все значения в секундах).
+
+    Таймауты — это верхняя граница: как только условие выполнилось
+    (появились отзывы, пришёл ответ fetchReviews и т.д.), ждать перестаём.
+    """
+    # страница компании: заголовок или первые отзывы
+    page_timeout: float = 10
+    # появление первых отзывов в списке
+    reviews_timeout: float = 5
+    # кнопка и пункты попапа сортировки
+    sort_timeout: float = 10
+    # перерисовка списка после выбора сортировки
+    rerender_timeout: float = 3
+    # подгрузка следующей пачки после скролла; не дождались — список кончился
+    scroll_timeout: float = 5
+    # fetchReviews после скролла ответил, а новых отзывов в DOM нет — через
+    # столько считаем список законченным, не дожидаясь scroll_timeout
+    render_grace: float = 0.5
+    # ответ fetchReviews в сетевых логах
+    network_timeout: float = 10
+    # один вызов в браузер (CDP-команда, выполнение скрипта) в AsyncYandexParser
+    command_timeout: float = 15
+    # базовая частота опроса условий
+    poll: float = 0.1
+    # границы адаптивной частоты опроса при скролле
+    scroll_poll_min: float = 0.05
+    scroll_poll_max: float = 0.5
+
+    @classmethod
+    def fast(cls) -> "TimingProfile":
+        """Короткие таймауты для быстрой сети / локальных стендов."""
+        return cls(
+            page_timeout=5,
+            reviews_timeout=2,
+            sort_timeout=5,
+            rerender_timeout=1.5,
+            scroll_timeout=2.5,
+            render_grace=0.3,
+            network_timeout=5,
+            command_timeout=8,
+            poll=0.05,
+        )
+
+    @classmethod
+    def patient(cls) -> "TimingProfile":
+        """Длинные таймауты для медленной сети или прокси."""
+        return cls(
+            page_timeout=30,
+            reviews_timeout=15,
+            sort_timeout=20,
+            rerender_timeout=6,
+            scroll_timeout=12,
+            render_grace=1.5,
+            network_timeout=30,
+            command_timeout=45,
+            poll=0.25,
+            scroll_poll_max=1.0,
+        )
+
+
+class AdaptivePoll:
+    """
+    Частота опроса при скролле, подстраивающаяся под реальное время подгрузки:
+    опрашиваем примерно 4 раза за среднее время появления новой пачки.
+    """
+
+    def __init__(self, timings: TimingProfile):
+        self.timings = timings
+        self.avg: float | None = None
+
+    @property
+    def interval(self) -> float:
+        if self.avg is None:
+            return self.timings.poll
+        return min(
+            self.timings.scroll_poll_max,
+            max(self.timings.scroll_poll_min, self.avg / 4),
+        )
+
+    def observe(self, elapsed: float) -> None:
+        """Учесть, сколько заняла очередная подгрузка (скользящее среднее)."""
+        self.avg = elapsed if self.avg is None else 0.7 * self.avg + 0.3 * elapsed
@@ -1,9 +1,21 @@
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
 
-import undetected_chromedriver
-from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+from yandex_reviews_parser.cache import ResultCache
+from yandex_reviews_parser.checkpoint import CheckpointStore
+from yandex_reviews_parser.metrics import InstrumentedDriver, Metrics, unwrap_driver
+from yandex_reviews_parser.pool import DriverPool
+from yandex_reviews_parser.profiles import BrowserProfile
+from yandex_reviews_parser.rate import OK, OUTCOME_ERRORS, RateController, RateSlot
+from yandex_reviews_parser.resolver import CompanyIdResolver
+from yandex_reviews_parser.state import StateStore
+from yandex_reviews_parser.storage import ReviewBatch
+from yandex_reviews_parser.timings import TimingProfile
 
-from yandex_reviews_parser.parsers import Parser
+if TYPE_CHECKING:
+    from yandex_reviews_parser.parsers import Parser
+    from yandex_reviews_parser.writers import ReviewWriter
 
 
 class YandexParser:
@@ -11,25 +23,104 @@ class YandexParser:
         self,
         driver_executable_path: str | None = None,
         browser_executable_path: str | None = None,
+        pool_size: int = 0,
+        max_pages_per_driver: int = 50,
+        max_rss_mb: float | None = None,
+        state_path: str | None = None,
+        timings: TimingProfile | None = None,
+        cache: ResultCache | None = None,
+        metrics_sink: Callable[[dict, dict], None] | None = None,
+        profile: BrowserProfile | None = None,
+        prune_dom: bool = False,
+        rate: RateController | None = None,
+        checkpoint_dir: str | None = None,
     ):
         """
         Инициализация парсера БЕЗ указания ya_id.
         ID передаём уже в метод parse().
+
+        pool_size            — 0: браузер на каждый вызов (старое поведение),
+                               >0: пул из стольких долгоживущих браузеров
+        max_pages_per_driver — после скольких компаний браузер из пула пересоздаётся
+        max_rss_mb           — порог памяти браузера для пересоздания (None = не следим)
+        state_path           — JSON-файл с отметками последнего собранного отзыва
+                               по компаниям (для incremental=True)
+        timings              — таймауты ожиданий (TimingProfile, .fast(), .patient())
+        cache                — ResultCache перед parse() и get_company_id_from_url()
+        metrics_sink         — куда отдавать метрики каждого прохода:
+                               sink(labels, snapshot), см. metrics.logging_sink,
+                               metrics.PrometheusSink
+        profile              — настройки Chrome: BrowserProfile() — полный браузер,
+                               BrowserProfile.lean() — без картинок/тайлов/аналитики
+        prune_dom            — очищать уже извлечённые карточки отзывов в DOM,
+                               чтобы память вкладки не росла (для компаний
+                               с десятками тысяч отзывов)
+        rate                 — общий RateController: сколько компаний парсить
+                               одновременно и с какой паузой, подстраивается
+                               под капчу и 429/403 от fetchReviews
+        checkpoint_dir       — каталог чекпоинтов: parse() по ходу скролла
+                               сохраняет собранные отзывы, parse(resume=True)
+                               продолжает с них после падения
         """
         self.driver_executable_path = driver_executable_path
         self.browser_executable_path = browser_executable_path
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_rss_mb = max_rss_mb
+        self.timings = timings or TimingProfile()
+        self.cache = cache
+        self.metrics_sink = metrics_sink
+        self.profile = profile or BrowserProfile()
+        self.prune_dom = prune_dom
+        self.rate = rate
+        # URL -> businessId: из URL, по HTTP, и только потом браузером
+        self.resolver = CompanyIdResolver(browser=self.__browser_company_ids, cache=cache)
+
+        self.state: StateStore | None = StateStore(state_path) if state_path else None
+        self.checkpoints: CheckpointStore | None = (
+            CheckpointStore(checkpoint_dir) if checkpoint_dir else None
+        )
+
+        self.pool: DriverPool | None = None
+        if pool_size > 0:
+            self.pool = DriverPool(
+                self.__create_driver,
+                size=pool_size,
+                max_pages=max_pages_per_driver,
+                max_rss_mb=max_rss_mb,
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Закрыть браузеры пула."""
+        self.resolver.close()
+        if self.pool:
+            self.pool.close()
 
     def __create_driver(self):
         """
         Создаём Chrome с включёнными performance-логами,
         как нужно для чтения fetchReviews (аналогично code_3).
+        Selenium и undetected_chromedriver импортируются только здесь,
+        чтобы import пакета не тянул браузерные зависимости.
         """
+        import undetected_chromedriver
+        from selenium.webdriver.common.desired_capabilities import DesiredCapabilities
+
         opts = undetected_chromedriver.ChromeOptions()
         opts.add_argument("--no-sandbox")
         opts.add_argument("--disable-dev-shm-usage")
         opts.add_argument("headless")
         opts.add_argument("--disable-gpu")
-        opts.add_argument("--window-size=1920,1080")
+        opts.add_argument(f"--window-size={self.profile.window_size}")
+        for arg in self.profile.extra_args:
+            opts.add_argument(arg)
+        if self.profile.prefs:
+            opts.add_experimental_option("prefs", self.profile.prefs)
 
         caps = DesiredCapabilities.CHROME.copy()
         caps["goog:loggingPrefs"] = {"performance": "ALL"}
@@ -41,40 +132,287 @@ class YandexParser:
             browser_executable_path=self.browser_executable_path,
             desired_capabilities=caps,
         )
+        self.profile.apply(driver)
         return driver
 
-    def __open_page(self, id_yandex: int) -> Parser:
+    def __acquire_driver(self):
+        """
+        Драйвер из пула, либо новый браузер, если пул выключен.
+        """
+        if self.pool:
+            return self.pool.acquire()
+        return self.__create_driver()
+
+    def __release_driver(self, driver) -> None:
+        """
+        Вернуть драйвер в пул, либо закрыть браузер, если пул выключен.
+        """
+        if self.pool:
+            self.pool.release(driver, broken=not DriverPool.is_alive(driver))
+            return
+        try:
+            driver.close()
+        except Exception:
+            pass
+        driver.quit()
+
+    def __open_page(
+        self,
+        id_yandex: int,
+        driver=None,
+        with_answers: bool = True,
+        resume: bool | None = None,
+    ) -> "Parser":
         """
         Открываем страницу отзывов по конкретному ID.
+        driver — уже арендованный драйвер (parse_many), иначе берём свой;
+                 если открыть страницу не удалось, свой драйвер сразу
+                 возвращается, освобождать его должен только вызывающий
+                 после успешного открытия.
+        Драйвер оборачивается в InstrumentedDriver, метрики — в parser.metrics.
+        resume — None: без чекпоинтов, False: писать свой, сохранённый
+                 затирается, только когда проход ушёл дальше него,
+                 True: продолжить с сохранённого (нужен checkpoint_dir)
         """
-        driver = self.__create_driver()
-        url: str = f"https://yandex.ru/maps/org/{id_yandex}/reviews/"
-        parser = Parser(driver)
-        driver.get(url)
+        from yandex_reviews_parser.parsers import Parser
+
+        metrics = Metrics()
+        own_driver = driver is None
+        if own_driver:
+            with metrics.span("driver_acquire"):
+                driver = self.__acquire_driver()
+        try:
+            url: str = f"https://yandex.ru/maps/org/{id_yandex}/reviews/"
+            parser = Parser(
+                InstrumentedDriver(driver, metrics),
+                timings=self.timings,
+                metrics=metrics,
+                prune_dom=self.prune_dom,
+                with_answers=with_answers,
+                checkpoint=(
+                    self.checkpoints.opener(id_yandex, resume)
+                    if self.checkpoints and resume is not None
+                    else None
+                ),
+            )
+            with metrics.span("page_open"):
+                parser.driver.get(url)
+        except BaseException:
+            if own_driver:
+                self.__release_driver(driver)
+            raise
         return parser
 
+    def __rate_slot(self):
+        """
+        Слот self.rate на один проход (без контроллера — сразу).
+        slot.outcome нужно выставить до выхода из with.
+        """
+        if self.rate is None:
+            return nullcontext(RateSlot())
+        return self.rate.slot()
+
+    def __report(self, page: "Parser", labels: dict) -> dict:
+        """
+        Снять метрики прохода (плюс память браузера) и отдать их в metrics_sink.
+        """
+        page.metrics.gauge(
+            "browser_rss_mb", DriverPool.browser_rss_mb(unwrap_driver(page.driver))
+        )
+        if self.rate:
+            rate = self.rate.stats()
+            page.metrics.gauge("rate_concurrency", rate["concurrency"])
+            page.metrics.gauge("rate_interval", rate["interval"])
+            page.metrics.gauge("rate_companies_per_hour", rate["companies_per_hour"])
+        snapshot = page.metrics.snapshot()
+        if self.metrics_sink:
+            try:
+                self.metrics_sink(labels, snapshot)
+            except Exception as e:
+                print(f"[metrics] ошибка sink: {e}")
+        return snapshot
+
+    def __cached(self, kind: str, key_parts: tuple, compute):
+        """
+        Пропустить вызов через self.cache, если он задан.
+        """
+        if self.cache is None:
+            return compute()
+        key = ResultCache.make_key(kind, *key_parts)
+        return self.cache.get_or_compute(key, kind, compute)
+
+    @staticmethod
+    def __cache_key(
+        id_yandex: int,
+        type_parse: str,
+        sort: str | None,
+        limit: int,
+        engine: str,
+        with_answers: bool = True,
+        sorts: list | None = None,
+        dedupe: bool = False,
+    ) -> tuple:
+        if type_parse == "company":
+            return (id_yandex,)
+        key: tuple = (id_yandex, sort, limit, engine)
+        if sorts:
+            key = (id_yandex, tuple(sorts), limit, engine, "dedupe" if dedupe else "all")
+        if not with_answers:
+            key += ("no_answers",)
+        return key
+
     def get_company_id_from_url(self, url: str, timeout: int = 10) -> int | None:
         """
-        Открывает переданный URL Яндекс.Карт и вытаскивает businessId (ya_id)
-        через сетевые логи (fetchReviews), используя Parser.get_business_id_from_network().
+        businessId (ya_id) по ссылке Яндекс.Карт через self.resolver:
+        сначала из самого URL (/maps/org/<slug>/<id>/), затем HTTP-запросом,
+        и только если не вышло — открываем URL в браузере и ждём fetchReviews
+        в сетевых логах не дольше timeout.
         """
-        driver = self.__create_driver()
-        parser = Parser(driver)
+        return self.resolver.resolve(url, timeout=timeout)
+
+    def resolve_company_ids(self, urls: Iterable[str], timeout: int = 10) -> dict:
+        """
+        {url: businessId или None} для многих ссылок сразу. Браузер, если
+        понадобится, открывается один на все ссылки, которые не разобрались
+        без него.
+        """
+        return self.resolver.resolve_many(urls, timeout=timeout)
+
+    def __browser_company_ids(self, urls: list, timeout: float = 10) -> dict:
+        """
+        Запасной путь CompanyIdResolver: по очереди открываем URL в одном
+        браузере и вытаскиваем businessId через Parser.get_business_id_from_network().
+        """
+        from yandex_reviews_parser.parsers import Parser
+
+        found: dict = {}
+        metrics = Metrics()
+        with metrics.span("driver_acquire"):
+            driver = self.__acquire_driver()
+        parser = None
         try:
-            driver.get(url)
-            # даём странице время отправить запрос fetchReviews
-            time.sleep(4)
-            biz_id = parser.get_business_id_from_network(timeout=timeout)
-            return int(biz_id) if biz_id is not None else None
+            for url in urls:
+                parser = Parser(
+                    InstrumentedDriver(driver, metrics), timings=self.timings, metrics=metrics
+                )
+                # события прошлой страницы не должны попасть к этому URL
+                parser.network.poll()
+                try:
+                    with metrics.span("page_open"):
+                        parser.driver.get(url)
+                    biz_id = parser.get_business_id_from_network(timeout=timeout)
+                    found[url] = int(biz_id) if biz_id is not None else None
+                except Exception as e:
+                    print(f"[resolver] {url}: {type(e).__name__}: {e}")
+                    found[url] = None
         finally:
-            driver.close()
-            driver.quit()
+            if parser is not None:
+                self.__report(parser, {"urls": len(urls), "type_parse": "company_id"})
+            self.__release_driver(driver)
+        return found
+
+    def __resolve_since(
+        self,
+        id_yandex: int,
+        since: float | str | None,
+        incremental: bool,
+    ) -> float | str | None:
+        """
+        Явный since важнее сохранённого; с incremental=True берём отметку из state.
+        """
+        if since is None and incremental and self.state:
+            return self.state.get_since(id_yandex)
+        return since
+
+    def __run_parse(
+        self,
+        page: "Parser",
+        id_yandex: int,
+        type_parse: str,
+        sort: str | None,
+        limit: int,
+        engine: str,
+        since: float | str | None = None,
+        incremental: bool = False,
+        with_metrics: bool = False,
+        sorts: list | None = None,
+        dedupe: bool = False,
+    ) -> dict:
+        """
+        Разбор уже открытой страницы в зависимости от type_parse.
+        После успешного сбора по новизне поднимаем отметку в state.
+        Метрики уходят в metrics_sink всегда, в результат — при with_metrics.
+
+        Исход прохода (page.outcome) определяется всегда; если он не 'ok',
+        попадает в результат как "outcome", а "error" уточняется: капча или
+        ограничение запросов вместо общего "Страница не найдена".
+        """
+        since = self.__resolve_since(id_yandex, since, incremental)
+        result: dict = {}
+        try:
+            if type_parse == "default":
+                result = page.parse_all_data(
+                    sort=sort,
+                    limit=limit,
+                    engine=engine,
+                    since=since,
+                    sorts=sorts,
+                    dedupe=dedupe,
+                )
+            elif type_parse == "company":
+                result = page.parse_company_info()
+            elif type_parse == "reviews":
+                result = page.parse_reviews(
+                    sort=sort,
+                    limit=limit,
+                    engine=engine,
+                    since=since,
+                    sorts=sorts,
+                    dedupe=dedupe,
+                )
+
+            reviews = result.get("company_reviews")
+            if sorts:
+                reviews = reviews.get("newest") if reviews else None
+            elif sort != "newest":
+                reviews = None
+            if self.state and reviews:
+                self.state.update(id_yandex, reviews)
+        finally:
+            outcome = page.classify_outcome()
+            snapshot = self.__report(
+                page,
+                {
+                    "id_yandex": id_yandex,
+                    "type_parse": type_parse,
+                    "sort": ",".join(sorts) if sorts else sort,
+                },
+            )
+        if outcome != OK:
+            result["outcome"] = outcome
+            if "error" in result:
+                result["error"] = OUTCOME_ERRORS.get(outcome, result["error"])
+        elif page.checkpoint and page.completed_sorts and "error" not in result:
+            # эти сортировки дочитаны до конца — продолжать их больше нечего
+            self.checkpoints.clear(id_yandex, page.completed_sorts)
+        if with_metrics:
+            result["metrics"] = snapshot
+        return result
+
     def parse(
         self,
         id_yandex: int,
         type_parse: str = "default",
         sort: str | None = "newest",
         limit: int = -1,
+        engine: str = "dom",
+        since: float | str | None = None,
+        incremental: bool = False,
+        with_metrics: bool = False,
+        with_answers: bool = True,
+        sorts: list | None = None,
+        dedupe: bool = False,
+        resume: bool = False,
     ) -> dict:
         """
         type_parse:
@@ -82,23 +420,258 @@ class YandexParser:
           - 'company'  — только информация о компании
           - 'reviews'  — только отзывы
 
-        sort  — тип сортировки для отзывов
-        limit — макс. количество отзывов (-1 = все)
+        sort   — тип сортировки для отзывов
+        limit  — макс. количество отзывов (-1 = все)
+        engine — 'dom' (скролл страницы) или 'api' (страница нужна только
+                 для сессии, отзывы листаются через fetchReviews)
+        since  — только с sort='newest': timestamp или review_key последнего
+                 собранного отзыва, собираем только более новые
+        incremental — since берётся из state (отметка прошлого запуска)
+        with_metrics — добавить в результат "metrics": время этапов,
+                 число вызовов WebDriver, скроллов, отзывов, память браузера
+        with_answers — раскрывать и собирать ответы владельца; False —
+                 answer всегда None, без лишних кликов и ожиданий
+        sorts  — несколько сортировок за один заход на страницу, например
+                 ["newest", "negative"]; тогда company_reviews — это
+                 {sort: [отзывы]}, а sort игнорируется
+        dedupe — с sorts: не повторять отзыв, уже попавший в предыдущую сортировку
+        resume — с checkpoint_dir: продолжить прерванный проход — отзывы
+                 из чекпоинта не извлекаются заново, страница доскролливается
+                 до сохранённой позиции без разбора (только engine='dom')
+
+        С self.cache результат берётся из кеша; дельта-запросы (since,
+        incremental) и with_metrics всегда идут на страницу.
         """
+        if since is not None or incremental or with_metrics:
+            return self.__parse(
+                id_yandex,
+                type_parse,
+                sort,
+                limit,
+                engine,
+                since,
+                incremental,
+                with_metrics,
+                with_answers,
+                sorts,
+                dedupe,
+                resume,
+            )
+        return self.__cached(
+            type_parse,
+            self.__cache_key(
+                id_yandex, type_parse, sort, limit, engine, with_answers, sorts, dedupe
+            ),
+            lambda: self.__parse(
+                id_yandex,
+                type_parse,
+                sort,
+                limit,
+                engine,
+                with_answers=with_answers,
+                sorts=sorts,
+                dedupe=dedupe,
+                resume=resume,
+            ),
+        )
+
+    def __parse(
+        self,
+        id_yandex: int,
+        type_parse: str,
+        sort: str | None,
+        limit: int,
+        engine: str,
+        since: float | str | None = None,
+        incremental: bool = False,
+        with_metrics: bool = False,
+        with_answers: bool = True,
+        sorts: list | None = None,
+        dedupe: bool = False,
+        resume: bool = False,
+    ) -> dict:
         result: dict = {}
-        page = self.__open_page(id_yandex)
-        time.sleep(4)
+        with self.__rate_slot() as slot:
+            try:
+                # своего драйвера __open_page при ошибке вернёт в пул сам
+                page = self.__open_page(
+                    id_yandex, with_answers=with_answers, resume=resume
+                )
+            except Exception as e:
+                return {"error": f"{type(e).__name__}: {e}"}
+            try:
+                page.wait_page_ready()
+                result = self.__run_parse(
+                    page,
+                    id_yandex,
+                    type_parse,
+                    sort,
+                    limit,
+                    engine,
+                    since,
+                    incremental,
+                    with_metrics,
+                    sorts,
+                    dedupe,
+                )
+            except Exception as e:
+                # ошибка уходит в результат: QueueWorker и parse_many пишут её в отчёт
+                result = {"error": f"{type(e).__name__}: {e}"}
+            finally:
+                slot.outcome = page.outcome or slot.outcome
+                self.__release_driver(unwrap_driver(page.driver))
+        return result
+
+    def iter_reviews(
+        self,
+        id_yandex: int,
+        sort: str | None = "newest",
+        limit: int = -1,
+        since: float | str | None = None,
+        incremental: bool = False,
+        with_answers: bool = True,
+    ) -> Iterator[dict]:
+        """
+        Отдаёт отзывы компании по одному, по мере их подгрузки на странице.
+        Браузер освобождается, когда генератор дочитан или закрыт.
+
+        sort, limit, since, incremental, with_answers — как у parse()
+        """
+        since = self.__resolve_since(id_yandex, since, incremental)
+        page = self.__open_page(id_yandex, with_answers=with_answers)
         try:
-            if type_parse == "default":
-                result = page.parse_all_data(sort=sort, limit=limit)
-            elif type_parse == "company":
-                result = page.parse_company_info()
-            elif type_parse == "reviews":
-                result = page.parse_reviews(sort=sort, limit=limit)
-        except Exception as e:
-            print(e)
-            return result
+            page.wait_page_ready()
+            newest = None
+            for review in page.iter_reviews(sort=sort, limit=limit, since=since):
+                newest = newest or review
+                yield review
+            if self.state and sort == "newest" and newest:
+                self.state.update(id_yandex, [newest])
+        finally:
+            self.__report(page, {"id_yandex": id_yandex, "type_parse": "iter_reviews"})
+            self.__release_driver(unwrap_driver(page.driver))
+
+    def export_reviews(
+        self,
+        ids: Iterable[int],
+        writer: "ReviewWriter",
+        sort: str | None = "newest",
+        limit: int = -1,
+        incremental: bool = False,
+        with_answers: bool = True,
+        batch_size: int = 500,
+    ) -> dict:
+        """
+        Выгрузить отзывы компаний в writer (writers.JsonlWriter / CsvWriter)
+        без сборки всего результата в памяти: отзывы идут из iter_reviews,
+        копятся в ReviewBatch и дописываются пачками по batch_size.
+        Для компаний с десятками тысяч отзывов стоит включить prune_dom.
+
+        Возвращает {id: число записанных отзывов}, при ошибке —
+        {id: {"error": ..., "written": сколько успели записать}}.
+        """
+        counts: dict = {}
+        batch = ReviewBatch()
+        for id_yandex in ids:
+            written = 0
+            error = None
+            try:
+                for review in self.iter_reviews(
+                    id_yandex,
+                    sort=sort,
+                    limit=limit,
+                    incremental=incremental,
+                    with_answers=with_answers,
+                ):
+                    batch.append(review)
+                    if len(batch) >= batch_size:
+                        written += writer.write_batch(batch, business_id=id_yandex)
+                        batch.clear()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            # хвост пачки — и то, что успели собрать до ошибки
+            if len(batch):
+                written += writer.write_batch(batch, business_id=id_yandex)
+                batch.clear()
+            counts[id_yandex] = {"error": error, "written": written} if error else written
+        return counts
+
+    def parse_many(
+        self,
+        ids: Iterable[int],
+        type_parse: str = "default",
+        sort: str | None = "newest",
+        limit: int = -1,
+        engine: str = "dom",
+        workers: int = 4,
+        ordered: bool = False,
+        incremental: bool = False,
+        with_metrics: bool = False,
+        with_answers: bool = True,
+    ) -> Iterator[tuple]:
+        """
+        Парсит много компаний параллельно и отдаёт (id, result) по мере готовности.
+
+        workers — сколько компаний обрабатывается одновременно, у каждого потока
+                  свой браузер (из self.pool или из временного пула на workers)
+        ordered — False: в порядке завершения, True: в порядке ids
+
+        Ошибка по конкретному ID не прерывает обработку остальных и приходит
+        как result = {"error": ...}. Остальные параметры — как у parse().
+        С self.rate потоки дополнительно ждут слота контроллера: реальная
+        параллельность — min(workers, текущий rate.concurrency).
+        """
+        pool = self.pool
+        own_pool = pool is None
+        if own_pool:
+            pool = DriverPool(
+                self.__create_driver,
+                size=workers,
+                max_pages=self.max_pages_per_driver,
+                max_rss_mb=self.max_rss_mb,
+            )
+
+        def leased_parse(id_yandex: int) -> dict:
+            with self.__rate_slot() as slot, pool.lease() as driver:
+                page = self.__open_page(
+                    id_yandex, driver=driver, with_answers=with_answers
+                )
+                try:
+                    page.wait_page_ready()
+                    return self.__run_parse(
+                        page,
+                        id_yandex,
+                        type_parse,
+                        sort,
+                        limit,
+                        engine,
+                        incremental=incremental,
+                        with_metrics=with_metrics,
+                    )
+                finally:
+                    slot.outcome = page.outcome or slot.outcome
+
+        def job(id_yandex: int) -> dict:
+            if incremental or with_metrics:
+                return leased_parse(id_yandex)
+            return self.__cached(
+                type_parse,
+                self.__cache_key(
+                    id_yandex, type_parse, sort, limit, engine, with_answers
+                ),
+                lambda: leased_parse(id_yandex),
+            )
+
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(job, id_yandex): id_yandex for id_yandex in ids}
+            for future in (futures if ordered else as_completed(futures)):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"error": f"{type(e).__name__}: {e}"}
+                yield futures[future], result
         finally:
-            page.driver.close()
-            page.driver.quit()
-            return result
\ No newline at end of file
+            executor.shutdown(wait=True, cancel_futures=True)
+            if own_pool:
+                pool.close()
\ No newline at end of file
@@ -0,0 +1,111 @@
+"""
+Потоковая запись отзывов в JSONL и CSV.
+
+Отзывы дописываются пачками по мере сбора, в памяти держится только
+текущая пачка. Файл с окончанием .gz (или compress=True) пишется через gzip.
+
+    with open_writer("reviews.jsonl.gz") as writer:
+        writer.write_batch(batch, business_id=1040226791)
+"""
+
+import abc
+import csv
+import gzip
+import json
+import os
+import threading
+from typing import Iterable, Optional
+
+from yandex_reviews_parser.storage import REVIEW_FIELDS, ReviewBatch
+
+
+class ReviewWriter(abc.ABC):
+    """
+    Общая часть писателей: открытие файла (gzip по расширению), блокировка
+    для записи из нескольких потоков и flush после каждой пачки.
+
+    append=True — дописывать в существующий файл, а не перезаписывать.
+    """
+
+    def __init__(self, path: str, compress: Optional[bool] = None, append: bool = False):
+        self.path = path
+        self.compress = path.endswith(".gz") if compress is None else compress
+        mode = "at" if append else "wt"
+        # заголовок CSV нужен, только если файл начинается с нуля
+        self._fresh = not (append and os.path.exists(path) and os.path.getsize(path) > 0)
+        if self.compress:
+            self._file = gzip.open(path, mode, encoding="utf-8", newline="")
+        else:
+            self._file = open(path, mode, encoding="utf-8", newline="")
+        self._lock = threading.Lock()
+        self.written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @abc.abstractmethod
+    def _write_rows(self, rows: Iterable[tuple], business_id) -> int:
+        """Записать кортежи в порядке REVIEW_FIELDS, вернуть их число."""
+
+    def write_batch(self, batch: ReviewBatch, business_id=None) -> int:
+        """Дописать пачку; business_id добавляется к каждому отзыву."""
+        with self._lock:
+            count = self._write_rows(batch.rows(), business_id)
+            self._file.flush()
+            self.written += count
+        return count
+
+    def write_reviews(self, reviews: Iterable[dict], business_id=None) -> int:
+        """Дописать отзывы в формате asdict(Review)."""
+        rows = (tuple(r.get(f) for f in REVIEW_FIELDS) for r in reviews)
+        with self._lock:
+            count = self._write_rows(rows, business_id)
+            self._file.flush()
+            self.written += count
+        return count
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+class JsonlWriter(ReviewWriter):
+    """Одна строка JSON на отзыв: {"business_id", "name", ..., "answer"}."""
+
+    def _write_rows(self, rows: Iterable[tuple], business_id) -> int:
+        count = 0
+        for row in rows:
+            review = dict(zip(REVIEW_FIELDS, row))
+            if business_id is not None:
+                review = {"business_id": business_id, **review}
+            self._file.write(json.dumps(review, ensure_ascii=False) + "\n")
+            count += 1
+        return count
+
+
+class CsvWriter(ReviewWriter):
+    """CSV с заголовком business_id + поля Review; заголовок пишется один раз."""
+
+    def __init__(self, path: str, compress: Optional[bool] = None, append: bool = False):
+        super().__init__(path, compress=compress, append=append)
+        self._csv = csv.writer(self._file)
+        if self._fresh:
+            self._csv.writerow(("business_id",) + REVIEW_FIELDS)
+
+    def _write_rows(self, rows: Iterable[tuple], business_id) -> int:
+        count = 0
+        for row in rows:
+            self._csv.writerow((business_id,) + row)
+            count += 1
+        return count
+
+
+def open_writer(path: str, compress: Optional[bool] = None, append: bool = False) -> ReviewWriter:
+    """CsvWriter для *.csv / *.csv.gz, иначе JsonlWriter."""
+    name = path[:-3] if path.endswith(".gz") else path
+    cls = CsvWriter if name.endswith(".csv") else JsonlWriter
+    return cls(path, compress=compress, append=append)